@@ -1,64 +1,113 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mticker
+import math
+from city_index import build_city_index, lookup_city
+from data_cache import read_excel_cached
+from rendering import draw_sensitivity, draw_vacancy
+from scenario import Scenario
 
-# Load the Excel file
+# Path of the Excel file; it is loaded on first use, not at import time
 file_path = 'data/Random Cities in USA (Rent & Buy).xlsx'
-df = pd.read_excel(file_path)
+
+# Lazily loaded dataset and (City, Location, Number of Bedrooms) lookup index
+_data = None
+_city_index = None
+
+# Function to load the dataset on first use
+def get_data():
+    """
+    Load the Rent & Buy dataset on first use (served from the binary cache after the first run).
+    """
+    global _data
+    if _data is None:
+        _data = read_excel_cached(file_path)
+    return _data
+
+# Function to build the lookup index on first use
+def get_city_index():
+    """
+    Build the (City, Location, Number of Bedrooms) lookup index on first use.
+    """
+    global _city_index
+    if _city_index is None:
+        _city_index = build_city_index(get_data())
+    return _city_index
+
+def __getattr__(name):
+    """
+    Keep the module-level df and city_index attributes available without loading them at import time.
+    """
+    if name == "df":
+        return get_data()
+    if name == "city_index":
+        return get_city_index()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Function to build calculator inputs without prompting the user
+def build_inputs(city, location, bedrooms, length_of_stay, down_payment, investment_interest_rate, index=None):
+    """
+    Look up city data and combine it with the user's own values.
+
+    :param city: City name, e.g. "Anchorage, AK"
+    :param location: "City Centre" or "Outside City Centre"
+    :param bedrooms: Number of bedrooms (1 or 3)
+    :param length_of_stay: Years planning to stay in the home
+    :param down_payment: Initial down payment amount
+    :param investment_interest_rate: Annual investment interest (as percentage)
+    :param index: Index from build_city_index (defaults to the index of the Rent & Buy data)
+    :return: Dictionary of inputs for compare_rent_vs_buy plus the city, or None if no data is found
+    """
+    city_data = lookup_city(get_city_index() if index is None else index, city, location, bedrooms)
+    if city_data is None:
+        return None
+
+    # Return a dictionary of all inputs for further processing
+    return {
+        "length_of_stay": length_of_stay,
+        "monthly_rent": city_data["monthly_rent"],
+        "home_price": city_data["home_price"],
+        "down_payment": down_payment,
+        "mortgage_rate": city_data["mortgage_rate"],
+        "investment_interest_rate": investment_interest_rate,
+        "city": city.strip()  # Return the city for quality of life calculation
+    }
 
 # Function to get user inputs and filter the data
 def get_user_inputs():
     """
     Get user inputs for city, location, and number of bedrooms.
-    Filters the data set based on these inputs and returns relevant data for rent vs buy comparison.
+    Looks up the data set based on these inputs and returns relevant data for rent vs buy comparison.
     """
-    # Get available cities from the dataset
-    available_cities = df['City'].unique()
-    print("Available cities:", ", ".join(available_cities))
-    
-    # Prompt the user to enter a city
-    city = input("Enter the city: ").strip()
-    
-    # Prompt the user to enter a location (City Centre or Outside City Centre)
-    location = input("Enter location (City Centre or Outside City Centre): ").strip()
-    
-    # Prompt the user to enter the number of bedrooms (1 or 3)
-    bedrooms = input("Enter number of bedrooms (1 or 3): ").strip()
-    
-    # Filter the dataset based on user inputs
-    filtered_data = df[(df['City'] == city) & 
-                       (df['Location'] == location) & 
-                       (df['Number of Bedrooms'] == int(bedrooms))]
+    # Print available cities from the dataset
+    city_index = get_city_index()
+    print("Available cities:", ", ".join(city_index["cities"]))
 
-    # If no data is found for the given inputs, prompt the user to try again
-    if filtered_data.empty:
+    # Keep prompting until the inputs match a row of the dataset
+    while True:
+        # Prompt the user to enter a city
+        city = input("Enter the city: ").strip()
+
+        # Prompt the user to enter a location (City Centre or Outside City Centre)
+        location = input("Enter location (City Centre or Outside City Centre): ").strip()
+
+        # Prompt the user to enter the number of bedrooms (1 or 3)
+        bedrooms = input("Enter number of bedrooms (1 or 3): ").strip()
+
+        # Look up the dataset row for the given inputs
+        city_data = lookup_city(city_index, city, location, bedrooms)
+        if city_data is not None:
+            break
+
+        # If no data is found for the given inputs, prompt the user to try again
         print("No data found for the given inputs. Please try again.")
-        return get_user_inputs()
-    
-    # Extract relevant values from the filtered data
-    monthly_rent = filtered_data['Rent per Month'].values[0]
-    home_price = filtered_data['Buy Apartment Price Total'].values[0]
-    mortgage_rate = filtered_data['Mortgage Intrest Rate'].values[0]
-    
+
     # Get additional inputs from the user
     length_of_stay = float(input("Enter length of stay in years: "))
     down_payment = float(input("Enter down payment in dollars: "))
     investment_interest_rate = float(input("Enter investment interest rate (as percentage): "))
 
-    # Return a dictionary of all inputs for further processing
-    return {
-        "length_of_stay": length_of_stay,
-        "monthly_rent": monthly_rent,
-        "home_price": home_price,
-        "down_payment": down_payment,
-        "mortgage_rate": mortgage_rate,
-        "investment_interest_rate": investment_interest_rate,
-        "city": city  # Return the city for quality of life calculation
-    }
+    return build_inputs(city, location, bedrooms, length_of_stay, down_payment, investment_interest_rate)
 
 # Function to compare renting vs buying
-def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0): 
+def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0, appreciation_rate=None): 
     """
     Compare renting vs. buying a home.
     
@@ -71,8 +120,12 @@ def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment,
     :param maintenance_rate: Annual maintenance cost rate (default 1.0%)
     :param investment_interest_rate: Annual investment interest (as percentage)
     :param selling_cost_rate: Cumulative costs of selling a home (default 8.0%)
+    :param appreciation_rate: Annual home appreciation (as percentage, defaults to investment_interest_rate)
     :return: Total costs for renting and buying, and recommendation
     """
+    # The home appreciates at the investment rate unless a separate rate is given
+    if appreciation_rate is None:
+        appreciation_rate = investment_interest_rate
           
     # Renting cost calculations
     # Calculate the investment return from the down payment over the length of stay
@@ -91,7 +144,7 @@ def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment,
     # Calculate the total number of mortgage payments
     num_payments = length_of_stay * 12
     # Calculate the home appreciation over the length of stay
-    home_appreciation = home_price * (1 + (investment_interest_rate / 100) / 12)**(12 * length_of_stay) 
+    home_appreciation = home_price * (1 + (appreciation_rate / 100) / 12)**(12 * length_of_stay) 
      # Calculate the selling costs as a percentage of the appreciated home value
     selling_costs = home_appreciation * (selling_cost_rate / 100) 
 
@@ -133,53 +186,51 @@ def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment,
     }
 
 # Function to plot sensitivity analysis
-def plot_sensitivity_analysis(base_inputs):
+def plot_sensitivity_analysis(base_inputs, factors=None):
     """
     Plots how the total rent and buy costs change when varying one input factor at a time.
+    Accepts a dictionary of inputs or a Scenario, whose cached sweeps are reused; factors limits the plots to some factors.
     """
-    # Define the factors to be varied along with their start, stop, and increment values
-    factors = {
-        "length_of_stay": (1, base_inputs["length_of_stay"], 1),
-        "monthly_rent": (0, base_inputs["monthly_rent"], 100),
-        "home_price": (0, base_inputs["home_price"], 1000),
-        "down_payment": (0, base_inputs["down_payment"], 1000),
-        "mortgage_rate": (0, base_inputs["mortgage_rate"], 0.5),
-        "investment_interest_rate": (0, base_inputs["investment_interest_rate"], 0.5)
-    }
-    
-    # Iterate over each factor to analyze its impact
-    for factor, (start, stop, step) in factors.items():
-        # Generate a range of values for the current factor
-        values = np.arange(start, stop + step, step)
-        rent_costs, buy_costs = [], []
-        
-        # Compute rent and buy costs for each value of the current factor
-        for value in values:
-            inputs = base_inputs.copy()
-            inputs[factor] = value
-            result = compare_rent_vs_buy(**inputs)
-            rent_costs.append(result["Rent Cost"])
-            buy_costs.append(result["Buy Cost"])
-        
+    import matplotlib.pyplot as plt
+
+    scenario = base_inputs if isinstance(base_inputs, Scenario) else Scenario(base_inputs)
+    # Iterate over each factor's sweep (values, rent costs and buy costs computed in one vectorized call)
+    for factor, (values, rent_costs, buy_costs) in scenario.sensitivity_curves().items():
+        if factors is not None and factor not in factors:
+            continue
         # Generate the plot for the current factor
         plt.figure(figsize=(8, 5))
-        plt.plot(values, rent_costs, label='Rent Cost', marker='o')
-        plt.plot(values, buy_costs, label='Buy Cost', marker='s')
-        plt.xlabel(factor.replace("_", " ").title())
-        plt.ylabel("Cost (USD)")
-        plt.title(f"Impact of {factor.replace('_', ' ').title()} on Rent vs. Buy Cost")
-        plt.legend()
-        plt.grid()
+        draw_sensitivity(plt.gca(), factor, values, rent_costs, buy_costs)
         plt.show()
 
-# Function to plot vacancy and cost data
-def plot_vacancy(excel_file):
+# Function to explore changes to the inputs
+def what_if_session(scenario):
     """
-    Plots number of vacant homes, median home value, and median costs to rent and buy for selected cities.
+    Prompts for input changes such as "monthly_rent=1500" and prints the new comparison after each one.
+    Only the sensitivity plots of the factors a change affected are redrawn. An empty line ends the session.
     """
-       
-    # Read the Excel file
-    df = pd.read_excel(excel_file)
+    while True:
+        change = input("Change an input (name=value, empty to finish): ").strip()
+        if not change:
+            break
+
+        name, _, value = change.partition("=")
+        try:
+            changed = scenario.update(**{name.strip(): float(value)})
+        except ValueError as error:
+            print(f"Invalid change: {error}")
+            continue
+
+        print(scenario.result())
+        plot_sensitivity_analysis(scenario, changed)
+
+# Function to prepare vacancy and cost data
+def vacancy_table(excel_file):
+    """
+    Aggregates number of vacant homes, median home value, and median costs to rent and buy per city.
+    """
+    # Read the Excel file through the binary cache
+    df = read_excel_cached(excel_file)
 
     # Group data by city and calculate the mean for relevant columns
     grouped_df = df.groupby('City').agg({
@@ -194,66 +245,19 @@ def plot_vacancy(excel_file):
     for col in cols_to_convert:
         grouped_df[col] = grouped_df[col].astype(int)
 
-    # x-axis values (city names)
-    x_col = grouped_df.loc[:, "City"]
-    
-    # Data for bar chart 1 (vacant housing units)
-    y1_col = grouped_df.loc[:, "Vacant housing units"]
-    
-    # Data for bar chart 2 (median house value)
-    y2_col = grouped_df.loc[:, "Median House Value (dollars)"]
-    
-    # Data for lines (median buy and rent costs)
-    buy_line = grouped_df.loc[:, "Median Buy Cost (dollars)"]
-    rent_line = grouped_df.loc[:, "Median Rent Cost (dollars)"]
+    return grouped_df
 
-    # Create subplots
+# Function to plot vacancy and cost data
+def plot_vacancy(excel_file):
+    """
+    Plots number of vacant homes, median home value, and median costs to rent and buy for selected cities.
+    """
+    import matplotlib.pyplot as plt
+
+    # Create subplots and draw the bar charts with cost lines on secondary axes
     fig, ax = plt.subplots(1, 2, figsize=(20, 5))
-                   
-    # Primary y-axis - chart 1 (vacant housing units)
-    ax[0].bar(x_col, y1_col, color='slategrey', label="Vacant housing units")
-    ax[0].set_xlabel("City", fontsize=14)
-    
-    # Set x-ticks and labels for chart 1
-    ax[0].set_xticks(range(len(x_col)))  # Set ticks at positions 0, 1, 2, etc.
-    ax[0].set_xticklabels(x_col, rotation=85)  # Set labels and rotate them
-    
-    ax[0].set_ylabel("Number Vacant", color='black')
-    ax[0].yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, pos: f"{int(x/1000)}K"))
-    ax[0].legend(loc="upper left")
-    
-    # Secondary y-axis - chart 1 (median buy and rent costs)
-    ax2 = ax[0].twinx()
-    ax2.plot(x_col, buy_line, color='forestgreen', marker='o', linestyle='-', label="Median buy cost")
-    ax2.plot(x_col, rent_line, color='darkred', marker='o', linestyle='-', label="Median rent cost")
-    ax2.set_ylabel("Cost (USD)", color='black')
-    ax2.legend(loc="best")
-
-    # Chart 1 title
-    ax[0].set_title("Vacancy & Cost", fontsize=14, fontweight="bold")
-    
-    # Primary y-axis - chart 2 (median home value)
-    ax[1].bar(x_col, y2_col, color='tan', label="Median home value")
-    ax[1].set_xlabel("City", fontsize=14)
-    
-    # Set x-ticks and labels for chart 2
-    ax[1].set_xticks(range(len(x_col)))  # Set ticks at positions 0, 1, 2, etc.
-    ax[1].set_xticklabels(x_col, rotation=85)  # Set labels and rotate them
-    
-    ax[1].set_ylabel("Home Value (USD)", color='black')
-    ax[1].yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, pos: f"{int(x/1000)}K"))    
-    ax[1].legend(loc="upper left")
-    
-    # Secondary y-axis - chart 2 (median buy and rent costs)
-    ax4 = ax[1].twinx()
-    ax4.plot(x_col, buy_line, color='forestgreen', marker='o', linestyle='-', label="Median buy cost")
-    ax4.plot(x_col, rent_line, color='darkred', marker='o', linestyle='-', label="Median rent cost")
-    ax4.set_ylabel("Cost (USD)", color='black')
-    ax4.legend(loc="best")
-
-    # Chart 2 title
-    ax[1].set_title("Home Value & Cost", fontsize=14, fontweight="bold")
-    
+    draw_vacancy(ax[0], ax[1], vacancy_table(excel_file))
+
     # Show the plots
     plt.tight_layout()
     plt.show()
@@ -283,6 +287,10 @@ def compute_quality_of_life(data, city):
     except:
         print("Missing value in data.")
         return
+    # Empty cells read as NaN; leave the city unscored like score_quality_of_life instead of clipping NaN to 0
+    if any(math.isnan(value) for value in (pp, safety, health, climate, col, prop, traffic, pollution)):
+        print("Missing value in data.")
+        return
     
     # Compute Quality of Life Index using a weighted formula
     qol = max(0, 100 + pp / 2.5 - prop * 1.0 - col / 10 + safety / 2.0 + health / 2.5 - traffic / 2.0 - pollution * 2.0 / 3.0 + climate / 3.0)
@@ -333,11 +341,15 @@ if __name__ == "__main__":
     result = compare_rent_vs_buy(**inputs)
     print(result)
 
-    # Plot sensitivity analysis
-    plot_sensitivity_analysis(inputs)
+    # Plot sensitivity analysis; the scenario keeps the sweeps for the what-if session below
+    scenario = Scenario(inputs)
+    plot_sensitivity_analysis(scenario)
 
     # Plot vacancy and cost data
     plot_vacancy(file_path)
 
     # Compute and print Quality of Life Index for the selected city
-    compute_quality_of_life(df, city)
+    compute_quality_of_life(get_data(), city)
+
+    # Try out other inputs, redrawing only the affected sensitivity plots
+    what_if_session(scenario)
@@ -0,0 +1,102 @@
+import numpy as np
+
+def _prepare_loans(loan_amount, mortgage_rate, num_payments):
+    """Broadcast loan inputs to flat arrays and round the terms to whole months."""
+    loan_amount, mortgage_rate, num_payments = np.broadcast_arrays(
+        np.asarray(loan_amount, dtype=float),
+        np.asarray(mortgage_rate, dtype=float),
+        np.asarray(num_payments, dtype=float)
+    )
+    # Payments are made once a month, so the term is a whole number of months
+    months = np.rint(num_payments.ravel()).astype(np.int64)
+    if (months < 1).any():
+        raise ValueError("Every loan needs at least one monthly payment.")
+
+    mortgage_rate = mortgage_rate.ravel()
+    monthly_interest_rate = (mortgage_rate / 100) / 12
+    return loan_amount.ravel(), mortgage_rate, monthly_interest_rate, months
+
+def remaining_balance(loan_amount, mortgage_rate, num_payments, months_paid):
+    """
+    Compute the outstanding loan balance after a number of monthly payments.
+
+    :param loan_amount: Amount borrowed
+    :param mortgage_rate: Annual mortgage interest rate (as percentage)
+    :param num_payments: Total number of monthly payments in the loan term
+    :param months_paid: Number of payments already made (clipped to the term)
+    :return: Array of remaining balances
+    """
+    loan_amount = np.asarray(loan_amount, dtype=float)
+    monthly_interest_rate = (np.asarray(mortgage_rate, dtype=float) / 100) / 12
+    num_payments = np.asarray(num_payments, dtype=float)
+    months_paid = np.clip(np.asarray(months_paid, dtype=float), 0, num_payments)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Closed form balance: L * (g^n - g^k) / (g^n - 1) with g = 1 + monthly rate
+        growth = 1 + monthly_interest_rate
+        amortized = loan_amount * (growth ** num_payments - growth ** months_paid) / (growth ** num_payments - 1)
+        # Zero-rate loans are repaid in equal parts
+        linear = loan_amount * (1 - months_paid / num_payments)
+
+    return np.where(monthly_interest_rate > 0, amortized, linear)
+
+def amortization_schedule(loan_amount, mortgage_rate, num_payments):
+    """
+    Build month-by-month amortization schedules for many loans at once.
+
+    Each matrix has one row per loan and one column per month up to the longest term;
+    months after a loan is paid off are zero.
+
+    :param loan_amount: Amount borrowed (scalar or array)
+    :param mortgage_rate: Annual mortgage interest rate (as percentage)
+    :param num_payments: Number of monthly payments in the loan term
+    :return: Dictionary of (loans x months) "Payment", "Interest", "Principal" and "Balance" matrices
+    """
+    loan_amount, mortgage_rate, monthly_interest_rate, months = _prepare_loans(loan_amount, mortgage_rate, num_payments)
+
+    # Balance at the start (column 0) and end of every month
+    elapsed = np.arange(months.max() + 1)
+    balance = remaining_balance(loan_amount[:, None], mortgage_rate[:, None], months[:, None], elapsed[None, :])
+
+    # Interest accrues on the opening balance; principal is the balance reduction
+    opening = balance[:, :-1]
+    closing = balance[:, 1:]
+    interest = monthly_interest_rate[:, None] * opening
+    principal = opening - closing
+
+    return {
+        "Payment": interest + principal,
+        "Interest": interest,
+        "Principal": principal,
+        "Balance": closing
+    }
+
+def iter_amortization_schedule(loan_amount, mortgage_rate, num_payments):
+    """
+    Yield amortization schedules one month at a time for many loans at once.
+
+    Only one month of values is held in memory, so long schedules for large
+    portfolios can be streamed.
+
+    :param loan_amount: Amount borrowed (scalar or array)
+    :param mortgage_rate: Annual mortgage interest rate (as percentage)
+    :param num_payments: Number of monthly payments in the loan term
+    :return: Generator of dictionaries with "Month" and per-loan "Payment", "Interest", "Principal" and "Balance" arrays
+    """
+    loan_amount, mortgage_rate, monthly_interest_rate, months = _prepare_loans(loan_amount, mortgage_rate, num_payments)
+
+    opening = loan_amount.copy()
+    for month in range(1, months.max() + 1):
+        # Closed form balance keeps every month consistent with amortization_schedule
+        closing = remaining_balance(loan_amount, mortgage_rate, months, month)
+        interest = monthly_interest_rate * opening
+        principal = opening - closing
+
+        yield {
+            "Month": month,
+            "Payment": interest + principal,
+            "Interest": interest,
+            "Principal": principal,
+            "Balance": closing
+        }
+        opening = closing
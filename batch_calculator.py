@@ -0,0 +1,296 @@
+import numpy as np
+from instrumentation import count, timed
+
+# Compact recommendation codes returned by the batch functions
+RECOMMENDATION_EITHER = 0
+RECOMMENDATION_RENT = 1
+RECOMMENDATION_BUY = 2
+# Scenarios whose costs are undefined (NaN), such as a length of stay of zero, where
+# compare_rent_vs_buy raises ZeroDivisionError instead of recommending anything
+RECOMMENDATION_INVALID = 3
+
+# Recommendation strings indexed by code, matching compare_rent_vs_buy
+RECOMMENDATIONS = (
+    "Either.",
+    "Renting is financially better.",
+    "Buying is financially better.",
+    "Invalid scenario."
+)
+
+# Cost columns returned by compare_rent_vs_buy and the batch functions
+COST_COLUMNS = ("Rent Cost", "Buy Cost")
+
+# Argument names of compare_rent_vs_buy with their default values (None means required)
+INPUT_DEFAULTS = {
+    "length_of_stay": None,
+    "monthly_rent": None,
+    "home_price": None,
+    "down_payment": None,
+    "mortgage_rate": None,
+    "investment_interest_rate": None,
+    "property_tax_rate": 1.2,
+    "maintenance_rate": 1.0,
+    "selling_cost_rate": 8.0
+}
+
+# Optional arguments of compare_rent_vs_buy that default to another input when not given
+INPUT_FALLBACKS = {
+    "appreciation_rate": "investment_interest_rate"
+}
+
+# Every input name accepted by compare_rent_vs_buy
+INPUT_NAMES = (*INPUT_DEFAULTS, *INPUT_FALLBACKS)
+
+# Machine epsilon used to bound floating point differences from the scalar path
+_EPSILON = np.finfo(float).eps
+
+def monthly_mortgage_payment(loan_amount, mortgage_rate, num_payments):
+    """
+    Compute the fixed monthly mortgage payment for arrays of loans.
+
+    :param loan_amount: Amount borrowed
+    :param mortgage_rate: Annual mortgage interest rate (as percentage)
+    :param num_payments: Number of monthly payments
+    :return: Array of monthly payments (zero-rate loans are repaid in equal parts)
+    """
+    loan_amount = np.asarray(loan_amount, dtype=float)
+    num_payments = np.asarray(num_payments, dtype=float)
+    # Convert annual mortgage rate to monthly rate
+    monthly_interest_rate = (np.asarray(mortgage_rate, dtype=float) / 100) / 12
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Loan formula, evaluated in the same order as compare_rent_vs_buy
+        growth = (1 + monthly_interest_rate) ** num_payments
+        amortized = loan_amount * (monthly_interest_rate * growth) / (growth - 1)
+        # If interest rate is 0, divide the loan amount by the number of payments
+        linear = loan_amount / num_payments
+
+    return np.where(monthly_interest_rate > 0, amortized, linear)
+
+def rent_costs(length_of_stay, monthly_rent, down_payment, investment_interest_rate):
+    """
+    Compute unrounded total renting costs for arrays of scenarios.
+
+    :param length_of_stay: Years planning to stay in the home
+    :param monthly_rent: Monthly rent cost
+    :param down_payment: Down payment amount that the renter invests instead
+    :param investment_interest_rate: Annual investment interest (as percentage)
+    :return: Array of total rent costs net of investment returns
+    """
+    length_of_stay = np.asarray(length_of_stay, dtype=float)
+    # Calculate the investment return from the down payment over the length of stay
+    investment = (np.asarray(down_payment, dtype=float) * (np.asarray(investment_interest_rate, dtype=float) / 100)) * length_of_stay
+    # Calculate the total rent cost over the length of stay, subtracting the investment return
+    return (np.asarray(monthly_rent, dtype=float) * 12 * length_of_stay) - investment
+
+def buy_costs(length_of_stay, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0, appreciation_rate=None):
+    """
+    Compute unrounded total buying costs for arrays of scenarios.
+
+    :param length_of_stay: Years planning to stay in the home
+    :param home_price: Purchase price of the home
+    :param down_payment: Initial down payment amount
+    :param mortgage_rate: Annual mortgage interest rate (as percentage)
+    :param investment_interest_rate: Annual investment interest (as percentage), the home appreciation unless appreciation_rate is given
+    :param property_tax_rate: Annual property tax rate (default 1.2%)
+    :param maintenance_rate: Annual maintenance cost rate (default 1.0%)
+    :param selling_cost_rate: Cumulative costs of selling a home (default 8.0%)
+    :param appreciation_rate: Annual home appreciation (as percentage, defaults to investment_interest_rate)
+    :return: Array of total buy costs net of resale value
+    """
+    if appreciation_rate is None:
+        appreciation_rate = investment_interest_rate
+    return _buy_costs_with_error(length_of_stay, home_price, down_payment, mortgage_rate, appreciation_rate, property_tax_rate, maintenance_rate, selling_cost_rate)[0]
+
+def _buy_costs_with_error(length_of_stay, home_price, down_payment, mortgage_rate, appreciation_rate, property_tax_rate, maintenance_rate, selling_cost_rate):
+    """Unrounded buy costs plus a bound on their deviation from the scalar Python result."""
+    length_of_stay = np.asarray(length_of_stay, dtype=float)
+    home_price = np.asarray(home_price, dtype=float)
+    down_payment = np.asarray(down_payment, dtype=float)
+
+    # Calculate the loan amount and the total number of mortgage payments
+    loan_amount = home_price - down_payment
+    num_payments = length_of_stay * 12
+    monthly_interest_rate = (np.asarray(mortgage_rate, dtype=float) / 100) / 12
+
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        # Calculate the home appreciation and the selling costs of the appreciated home
+        home_appreciation = home_price * (1 + (np.asarray(appreciation_rate, dtype=float) / 100) / 12)**(12 * length_of_stay)
+        selling_costs = home_appreciation * (np.asarray(selling_cost_rate, dtype=float) / 100)
+
+        # Calculate the mortgage, tax and maintenance totals over the length of stay
+        total_mortgage_cost = monthly_mortgage_payment(loan_amount, mortgage_rate, num_payments) * num_payments
+        total_property_tax = (np.asarray(property_tax_rate, dtype=float) / 100) * home_price * length_of_stay
+        total_maintenance = (np.asarray(maintenance_rate, dtype=float) / 100) * home_price * length_of_stay
+        total_resale_value = home_appreciation - selling_costs
+
+        total_buy_cost = down_payment + total_mortgage_cost + total_property_tax + total_maintenance - total_resale_value
+
+        # NumPy's vectorized power may differ from the C library by a few ulps; the
+        # mortgage formula amplifies that by growth / (growth - 1) for near-zero rates
+        growth = (1 + monthly_interest_rate) ** num_payments
+        amplification = np.where(monthly_interest_rate > 0, np.abs(growth / (growth - 1)), 0.0)
+        error = _EPSILON * (
+            16 * np.abs(home_appreciation)
+            + (8 + 16 * amplification) * np.abs(total_mortgage_cost)
+            + 4 * (np.abs(down_payment) + np.abs(total_property_tax) + np.abs(total_maintenance))
+        )
+
+    return total_buy_cost, error
+
+def _scalar_costs(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate, maintenance_rate, selling_cost_rate, appreciation_rate):
+    """Unrounded rent and buy costs with Python floats, mirroring compare_rent_vs_buy."""
+    investment = (down_payment * (investment_interest_rate / 100)) * length_of_stay
+    total_rent_cost = (monthly_rent * 12 * length_of_stay) - investment
+
+    loan_amount = home_price - down_payment
+    monthly_interest_rate = (mortgage_rate / 100) / 12
+    num_payments = length_of_stay * 12
+    home_appreciation = home_price * (1 + (appreciation_rate / 100) / 12)**(12 * length_of_stay)
+    selling_costs = home_appreciation * (selling_cost_rate / 100)
+    if monthly_interest_rate > 0:
+        monthly_payment = loan_amount * (monthly_interest_rate * (1 + monthly_interest_rate) ** num_payments) / ((1 + monthly_interest_rate) ** num_payments - 1)
+    else:
+        monthly_payment = loan_amount / num_payments
+    total_buy_cost = down_payment + monthly_payment * num_payments + (property_tax_rate / 100) * home_price * length_of_stay + (maintenance_rate / 100) * home_price * length_of_stay - (home_appreciation - selling_costs)
+
+    return total_rent_cost, total_buy_cost
+
+def _round_like_scalar(costs, error, columns, index):
+    """Round a cost array to cents, recomputing near-half-cent elements with Python floats from the input columns broadcast to its shape."""
+    scaled = costs * 100
+    # At least 1-D so the corrections below write into the result, not into a temporary scalar
+    rounded = np.array(np.rint(scaled) / 100, ndmin=1)
+
+    # Python's round works on the exact decimal value, NumPy on value * 100; both agree
+    # unless the scaled value sits within the accumulated error of a half cent
+    with np.errstate(invalid="ignore"):
+        distance = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5)
+        ambiguous = np.flatnonzero(distance <= 100 * error + 4 * _EPSILON * np.abs(scaled))
+
+    if ambiguous.size:
+        flat_columns = [np.broadcast_to(column, costs.shape).ravel() for column in columns]
+        for position in ambiguous:
+            scalar_inputs = [float(column[position]) for column in flat_columns]
+            rounded.flat[position] = round(_scalar_costs(*scalar_inputs)[index], 2)
+    return rounded.reshape(np.shape(costs))
+
+def rounded_costs(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0, appreciation_rate=None, sides=COST_COLUMNS):
+    """
+    Compute rent and/or buy costs rounded to cents for arrays of scenarios, matching compare_rent_vs_buy.
+
+    Takes the same arguments as compare_rent_vs_buy_batch; only the requested sides are computed.
+
+    :param sides: Cost columns to compute, "Rent Cost" and/or "Buy Cost"
+    :return: Dictionary of the requested cost arrays
+    """
+    if appreciation_rate is None:
+        appreciation_rate = investment_interest_rate
+
+    # Inputs broadcast against each other in the arithmetic; only the results take the common shape
+    columns = [np.asarray(value, dtype=float) for value in (
+        length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate,
+        investment_interest_rate, property_tax_rate, maintenance_rate, selling_cost_rate, appreciation_rate
+    )]
+    stay, rent, price, down, mortgage, investment, tax, maintenance, selling, appreciation = columns
+    shape = np.broadcast_shapes(*(column.shape for column in columns))
+    count("evaluations", int(np.prod(shape)))
+
+    costs = {}
+    if "Rent Cost" in sides:
+        total_rent_cost = np.broadcast_to(rent_costs(stay, rent, down, investment), shape)
+        costs["Rent Cost"] = _round_like_scalar(total_rent_cost, 0.0, columns, 0)
+    if "Buy Cost" in sides:
+        total_buy_cost, buy_error = _buy_costs_with_error(stay, price, down, mortgage, appreciation, tax, maintenance, selling)
+        costs["Buy Cost"] = _round_like_scalar(np.broadcast_to(total_buy_cost, shape), buy_error, columns, 1)
+    return costs
+
+@timed("calculation.compare")
+def compare_rent_vs_buy_batch(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0, appreciation_rate=None):
+    """
+    Compare renting vs. buying for many scenarios in one vectorized pass.
+
+    Every argument may be a scalar or an array; arrays are broadcast against each other.
+    Results match compare_rent_vs_buy to the cent for each scenario. Scenarios the scalar
+    function rejects (a length of stay of zero) get NaN costs and RECOMMENDATION_INVALID.
+
+    :param length_of_stay: Years planning to stay in the home
+    :param monthly_rent: Monthly rent cost
+    :param home_price: Purchase price of the home
+    :param down_payment: Initial down payment amount
+    :param mortgage_rate: Annual mortgage interest rate (as percentage)
+    :param investment_interest_rate: Annual investment interest (as percentage)
+    :param property_tax_rate: Annual property tax rate (default 1.2%)
+    :param maintenance_rate: Annual maintenance cost rate (default 1.0%)
+    :param selling_cost_rate: Cumulative costs of selling a home (default 8.0%)
+    :param appreciation_rate: Annual home appreciation (as percentage, defaults to investment_interest_rate)
+    :return: Dictionary of "Rent Cost", "Buy Cost" and "Recommendation Code" arrays
+    """
+    costs = rounded_costs(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate,
+                          property_tax_rate, maintenance_rate, selling_cost_rate, appreciation_rate)
+    final_rent_cost = costs["Rent Cost"]
+    final_buy_cost = costs["Buy Cost"]
+
+    return {
+        "Rent Cost": final_rent_cost,
+        "Buy Cost": final_buy_cost,
+        "Recommendation Code": recommendation_codes(final_rent_cost, final_buy_cost)
+    }
+
+def recommendation_codes(rent_cost, buy_cost):
+    """
+    Recommend the cheaper option for arrays of rounded costs.
+
+    :param rent_cost: Array of rent costs
+    :param buy_cost: Array of buy costs
+    :return: int8 array of RECOMMENDATION_* codes; RECOMMENDATION_INVALID where either cost is NaN
+    """
+    recommendation = np.full(np.broadcast_shapes(np.shape(rent_cost), np.shape(buy_cost)), RECOMMENDATION_INVALID, dtype=np.int8)
+    recommendation[rent_cost == buy_cost] = RECOMMENDATION_EITHER
+    recommendation[rent_cost < buy_cost] = RECOMMENDATION_RENT
+    recommendation[rent_cost > buy_cost] = RECOMMENDATION_BUY
+    return recommendation
+
+def complete_inputs(base_inputs):
+    """
+    Collect the compare_rent_vs_buy arguments from a dictionary, filling in default rates.
+
+    Extra keys (such as "city") are ignored. Inputs with a fallback (appreciation_rate) are
+    only included when given, so they keep following their fallback input otherwise.
+
+    :param base_inputs: Dictionary, DataFrame or other mapping of argument name to value or array
+    :return: Dictionary of float arrays for every compare_rent_vs_buy argument
+    """
+    inputs = {}
+    for name, default in INPUT_DEFAULTS.items():
+        if name in base_inputs:
+            inputs[name] = np.asarray(base_inputs[name], dtype=float)
+        elif default is not None:
+            inputs[name] = np.asarray(default, dtype=float)
+        else:
+            raise KeyError(f"Missing required input: {name}")
+    for name in INPUT_FALLBACKS:
+        if name in base_inputs:
+            inputs[name] = np.asarray(base_inputs[name], dtype=float)
+    return inputs
+
+def compare_rent_vs_buy_frame(frame):
+    """
+    Compare renting vs. buying for every row of a DataFrame (or dictionary of columns).
+
+    Columns are named after the compare_rent_vs_buy arguments; optional rate columns
+    fall back to the scalar defaults when missing.
+
+    :param frame: DataFrame or mapping of column name to array-like
+    :return: Dictionary of "Rent Cost", "Buy Cost" and "Recommendation Code" arrays
+    """
+    return compare_rent_vs_buy_batch(**complete_inputs(frame))
+
+def recommendation_labels(codes):
+    """
+    Convert recommendation codes back to the recommendation strings.
+
+    :param codes: Array of recommendation codes
+    :return: List of recommendation strings
+    """
+    return [RECOMMENDATIONS[code] for code in np.asarray(codes).ravel()]
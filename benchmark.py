@@ -0,0 +1,362 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from unittest import mock
+import numpy as np
+
+# Default dataset sizes (scenarios, cities or rows) each benchmark runs at
+DEFAULT_SIZES = (100, 10000, 100000)
+
+# Scalar benchmarks loop in Python, so they are capped to keep a run short
+SCALAR_LIMIT = 10000
+
+# Minimum duration of one timed run in seconds; fast benchmarks are called repeatedly to reach it,
+# so timer resolution and scheduling noise do not dominate sub-millisecond measurements
+DEFAULT_MIN_TIME = 0.2
+
+# Allowed slowdown against the baseline before a benchmark counts as a regression (0.25 = 25%)
+DEFAULT_TOLERANCE = 0.25
+
+# Baseline stored next to this module
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Seed of the synthetic datasets, so every run measures the same data
+SEED = 2024
+
+def synthetic_scenarios(size, seed=SEED):
+    """
+    Generate a fixed set of compare_rent_vs_buy scenarios.
+
+    :param size: Number of scenarios
+    :param seed: Random seed
+    :return: Dictionary of argument name to array
+    """
+    rng = np.random.default_rng(seed)
+    home_price = rng.uniform(80000, 1500000, size).round(0)
+    return {
+        "length_of_stay": rng.integers(1, 31, size).astype(float),
+        "monthly_rent": rng.uniform(500, 6000, size).round(2),
+        "home_price": home_price,
+        "down_payment": (home_price * rng.uniform(0.05, 0.4, size)).round(0),
+        "mortgage_rate": rng.uniform(2, 9, size).round(2),
+        "investment_interest_rate": rng.uniform(0, 10, size).round(2)
+    }
+
+def synthetic_city_table(size, seed=SEED):
+    """
+    Generate a Rent & Buy style table with the workbook's column names.
+
+    :param size: Number of rows
+    :param seed: Random seed
+    :return: DataFrame
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    scenarios = synthetic_scenarios(size, seed)
+    return pd.DataFrame({
+        "City": [f"City {i // 4}, ST" for i in range(size)],
+        "Location": np.where(np.arange(size) % 2 == 0, "City Centre", "Outside City Centre"),
+        "Number of Bedrooms": np.where(np.arange(size) % 4 < 2, 1, 3),
+        "Rent per Month": scenarios["monthly_rent"],
+        "Buy Apartment Price Total": scenarios["home_price"],
+        "Mortgage Intrest Rate": scenarios["mortgage_rate"],
+        "Vacancy": rng.integers(0, 5000, size)
+    })
+
+def synthetic_quality_table(size, seed=SEED):
+    """
+    Generate a Quality of Life style table, with a few "?" placeholders like the workbook.
+
+    :param size: Number of cities
+    :param seed: Random seed
+    :return: DataFrame
+    """
+    import pandas as pd
+    from quality_of_life import INDEX_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    table = {"City": [f"City {i}, ST" for i in range(size)]}
+    for name in INDEX_COLUMNS:
+        values = rng.uniform(0, 200 if name == "Purchasing Power Index" else 100, size).round(2).astype(object)
+        values[rng.random(size) < 0.02] = "?"
+        table[name] = values
+    return pd.DataFrame(table).replace("?", None)
+
+def _calibrate(function, min_time):
+    """Number of consecutive calls that take at least min_time seconds, doubling from one (also warms up)."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        if time.perf_counter() - start >= min_time:
+            return loops
+        loops *= 2
+
+def _time(function, repeat, loops=1):
+    """Run function loops times per run, repeat runs, and return the wall-clock duration per call of each run."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        durations.append((time.perf_counter() - start) / loops)
+    return durations
+
+# Each benchmark takes a size and returns (function to time, number of items it processes)
+
+def bench_scalar_compare(size):
+    """Scalar compare_rent_vs_buy, one call per scenario."""
+    from calculator import compare_rent_vs_buy
+
+    size = min(size, SCALAR_LIMIT)
+    scenarios = synthetic_scenarios(size)
+    rows = [dict(zip(scenarios, values)) for values in zip(*(array.tolist() for array in scenarios.values()))]
+    return (lambda: [compare_rent_vs_buy(**row) for row in rows]), size
+
+def bench_batch_compare(size):
+    """Vectorized compare_rent_vs_buy_batch over every scenario at once."""
+    from batch_calculator import compare_rent_vs_buy_batch
+
+    scenarios = synthetic_scenarios(size)
+    return (lambda: compare_rent_vs_buy_batch(**scenarios)), size
+
+def bench_stepped_compare(size):
+    """Year-stepped compare_rent_vs_buy_stepped with rent inflation, escalation, insurance and a 30-year loan."""
+    from cost_model import compare_rent_vs_buy_stepped
+
+    scenarios = synthetic_scenarios(size)
+    extra = {"rent_inflation_rate": 3.0, "tax_escalation_rate": 2.0, "insurance_rate": 0.4, "loan_term": 30.0}
+    return (lambda: compare_rent_vs_buy_stepped(**scenarios, **extra)), size
+
+def bench_sensitivity_plot(size):
+    """plot_sensitivity_analysis with matplotlib stubbed out; the home price sweep has size points."""
+    import break_even_plots
+
+    inputs = {"length_of_stay": 30, "monthly_rent": 2000, "home_price": 1000.0 * size, "down_payment": 100000,
+              "mortgage_rate": 5.0, "investment_interest_rate": 4.0}
+
+    def run():
+        with mock.patch("matplotlib.pyplot.figure"), mock.patch("matplotlib.pyplot.gca"), \
+                mock.patch("matplotlib.pyplot.show"), mock.patch.object(break_even_plots, "draw_sensitivity"):
+            break_even_plots.plot_sensitivity_analysis(inputs)
+
+    return run, size
+
+def bench_quality_of_life_scalar(size):
+    """compute_quality_of_life called once per city, with its output discarded."""
+    from quality_of_life import compute_quality_of_life
+
+    size = min(size, SCALAR_LIMIT // 10)
+    table = synthetic_quality_table(size)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for city in table["City"]:
+                compute_quality_of_life(table, city)
+
+    return run, size
+
+def bench_quality_of_life_batch(size):
+    """Vectorized score_quality_of_life and ranking over every city."""
+    from quality_of_life import rank_quality_of_life
+
+    table = synthetic_quality_table(size)
+    return (lambda: rank_quality_of_life(table)), size
+
+def _csv_file(size, directory):
+    """Write the synthetic city table as CSV once per size and return its path."""
+    path = os.path.join(directory, f"cities-{size}.csv")
+    if not os.path.exists(path):
+        synthetic_city_table(size).to_csv(path, index=False)
+    return path
+
+def bench_csv_load(size, directory):
+    """pd.read_csv of the synthetic city table."""
+    import pandas as pd
+
+    path = _csv_file(size, directory)
+    return (lambda: pd.read_csv(path)), size
+
+def bench_csv_load_cached(size, directory):
+    """read_csv_cached of the synthetic city table, with a warm cache."""
+    from data_cache import read_csv_cached
+
+    path = _csv_file(size, directory)
+    cache_dir = os.path.join(directory, "cache")
+    read_csv_cached(path, cache_dir=cache_dir)
+    return (lambda: read_csv_cached(path, cache_dir=cache_dir)), size
+
+def bench_excel_load(size, directory):
+    """pd.read_excel of a synthetic workbook (capped, since writing large workbooks is slow)."""
+    import pandas as pd
+
+    size = min(size, SCALAR_LIMIT)
+    path = os.path.join(directory, f"cities-{size}.xlsx")
+    if not os.path.exists(path):
+        synthetic_city_table(size).to_excel(path, index=False)
+    return (lambda: pd.read_excel(path)), size
+
+def bench_lookup(size):
+    """lookup_cities for size keys against a synthetic index of size rows."""
+    from city_index import build_city_index, lookup_cities
+
+    table = synthetic_city_table(size)
+    index = build_city_index(table)
+    cities, locations, bedrooms = table["City"].tolist(), table["Location"].tolist(), table["Number of Bedrooms"].tolist()
+    return (lambda: lookup_cities(index, cities, locations, bedrooms)), size
+
+# Benchmarks that need a scratch directory for their files
+FILE_BENCHMARKS = {
+    "csv_load": bench_csv_load,
+    "csv_load_cached": bench_csv_load_cached,
+    "excel_load": bench_excel_load
+}
+
+BENCHMARKS = {
+    "scalar_compare": bench_scalar_compare,
+    "batch_compare": bench_batch_compare,
+    "stepped_compare": bench_stepped_compare,
+    "sensitivity_plot": bench_sensitivity_plot,
+    "quality_of_life_scalar": bench_quality_of_life_scalar,
+    "quality_of_life_batch": bench_quality_of_life_batch,
+    "lookup": bench_lookup,
+    **FILE_BENCHMARKS
+}
+
+def run_benchmarks(names=None, sizes=DEFAULT_SIZES, repeat=5, min_time=DEFAULT_MIN_TIME):
+    """
+    Run benchmarks on the synthetic datasets.
+
+    :param names: Benchmark names to run (defaults to all of BENCHMARKS)
+    :param sizes: Dataset sizes to run each benchmark at
+    :param repeat: Timed runs per benchmark and size (after a warm-up that also calibrates the calls per run)
+    :param min_time: Minimum duration of one timed run in seconds (0 for a single call per run)
+    :return: Results dictionary with "metadata" and "results" keyed by "name[size]"
+    """
+    names = list(BENCHMARKS) if names is None else list(names)
+    for name in names:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark: {name}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in names:
+            measured = set()
+            for size in sizes:
+                if name in FILE_BENCHMARKS:
+                    function, items = FILE_BENCHMARKS[name](size, directory)
+                else:
+                    function, items = BENCHMARKS[name](size)
+                # Capped benchmarks would repeat the same measurement at larger sizes
+                if items in measured:
+                    continue
+                measured.add(items)
+                loops = _calibrate(function, min_time)
+                durations = _time(function, repeat, loops)
+                best = min(durations)
+                results[f"{name}[{size}]"] = {
+                    "name": name,
+                    "size": size,
+                    "items": items,
+                    "repeat": repeat,
+                    "loops": loops,
+                    "best": best,
+                    "median": statistics.median(durations),
+                    "items_per_second": items / best if best > 0 else None
+                }
+
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+
+def compare_results(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare a benchmark run with a baseline run.
+
+    Benchmarks are compared on their best time per call; keys missing from either run are ignored.
+
+    :param current: Results dictionary from run_benchmarks
+    :param baseline: Results dictionary from an earlier run
+    :param tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+    :return: List of regressions as dictionaries with the key, both times and the ratio, slowest first
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None or not reference["best"]:
+            continue
+        ratio = result["best"] / reference["best"]
+        if ratio > 1 + tolerance:
+            regressions.append({"benchmark": key, "best": result["best"], "baseline": reference["best"], "ratio": ratio})
+    return sorted(regressions, key=lambda regression: regression["ratio"], reverse=True)
+
+def format_results(results):
+    """Format a results dictionary as a plain-text table."""
+    lines = [f"{'benchmark':<34}{'best (ms)':>12}{'median (ms)':>14}{'items/s':>14}"]
+    for key, result in results["results"].items():
+        rate = result["items_per_second"]
+        lines.append(f"{key:<34}{result['best'] * 1000:>12.3f}{result['median'] * 1000:>14.3f}{rate if rate else 0:>14,.0f}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    :return: Exit status, 1 if any benchmark regressed beyond the tolerance
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the calculator, sensitivity, quality of life and data loading hot paths.")
+    parser.add_argument("benchmarks", nargs="*", help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Dataset sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="Minimum seconds per timed run")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed relative slowdown")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.benchmarks or None, args.sizes, args.repeat, args.min_time)
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as source:
+        baseline = json.load(source)
+
+    regressions = compare_results(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression['benchmark']}: {regression['best'] * 1000:.3f} ms vs. baseline "
+              f"{regression['baseline'] * 1000:.3f} ms ({regression['ratio']:.2f}x)", file=sys.stderr)
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
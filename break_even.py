@@ -0,0 +1,130 @@
+import numpy as np
+from instrumentation import count, timed
+from batch_calculator import INPUT_NAMES, complete_inputs, rent_costs, buy_costs
+
+# Inputs for which rent cost minus buy cost is linear, so the break-even point has a closed form
+LINEAR_FACTORS = ("monthly_rent", "home_price", "down_payment", "property_tax_rate", "maintenance_rate", "selling_cost_rate")
+
+# Default search brackets for the factors that need a root-finder
+DEFAULT_BRACKETS = {
+    "length_of_stay": (1 / 12, 50),  # years
+    "mortgage_rate": (0, 30),  # percent
+    "investment_interest_rate": (0, 30),  # percent
+    "appreciation_rate": (-20, 30)  # percent
+}
+
+def cost_difference(inputs):
+    """
+    Compute the unrounded rent cost minus buy cost for arrays of scenarios.
+
+    :param inputs: Dictionary of compare_rent_vs_buy arguments (scalars or arrays)
+    :return: Array that is positive where buying is cheaper and negative where renting is cheaper
+    """
+    rent = rent_costs(inputs["length_of_stay"], inputs["monthly_rent"], inputs["down_payment"], inputs["investment_interest_rate"])
+    buy = buy_costs(inputs["length_of_stay"], inputs["home_price"], inputs["down_payment"], inputs["mortgage_rate"],
+                    inputs["investment_interest_rate"], inputs["property_tax_rate"], inputs["maintenance_rate"], inputs["selling_cost_rate"],
+                    inputs.get("appreciation_rate"))
+    return rent - buy
+
+def _linear_break_even(inputs, factor):
+    """Solve a linear factor exactly from two evaluations of the cost difference."""
+    # Evaluate at zero and at a point of the same magnitude as the base value to limit cancellation
+    scale = np.maximum(np.abs(inputs[factor]), 1.0)
+    at_zero = cost_difference({**inputs, factor: np.zeros_like(scale)})
+    at_scale = cost_difference({**inputs, factor: scale})
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (at_scale - at_zero) / scale
+        root = -at_zero / slope
+
+    # A flat difference never crosses zero
+    return np.where(slope != 0, root, np.nan), 2
+
+def _bracketed_break_even(inputs, factor, lower, upper, tolerance, max_iterations):
+    """Find the break-even point of a non-linear factor with the vectorized Illinois method."""
+    shape = np.broadcast_shapes(*[np.shape(value) for value in inputs.values()], np.shape(lower), np.shape(upper))
+    a = np.broadcast_to(np.asarray(lower, dtype=float), shape).copy()
+    b = np.broadcast_to(np.asarray(upper, dtype=float), shape).copy()
+
+    def difference(x):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            return np.broadcast_to(cost_difference({**inputs, factor: x}), shape).copy()
+
+    fa = difference(a)
+    fb = difference(b)
+    evaluations = 2
+
+    # Only scenarios whose bracket contains a sign change can be solved
+    bracketed = np.isfinite(fa) & np.isfinite(fb) & (np.sign(fa) * np.sign(fb) <= 0)
+    root = np.full(shape, np.nan)
+    root[bracketed & (fa == 0)] = a[bracketed & (fa == 0)]
+    root[bracketed & (fb == 0)] = b[bracketed & (fb == 0)]
+    active = bracketed & (fa != 0) & (fb != 0)
+
+    while active.any() and evaluations < max_iterations + 2:
+        # Secant step through the bracket ends, falling back to bisection if it leaves the bracket
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = (a * fb - b * fa) / (fb - fa)
+        outside = ~np.isfinite(c) | (c <= np.minimum(a, b)) | (c >= np.maximum(a, b))
+        c = np.where(outside, (a + b) / 2, c)
+        c = np.where(active, c, b)
+
+        fc = difference(c)
+        evaluations += 1
+
+        # Keep the sign change inside [a, b]; halve the stale end (Illinois) when it is retained
+        crossed = np.sign(fc) * np.sign(fb) < 0
+        a = np.where(active & crossed, b, a)
+        fa = np.where(active & crossed, fb, np.where(active, fa / 2, fa))
+        b = np.where(active, c, b)
+        fb = np.where(active, fc, fb)
+
+        converged = active & ((fc == 0) | (np.abs(b - a) <= tolerance * (1 + np.abs(b))))
+        root[converged] = b[converged]
+        active &= ~converged
+
+    return root, evaluations
+
+@timed("calculation.break_even")
+def solve_break_even(base_inputs, factor, lower=None, upper=None, tolerance=1e-10, max_iterations=100, return_evaluations=False):
+    """
+    Find the value of one input at which renting and buying cost the same, holding the others fixed.
+
+    Linear inputs (rent, price, down payment and the cost rates) are solved analytically.
+    Length of stay and the two interest rates use a bracketed root-finder vectorized across
+    scenarios. Scenarios without a crossover inside the bracket return NaN.
+
+    :param base_inputs: Dictionary of compare_rent_vs_buy arguments; values may be arrays of scenarios
+    :param factor: Name of the input to solve for
+    :param lower: Lower end of the search bracket (defaults to DEFAULT_BRACKETS)
+    :param upper: Upper end of the search bracket (defaults to DEFAULT_BRACKETS)
+    :param tolerance: Relative tolerance on the bracket width
+    :param max_iterations: Maximum number of root-finder iterations
+    :param return_evaluations: Also return the number of vectorized cost evaluations performed
+    :return: Break-even value(s) of the factor, plus the evaluation count if requested
+    """
+    if factor not in INPUT_NAMES:
+        raise ValueError(f"Unknown factor: {factor}")
+    inputs = complete_inputs(base_inputs)
+
+    if factor in LINEAR_FACTORS:
+        root, evaluations = _linear_break_even(inputs, factor)
+        # Report only crossovers inside an explicit bracket
+        if lower is not None:
+            root = np.where(root >= lower, root, np.nan)
+        if upper is not None:
+            root = np.where(root <= upper, root, np.nan)
+    else:
+        default_lower, default_upper = DEFAULT_BRACKETS[factor]
+        root, evaluations = _bracketed_break_even(
+            inputs, factor,
+            default_lower if lower is None else lower,
+            default_upper if upper is None else upper,
+            tolerance, max_iterations
+        )
+
+    count("break_even.evaluations", evaluations)
+    root = np.asarray(root)[()]
+    if return_evaluations:
+        return root, evaluations
+    return root
@@ -0,0 +1,239 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from batch_calculator import INPUT_DEFAULTS, INPUT_FALLBACKS, RECOMMENDATIONS
+from cost_model import MODELS, STEPPED_DEFAULTS, STEPPED_FALLBACKS, compare_with_model, model_inputs
+from city_index import INDEX_COLUMNS, build_city_index, lookup_cities
+from data_cache import read_excel_cached
+
+# Rent & Buy workbook the scenario rows are joined to
+RENT_AND_BUY_FILE = "data/Random Cities in USA (Rent & Buy).xlsx"
+
+# Rows read, scored and written per chunk; memory use depends on this, not on the file size
+DEFAULT_CHUNK_SIZE = 100000
+
+# Scenario columns naming the city row to join
+KEY_COLUMNS = ("city", "location", "bedrooms")
+
+# Columns appended to every scored chunk
+RESULT_COLUMNS = ("Rent Cost", "Buy Cost", "Recommendation")
+
+def _file_format(path, file_format=None):
+    """Infer "csv" or "parquet" from a file extension unless given."""
+    if file_format is not None:
+        return file_format
+    return "parquet" if os.path.splitext(path)[1].lower() in (".parquet", ".pq") else "csv"
+
+def _require_pyarrow():
+    """Import pyarrow for Parquet support, with a helpful message if it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Parquet input and output require pyarrow (pip install pyarrow).") from error
+    return pyarrow
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, file_format=None):
+    """
+    Read a scenario file in fixed-size chunks without loading it fully.
+
+    :param path: Path of a CSV or Parquet file
+    :param chunk_size: Number of rows per chunk
+    :param file_format: "csv" or "parquet" (inferred from the extension by default)
+    :return: Iterator of DataFrames
+    """
+    if _file_format(path, file_format) == "parquet":
+        pyarrow = _require_pyarrow()
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        with pd.read_csv(path, chunksize=chunk_size) as reader:
+            yield from reader
+
+class ChunkWriter:
+    """Append scored chunks to a CSV or Parquet file as they are produced."""
+
+    def __init__(self, path, file_format=None):
+        """
+        :param path: Output path
+        :param file_format: "csv" or "parquet" (inferred from the extension by default)
+        """
+        self.path = path
+        self.file_format = _file_format(path, file_format)
+        self._writer = None
+        self._started = False
+
+    def write(self, chunk):
+        """Append one chunk."""
+        if self.file_format == "parquet":
+            pyarrow = _require_pyarrow()
+            table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                # A chunk of whole numbers reads as integers, but a later chunk of the same column may hold
+                # gaps or fractions, so integer columns are stored as float64 from the start
+                schema = pyarrow.schema([
+                    field.with_type(pyarrow.float64()) if pyarrow.types.is_integer(field.type) else field for field in table.schema
+                ])
+                self._writer = pyarrow.parquet.ParquetWriter(self.path, schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            # The header goes with the first chunk only
+            chunk.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        """Finish the file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def join_city_data(chunk, index):
+    """
+    Fill monthly_rent, home_price and mortgage_rate from the Rent & Buy data for every row.
+
+    Each distinct (city, location, bedrooms) key of the chunk is looked up once.
+    Rows that already give a value keep it.
+
+    :param chunk: DataFrame of scenarios with city, location and bedrooms columns
+    :param index: Index returned by build_city_index
+    :return: Boolean array marking the rows whose key was found
+    """
+    keys = chunk[list(KEY_COLUMNS)]
+    codes = keys.groupby(list(KEY_COLUMNS), sort=False, dropna=False).ngroup().to_numpy()
+    unique = keys.drop_duplicates()
+    city_data = lookup_cities(index, unique["city"].astype(str), unique["location"].astype(str), unique["bedrooms"].to_numpy())
+
+    for name in INDEX_COLUMNS:
+        values = city_data[name][codes]
+        if name in chunk:
+            values = np.where(chunk[name].isna().to_numpy(), values, chunk[name].to_numpy(dtype=float))
+        chunk[name] = values
+    return city_data["found"][codes]
+
+def score_chunk(chunk, index=None, model="simple"):
+    """
+    Score one chunk of scenarios vectorized.
+
+    Scenario columns are named after the compare_rent_vs_buy arguments (plus the stepped model's
+    extra inputs). When the chunk has city, location and bedrooms columns, rent, price and
+    mortgage rate come from the city data. Rows with a missing input or an unknown city get
+    empty results.
+
+    :param chunk: DataFrame of scenarios (modified in place and returned)
+    :param index: Index returned by build_city_index (required when the chunk names cities)
+    :param model: Cost model, "simple" or "stepped" (see cost_model)
+    :return: The chunk with the joined city columns and "Rent Cost", "Buy Cost" and "Recommendation"
+    """
+    model_inputs(model)
+    if all(column in chunk for column in KEY_COLUMNS):
+        if index is None:
+            raise ValueError("A city index is needed to score rows that name a city.")
+        join_city_data(chunk, index)
+
+    inputs = {}
+    for name, default in INPUT_DEFAULTS.items():
+        if name in chunk:
+            inputs[name] = np.asarray(chunk[name], dtype=float)
+        elif default is not None:
+            inputs[name] = np.full(len(chunk), default)
+        else:
+            raise KeyError(f"Missing required input: {name}")
+    fallbacks = dict(INPUT_FALLBACKS)
+    if model == "stepped":
+        for name, default in STEPPED_DEFAULTS.items():
+            if name in chunk:
+                values = np.asarray(chunk[name], dtype=float)
+                inputs[name] = np.where(np.isnan(values), default, values)
+        fallbacks.update(STEPPED_FALLBACKS)
+    for name, fallback in fallbacks.items():
+        if name in chunk:
+            # Rows without their own value fall back like compare_rent_vs_buy does
+            values = np.asarray(chunk[name], dtype=float)
+            inputs[name] = np.where(np.isnan(values), inputs[fallback], values)
+
+    valid = np.logical_and.reduce([np.isfinite(values) for values in inputs.values()])
+    rent_cost = np.full(len(chunk), np.nan)
+    buy_cost = np.full(len(chunk), np.nan)
+    recommendation = np.full(len(chunk), None, dtype=object)
+    if valid.any():
+        result = compare_with_model({name: values[valid] for name, values in inputs.items()}, model)
+        rent_cost[valid] = result["Rent Cost"]
+        buy_cost[valid] = result["Buy Cost"]
+        recommendation[valid] = np.array(RECOMMENDATIONS, dtype=object)[result["Recommendation Code"]]
+
+    import pandas as pd
+
+    chunk["Rent Cost"] = rent_cost
+    chunk["Buy Cost"] = buy_cost
+    # A string dtype keeps the Parquet schema stable even for chunks without any scored row
+    chunk["Recommendation"] = pd.Series(recommendation, index=chunk.index, dtype="string")
+    return chunk
+
+def score_file(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, data_file=RENT_AND_BUY_FILE,
+               input_format=None, output_format=None, progress=None, model="simple"):
+    """
+    Stream a scenario file through the batch calculator into an output file, one chunk at a time.
+
+    :param input_path: CSV or Parquet file of scenarios
+    :param output_path: CSV or Parquet file to write
+    :param chunk_size: Rows per chunk
+    :param data_file: Rent & Buy workbook joined on city, location and bedrooms
+    :param input_format: "csv" or "parquet" (inferred from the extension by default)
+    :param output_format: "csv" or "parquet" (inferred from the extension by default)
+    :param progress: Optional function called with the running statistics after every chunk
+    :param model: Cost model, "simple" or "stepped" (see cost_model)
+    :return: Dictionary with the number of rows, unscored rows, chunks, seconds and rows per second
+    """
+    index = build_city_index(read_excel_cached(data_file))
+    stats = {"rows": 0, "unscored": 0, "chunks": 0, "seconds": 0.0, "rows_per_second": 0.0}
+    start = time.perf_counter()
+
+    with ChunkWriter(output_path, output_format) as writer:
+        for chunk in iter_chunks(input_path, chunk_size, input_format):
+            scored = score_chunk(chunk, index, model)
+            writer.write(scored)
+
+            stats["rows"] += len(scored)
+            stats["unscored"] += int(scored["Rent Cost"].isna().sum())
+            stats["chunks"] += 1
+            stats["seconds"] = time.perf_counter() - start
+            stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+            if progress is not None:
+                progress(dict(stats))
+    return stats
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Score rent vs. buy scenarios from a CSV or Parquet file in chunks.")
+    parser.add_argument("input", help="CSV or Parquet file of scenarios")
+    parser.add_argument("output", help="CSV or Parquet file to write")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--data-file", default=RENT_AND_BUY_FILE, help="Rent & Buy workbook to join on city, location and bedrooms")
+    parser.add_argument("--input-format", choices=("csv", "parquet"))
+    parser.add_argument("--output-format", choices=("csv", "parquet"))
+    parser.add_argument("--model", choices=MODELS, default="simple", help="Cost model (default: simple)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args(argv)
+
+    def report(stats):
+        sys.stderr.write(f"\r{stats['rows']:,} rows, {stats['rows_per_second']:,.0f} rows/sec")
+        sys.stderr.flush()
+
+    stats = score_file(args.input, args.output, args.chunk_size, args.data_file, args.input_format, args.output_format,
+                       progress=None if args.quiet else report, model=args.model)
+    if not args.quiet:
+        sys.stderr.write("\n")
+    print(f"Scored {stats['rows']:,} rows ({stats['unscored']:,} unscored) in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,.0f} rows/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,10 @@ inputs = {
             "investment_interest_rate": 4.0 # percent
         }
 
-def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0): 
+def rent_vs_buy_costs(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0, appreciation_rate=None):
 
     """
-    Compare renting vs. buying a home.
+    Compute the rounded total costs of renting and buying a home.
     
     :param length_of_stay: Years planning to stay in the home
     :param monthly_rent: Monthly rent cost
@@ -21,7 +21,8 @@ def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment,
     :param maintenance_rate: Annual maintenance cost rate (default 1.0%)
     :param investment_interest_rate: Annual investment interest (as percentage)
     :param selling_cost_rate: Cumulative costs of selling a home (default 8.0%)
-    :return: Total costs for renting and buying, and recommendation
+    :param appreciation_rate: Annual home appreciation (as percentage, defaults to investment_interest_rate)
+    :return: Tuple of rent cost and buy cost
     """
           
     # Renting cost calculations
@@ -31,10 +32,12 @@ def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment,
 
     
     # Buying cost calculations
+    if appreciation_rate is None:
+        appreciation_rate = investment_interest_rate
     loan_amount = home_price - down_payment
     monthly_interest_rate = (mortgage_rate / 100) / 12
     num_payments = length_of_stay * 12
-    home_appreciation = home_price * (1 + (investment_interest_rate / 100) / 12)**(12 * length_of_stay) 
+    home_appreciation = home_price * (1 + (appreciation_rate / 100) / 12)**(12 * length_of_stay) 
     selling_costs = home_appreciation * (selling_cost_rate / 100) 
 
     
@@ -50,7 +53,20 @@ def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment,
 
     total_buy_cost = down_payment + total_mortgage_cost + total_property_tax + total_maintenance - total_resale_value
     final_buy_cost = round(total_buy_cost, 2) #Rounded cost to account for real currency values
-    
+    return final_rent_cost, final_buy_cost
+
+def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0, appreciation_rate=None): 
+
+    """
+    Compare renting vs. buying a home.
+
+    Takes the same arguments as rent_vs_buy_costs; records.compare_scenario returns the same
+    result as a compact ComparisonResult.
+
+    :return: Total costs for renting and buying, and recommendation
+    """
+    final_rent_cost, final_buy_cost = rent_vs_buy_costs(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate, property_tax_rate, maintenance_rate, selling_cost_rate, appreciation_rate)
+
     # Recommendation
     if final_rent_cost < final_buy_cost:
         recommendation = "Renting is financially better."
@@ -65,5 +81,7 @@ def compare_rent_vs_buy(length_of_stay, monthly_rent, home_price, down_payment,
         "Recommendation": recommendation
     }
 
-result = compare_rent_vs_buy(**inputs)
-print(result)
\ No newline at end of file
+# Run the example calculation only when the script is executed directly, not on import
+if __name__ == "__main__":
+    result = compare_rent_vs_buy(**inputs)
+    print(result)
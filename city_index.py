@@ -0,0 +1,94 @@
+import numpy as np
+from instrumentation import count, timed
+
+# Workbook columns exposed by the index, keyed by the calculator argument they feed
+INDEX_COLUMNS = {
+    "monthly_rent": "Rent per Month",
+    "home_price": "Buy Apartment Price Total",
+    "mortgage_rate": "Mortgage Intrest Rate"
+}
+
+def normalize_key(city, location, bedrooms):
+    """
+    Normalize a (City, Location, Number of Bedrooms) key for index lookups.
+
+    :param city: City name, e.g. "Anchorage, AK"
+    :param location: "City Centre" or "Outside City Centre"
+    :param bedrooms: Number of bedrooms as int, float or string
+    :return: Tuple of stripped city, stripped location and integer bedrooms
+    """
+    bedrooms = float(str(bedrooms).strip())
+    if not bedrooms.is_integer():
+        raise ValueError(f"Number of bedrooms must be a whole number: {bedrooms}")
+    return str(city).strip(), str(location).strip(), int(bedrooms)
+
+def build_city_index(data):
+    """
+    Build a lookup index on (City, Location, Number of Bedrooms) from the Rent & Buy data.
+
+    :param data: DataFrame loaded from "Random Cities in USA (Rent & Buy).xlsx"
+    :return: Dictionary with the key-to-row "positions" mapping, the indexed value columns and the city list
+    """
+    positions = {}
+    for position, key in enumerate(zip(data["City"], data["Location"], data["Number of Bedrooms"])):
+        # Keep the first row for duplicated keys, like the original filter did with .values[0]
+        positions.setdefault(normalize_key(*key), position)
+
+    index = {name: np.asarray(data[column], dtype=float) for name, column in INDEX_COLUMNS.items()}
+    index["positions"] = positions
+    index["cities"] = list(dict.fromkeys(str(city) for city in data["City"]))
+    return index
+
+@timed("lookup")
+def lookup_city(index, city, location, bedrooms):
+    """
+    Look up rent, home price and mortgage rate for one key in O(1).
+
+    :param index: Index returned by build_city_index
+    :param city: City name
+    :param location: "City Centre" or "Outside City Centre"
+    :param bedrooms: Number of bedrooms
+    :return: Dictionary with monthly_rent, home_price and mortgage_rate, or None if the key is not in the index
+    """
+    count("lookups")
+    try:
+        position = index["positions"].get(normalize_key(city, location, bedrooms))
+    except ValueError:
+        return None
+    if position is None:
+        return None
+    return {name: float(index[name][position]) for name in INDEX_COLUMNS}
+
+@timed("lookup")
+def lookup_cities(index, cities, locations, bedrooms):
+    """
+    Look up many keys at once.
+
+    :param index: Index returned by build_city_index
+    :param cities: Sequence of city names
+    :param locations: Sequence of locations (or a single location for every city)
+    :param bedrooms: Sequence of bedroom counts (or a single count for every city)
+    :return: Dictionary of monthly_rent, home_price and mortgage_rate arrays (NaN where missing) and a boolean "found" mask
+    """
+    cities = list(cities)
+    count("lookups", len(cities))
+    locations = [locations] * len(cities) if isinstance(locations, str) else list(locations)
+    bedrooms = list(np.broadcast_to(np.asarray(bedrooms, dtype=object), (len(cities),)))
+
+    positions = index["positions"]
+    rows = np.empty(len(cities), dtype=np.int64)
+    for i, key in enumerate(zip(cities, locations, bedrooms)):
+        try:
+            rows[i] = positions.get(normalize_key(*key), -1)
+        except ValueError:
+            rows[i] = -1
+
+    # Gather every column with a single fancy-indexing operation
+    found = rows >= 0
+    result = {}
+    for name in INDEX_COLUMNS:
+        values = np.full(len(cities), np.nan)
+        values[found] = index[name][rows[found]]
+        result[name] = values
+    result["found"] = found
+    return result
@@ -0,0 +1,250 @@
+import numpy as np
+from instrumentation import count, timed
+
+# Features compared between cities: the Quality of Life indices and the rent & buy costs
+SIMILARITY_FEATURES = (
+    "Purchasing Power Index",
+    "Safety Index",
+    "Health Care Index",
+    "Climate Index",
+    "Cost Of Living Index",
+    "Property Price to Income Ratio",
+    "Traffic Commute Time Index",
+    "Pollution Index",
+    "Rent per Month",
+    "Buy Apartment Price Total",
+    "Mortgage Intrest Rate"
+)
+
+# Largest number of points in a leaf of the KD-tree
+LEAF_SIZE = 32
+
+# Queries searched together; bounds the queries x leaves matrix of the batched search
+QUERY_CHUNK_SIZE = 1024
+
+def city_features(data, features=SIMILARITY_FEATURES, key="City"):
+    """
+    Average the feature columns of the Rent & Buy dataset per city.
+
+    :param data: DataFrame loaded from "Random Cities in USA (Rent & Buy).xlsx" (one row per location and bedroom count)
+    :param features: Feature columns to average
+    :param key: Column naming the cities
+    :return: DataFrame with one row per city, in order of first appearance
+    """
+    return data.groupby(key, sort=False)[list(features)].mean().reset_index()
+
+def _split(points, indices, leaf_size, leaves):
+    """Split points at the median of their widest feature until every leaf is small enough."""
+    if len(indices) <= leaf_size:
+        leaves.append(indices)
+        return
+    subset = points[indices]
+    dimension = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+    middle = len(indices) // 2
+    partition = np.argpartition(subset[:, dimension], middle)
+    _split(points, indices[partition[:middle]], leaf_size, leaves)
+    _split(points, indices[partition[middle:]], leaf_size, leaves)
+
+@timed("similarity.build")
+def build_similarity_index(data, features=SIMILARITY_FEATURES, key="City", weights=None, leaf_size=LEAF_SIZE):
+    """
+    Build a KD-tree over standardized city features.
+
+    Each feature is scaled to zero mean and unit standard deviation (times its weight), so
+    distances weigh every feature equally unless weighted otherwise. Missing values count
+    as the feature's mean. The tree's leaves are stored as padded blocks with bounding boxes,
+    which lets the queries search many reference cities at once.
+
+    :param data: DataFrame or mapping with the key column and the feature columns (see city_features)
+    :param features: Feature columns to compare
+    :param key: Column naming the rows
+    :param weights: Optional dictionary of feature name to weight (default 1)
+    :param leaf_size: Largest number of points per leaf
+    :return: Dictionary with the row "names", their "positions", the "features" and their "mean", "scale" and "weights",
+             the standardized "points" and the tree arrays
+    """
+    weights = weights or {}
+    unknown = set(weights) - set(features)
+    if unknown:
+        raise ValueError(f"Unknown features: {sorted(unknown)}")
+    raw = np.column_stack([np.asarray(data[feature], dtype=float) for feature in features])
+    names = [str(name) for name in data[key]]
+
+    with np.errstate(invalid="ignore"):
+        mean = np.nan_to_num(np.nanmean(raw, axis=0)) if len(raw) else np.zeros(len(features))
+        scale = np.nanstd(raw, axis=0) if len(raw) else np.ones(len(features))
+    scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+
+    index = {
+        "names": names,
+        "positions": {name: position for position, name in reversed(list(enumerate(names)))},
+        "features": tuple(features),
+        "mean": mean,
+        "scale": scale,
+        "weights": np.array([weights.get(feature, 1.0) for feature in features], dtype=float)
+    }
+    points = standardize(index, raw)
+    index["points"] = points
+
+    leaves = []
+    if len(points):
+        _split(points, np.arange(len(points)), leaf_size, leaves)
+    width = max((len(leaf) for leaf in leaves), default=0)
+
+    # Leaf blocks padded with infinitely distant points, plus each leaf's bounding box
+    leaf_points = np.full((len(leaves), width, len(features)), np.inf)
+    leaf_rows = np.full((len(leaves), width), -1, dtype=np.int64)
+    for position, leaf in enumerate(leaves):
+        leaf_points[position, :len(leaf)] = points[leaf]
+        leaf_rows[position, :len(leaf)] = leaf
+    index["leaf_points"] = leaf_points
+    index["leaf_rows"] = leaf_rows
+    index["lower"] = np.array([points[leaf].min(axis=0) for leaf in leaves]).reshape(len(leaves), len(features))
+    index["upper"] = np.array([points[leaf].max(axis=0) for leaf in leaves]).reshape(len(leaves), len(features))
+    return index
+
+def standardize(index, values):
+    """
+    Scale raw feature values like the index does.
+
+    :param index: Index returned by build_similarity_index
+    :param values: Array of feature values, one row per point, columns in the order of index["features"]
+    :return: Standardized array (missing values become 0, the feature mean)
+    """
+    return np.nan_to_num((np.asarray(values, dtype=float) - index["mean"]) / index["scale"]) * index["weights"]
+
+def _leaf_bounds(index, queries):
+    """Squared distance from every query to every leaf's bounding box (queries x leaves)."""
+    below = np.maximum(index["lower"][np.newaxis] - queries[:, np.newaxis], 0)
+    above = np.maximum(queries[:, np.newaxis] - index["upper"][np.newaxis], 0)
+    return np.sum(np.maximum(below, above) ** 2, axis=2)
+
+def _leaf_distances(index, queries, leaves):
+    """Squared distances from each query to the points of one leaf per query (queries x leaf width)."""
+    with np.errstate(invalid="ignore"):
+        return np.sum((index["leaf_points"][leaves] - queries[:, np.newaxis]) ** 2, axis=2)
+
+@timed("similarity.query")
+def nearest_neighbours(index, queries, k=5):
+    """
+    Find the k nearest indexed points of many standardized query points at once.
+
+    Every query visits the tree's leaves in order of their distance to it, all queries in
+    lockstep, and stops once the next leaf cannot hold a point closer than its k-th best.
+
+    :param index: Index returned by build_similarity_index
+    :param queries: Standardized query points (see standardize), one per row
+    :param k: Number of neighbours
+    :return: Tuple of distances and row positions, each queries x k, nearest first (inf and -1 beyond the index size)
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=float))
+    distances = np.full((len(queries), k), np.inf)
+    rows = np.full((len(queries), k), -1, dtype=np.int64)
+    num_leaves = len(index["leaf_points"])
+    visited = 0
+
+    for start in range(0, len(queries) if num_leaves else 0, QUERY_CHUNK_SIZE):
+        chunk = queries[start:start + QUERY_CHUNK_SIZE]
+        best = distances[start:start + QUERY_CHUNK_SIZE]
+        best_rows = rows[start:start + QUERY_CHUNK_SIZE]
+        bounds = _leaf_bounds(index, chunk)
+        order = np.argsort(bounds, axis=1)
+        for step in range(num_leaves):
+            leaves = order[:, step]
+            active = np.flatnonzero(bounds[np.arange(len(chunk)), leaves] < best[:, -1])
+            if not len(active):
+                break
+            visited += len(active)
+
+            # Merge the leaf's points into each active query's k best
+            candidates = np.concatenate([best[active], _leaf_distances(index, chunk[active], leaves[active])], axis=1)
+            candidate_rows = np.concatenate([best_rows[active], index["leaf_rows"][leaves[active]]], axis=1)
+            nearest = np.argsort(candidates, axis=1, kind="stable")[:, :k]
+            best[active] = np.take_along_axis(candidates, nearest, axis=1)
+            best_rows[active] = np.take_along_axis(candidate_rows, nearest, axis=1)
+    count("similarity.leaf_visits", visited)
+
+    return np.sqrt(distances), rows
+
+@timed("similarity.query")
+def neighbours_within(index, queries, radius):
+    """
+    Find every indexed point within a distance of many standardized query points.
+
+    :param index: Index returned by build_similarity_index
+    :param queries: Standardized query points (see standardize), one per row
+    :param radius: Largest distance in standardized units
+    :return: List with one (distances, row positions) pair of arrays per query, nearest first
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=float))
+    found = [([], []) for _ in queries]
+    limit = radius ** 2
+    for start in range(0, len(queries), QUERY_CHUNK_SIZE):
+        chunk = queries[start:start + QUERY_CHUNK_SIZE]
+        reachable = _leaf_bounds(index, chunk) <= limit
+        # One pass per leaf over the queries whose radius reaches it
+        for leaf in np.flatnonzero(reachable.any(axis=0)):
+            active = np.flatnonzero(reachable[:, leaf])
+            squared = _leaf_distances(index, chunk[active], np.full(len(active), leaf))
+            for query, row_distances in zip(active, squared):
+                inside = row_distances <= limit
+                found[start + query][0].append(row_distances[inside])
+                found[start + query][1].append(index["leaf_rows"][leaf][inside])
+
+    results = []
+    for distances, rows in found:
+        distances = np.sqrt(np.concatenate(distances)) if distances else np.empty(0)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        order = np.argsort(distances, kind="stable")
+        results.append((distances[order], rows[order]))
+    return results
+
+def _rows_of(index, cities):
+    """Row positions of named cities."""
+    rows = [index["positions"].get(str(city).strip(), -1) for city in cities]
+    missing = [city for city, row in zip(cities, rows) if row < 0]
+    if missing:
+        raise KeyError(f"Unknown cities: {missing}")
+    return np.array(rows, dtype=np.int64)
+
+def similar_cities(index, cities, k=5):
+    """
+    The k cities most like each reference city, excluding the city itself.
+
+    :param index: Index returned by build_similarity_index
+    :param cities: Names of the reference cities
+    :param k: Number of similar cities per reference city
+    :return: Dictionary of reference city to a list of (city, distance) pairs, most similar first
+    """
+    rows = _rows_of(index, cities)
+    distances, neighbours = nearest_neighbours(index, index["points"][rows], k + 1)
+    similar = {}
+    for city, row, row_distances, row_neighbours in zip(cities, rows, distances, neighbours):
+        keep = (row_neighbours != row) & (row_neighbours >= 0)
+        similar[city] = [(index["names"][other], float(distance))
+                         for other, distance in zip(row_neighbours[keep][:k], row_distances[keep][:k])]
+    return similar
+
+def cities_within(index, cities, radius):
+    """
+    Every city within a standardized distance of each reference city, excluding the city itself.
+
+    :param index: Index returned by build_similarity_index
+    :param cities: Names of the reference cities
+    :param radius: Largest distance (in standard deviations for a single feature)
+    :return: Dictionary of reference city to a list of (city, distance) pairs, most similar first
+    """
+    rows = _rows_of(index, cities)
+    within = {}
+    for city, row, (distances, neighbours) in zip(cities, rows, neighbours_within(index, index["points"][rows], radius)):
+        within[city] = [(index["names"][other], float(distance)) for other, distance in zip(neighbours, distances) if other != row]
+    return within
+
+# Print the most similar cities of the dataset only when the script is executed directly, not on import
+if __name__ == "__main__":
+    from data_cache import read_excel_cached
+
+    table = city_features(read_excel_cached("data/Random Cities in USA (Rent & Buy).xlsx"))
+    similarity_index = build_similarity_index(table)
+    for reference, others in similar_cities(similarity_index, list(table["City"]), k=3).items():
+        print(f"{reference}: " + ", ".join(f"{city} ({distance:.2f})" for city, distance in others))
@@ -1,75 +1,44 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mticker
+import dp04
+from data_cache import read_csv_cached
+from rendering import draw_vacancy
 
-def plot_vacancy(vacancy):
+def is_dp04_export(path):
     """
-    Plots number of vacant homes, median home value, and median costs to rent and buy for selected cities.
+    Checks whether a CSV file is a full ACS DP04 export rather than the hand-extracted vacancy table.
     """
-       
-    df = pd.read_csv(vacancy)
+    with open(path, newline="", encoding="utf-8-sig") as source:
+        return source.readline().lstrip('"').startswith("Label (Grouping)")
 
-    # Convert numerical columns from object to integer
-    cols_to_convert = ["Vacant housing units", "Median House Value (dollars)", "Median Buy Cost (dollars)", "Median Rent Cost (dollars)"]
+def vacancy_table(vacancy):
+    """
+    Loads number of vacant homes, median home value, and median costs to rent and buy for selected cities.
+    Accepts the hand-extracted vacancy CSV or the full DP04 export.
+    """
+    if is_dp04_export(vacancy):
+        return dp04.vacancy_table(vacancy)
 
-    for col in cols_to_convert:
-        df[col] = df[col].str.replace(",", "").astype(int)
+    # Thousands separators are parsed once when the cache is built, not on every load
+    df = read_csv_cached(vacancy, thousands=",")
 
     # Remove "!!Estimate" from city names
     df["City"] = df["City"].str.replace("!!Estimate", "").str.strip()
-     
-    x_col = df.loc[:, "City"] # x-axis values
-    y1_col = df.loc[:, "Vacant housing units"] # Data for bar chart 1
-    y2_col = df.loc[:, "Median House Value (dollars)"] # Data for bar chart 2
-    buy_line = df.loc[:, "Median Buy Cost (dollars)"]
-    rent_line = df.loc[:, "Median Rent Cost (dollars)"]
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 5))
-    
-                           
-    # Primary y-axis - chart 1
-    ax1.bar(x_col, y1_col, color='slategrey', label="Vacant housing units")
-    ax1.set_xlabel("City", fontsize=14)
-    ax1.set_xticks(ax1.get_xticks())
-    ax1.set_xticklabels(ax1.get_xticklabels(), rotation=85, ha='right')
-    # ax1.set_xticklabels(x_col, rotation=85)
-    ax1.set_ylabel("Number Vacant", color='black')
-    ax1.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, pos: f"{int(x/1000)}K"))
-    ax1.legend(loc="upper left")
-    
-                  
-    # Secondary y-axis - chart 1
-    secax_ax1 = ax1.twinx()
-    secax_ax1.plot(x_col, buy_line, color='forestgreen', marker='o', linestyle='-', label="Median buy cost")
-    secax_ax1.plot(x_col, rent_line, color='darkred', marker='o', linestyle='-', label="Median rent cost")
-    secax_ax1.set_ylabel("Cost (USD)", color='black')
-    secax_ax1.legend(loc="best")
+    return df
 
-    # Chart 1
-    plt.title("Vacancy & Cost", fontsize=14, fontweight="bold")
-    
-    # Primary y-axis - chart 2
-    ax2.bar(x_col, y2_col, color='tan', label="Median home value")
-    ax2.set_xlabel("City", fontsize=14)
-    ax2.set_xticks(ax2.get_xticks())
-    ax2.set_xticklabels(ax2.get_xticklabels(), rotation=85, ha='right')
-    # ax2.set_xticklabels(x_col, rotation=85)
-    ax2.set_ylabel("Home Value (USD)", color='black')
-    ax2.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, pos: f"{int(x/1000)}K"))    
-    ax2.legend(loc="upper left")
-    
-                  
-    # Secondary y-axis - chart 2
-    secax_ax2 = ax2.twinx()
-    secax_ax2.plot(x_col, buy_line, color='forestgreen', marker='o', linestyle='-', label="Median buy cost")
-    secax_ax2.plot(x_col, rent_line, color='darkred', marker='o', linestyle='-', label="Median rent cost")
-    secax_ax2.set_ylabel("Cost (USD)", color='black')
-    secax_ax2.legend(loc="best")
+def plot_vacancy(vacancy):
+    """
+    Plots number of vacant homes, median home value, and median costs to rent and buy for selected cities.
+    """
+    # Matplotlib is only imported when plotting, so importing this module stays cheap
+    import matplotlib.pyplot as plt
+
+    # Chart 1 shows vacancy & cost, chart 2 home value & cost, each with cost lines on a secondary y-axis
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 5))
+    draw_vacancy(ax1, ax2, vacancy_table(vacancy))
 
-    # Chart 2
-    plt.title("Home Value & Cost", fontsize=14, fontweight="bold")
-    
     plt.show()
 
-vacancy = "data/USA DP04 vacancy value cost.csv" 
-plot_vacancy(vacancy)
+# Plot the selected cities only when the script is executed directly, not on import
+if __name__ == "__main__":
+    vacancy = "data/USA DP04 vacancy value cost.csv"
+    plot_vacancy(vacancy)
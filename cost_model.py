@@ -0,0 +1,192 @@
+import numpy as np
+from instrumentation import count, timed
+from batch_calculator import (INPUT_DEFAULTS, INPUT_FALLBACKS, compare_rent_vs_buy_batch, monthly_mortgage_payment,
+                              recommendation_codes)
+
+# Extra inputs of the year-stepped model with their default values
+STEPPED_DEFAULTS = {
+    "rent_inflation_rate": 0.0,  # percent per year
+    "tax_escalation_rate": 0.0,  # percent per year, applied to property tax and insurance
+    "insurance_rate": 0.0  # percent of the purchase price per year
+}
+
+# Optional inputs of the year-stepped model that default to another input when not given
+STEPPED_FALLBACKS = {
+    "loan_term": "length_of_stay"  # years; the simple model repays the loan over the stay
+}
+
+# Cost models selectable by name; "simple" is compare_rent_vs_buy's flat model
+MODELS = ("simple", "stepped")
+
+# Scenario-year cells evaluated at once; keeping the temporary arrays within the CPU cache
+# is several times faster than one pass over every scenario
+DEFAULT_CHUNK_CELLS = 65536
+
+def _log_growth(rate):
+    """Yearly log growth of a monthly-compounded annual rate (as percentage)."""
+    return 12 * np.log1p((rate / 100) / 12)
+
+def _remaining_balance(loan_amount, mortgage_rate, num_payments, payments_made):
+    """Loan balance left after payments_made of num_payments fixed monthly payments."""
+    monthly_interest_rate = (mortgage_rate / 100) / 12
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        growth = (1 + monthly_interest_rate) ** num_payments
+        amortized = loan_amount * (growth - (1 + monthly_interest_rate) ** payments_made) / (growth - 1)
+        linear = loan_amount * (1 - payments_made / num_payments)
+    balance = np.where(monthly_interest_rate > 0, amortized, linear)
+    return np.where(payments_made >= num_payments, 0.0, balance)
+
+def _column(value):
+    """Scenario values as a column against the year axis; scalars stay scalars so their yearly factors are computed once."""
+    value = np.asarray(value, dtype=float)
+    return value[:, np.newaxis] if value.ndim else value
+
+def stepped_costs(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate,
+                  property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0, appreciation_rate=None,
+                  rent_inflation_rate=0.0, tax_escalation_rate=0.0, insurance_rate=0.0, loan_term=None):
+    """
+    Compute unrounded rent and buy costs year by year for scenarios given as scalars or equally long 1-D arrays.
+
+    Every year, rent grows with rent inflation, property tax and insurance grow with the
+    escalation rate, and maintenance is charged on the appreciated home value. Whoever spends
+    less in a year invests the difference, and the renter invests the down payment, all
+    compounding monthly at the investment rate until the home is sold. A partial last year
+    counts pro rata. Costs are outlays minus investment gains (and, for buying, minus the
+    resale value net of selling costs and the remaining loan balance).
+
+    :param length_of_stay: Years planning to stay in the home
+    :param monthly_rent: Monthly rent cost in the first year
+    :param home_price: Purchase price of the home
+    :param down_payment: Initial down payment amount
+    :param mortgage_rate: Annual mortgage interest rate (as percentage)
+    :param investment_interest_rate: Annual investment interest (as percentage)
+    :param property_tax_rate: Annual property tax rate on the purchase price in the first year (default 1.2%)
+    :param maintenance_rate: Annual maintenance cost rate on the current home value (default 1.0%)
+    :param selling_cost_rate: Cumulative costs of selling a home (default 8.0%)
+    :param appreciation_rate: Annual home appreciation (as percentage, defaults to investment_interest_rate)
+    :param rent_inflation_rate: Annual rent increase (as percentage)
+    :param tax_escalation_rate: Annual increase of property tax and insurance (as percentage)
+    :param insurance_rate: Annual home insurance rate on the purchase price in the first year (as percentage)
+    :param loan_term: Mortgage term in years (defaults to the length of stay); the balance left at sale is repaid
+    :return: Tuple of rent cost and buy cost arrays (one element per scenario)
+    """
+    if appreciation_rate is None:
+        appreciation_rate = investment_interest_rate
+    if loan_term is None:
+        loan_term = length_of_stay
+    stay, rent, price, down, mortgage, investment, tax, maintenance, selling, appreciation, inflation, escalation, insurance, term = (
+        _column(value) for value in (
+            length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate,
+            property_tax_rate, maintenance_rate, selling_cost_rate, appreciation_rate, rent_inflation_rate,
+            tax_escalation_rate, insurance_rate, loan_term
+        )
+    )
+
+    # One column per year; the fraction of each year within the stay weights its flows
+    num_years = int(np.ceil(np.max(stay))) if np.size(stay) else 0
+    year = np.arange(num_years, dtype=float)[np.newaxis, :]
+    weight = np.clip(stay - year, 0.0, 1.0)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Rent, tax and insurance escalate once a year; maintenance follows the home value
+        rent_paid = (12 * rent) * (weight * (1 + inflation / 100) ** year)
+        escalated_weight = weight * (1 + escalation / 100) ** year
+        maintenance_paid = (price * maintenance / 100) * (weight * np.exp(_log_growth(appreciation) * year))
+
+        # Mortgage payments stop at the end of the term; the rest of the loan is repaid at sale
+        loan_amount = price - down
+        num_payments = 12 * term
+        payments_made = np.minimum(12 * stay, num_payments)
+        payment = monthly_mortgage_payment(loan_amount, mortgage, num_payments)
+        mortgage_paid = payment * np.clip(payments_made - 12 * year, 0.0, 12.0)
+        balance = _remaining_balance(loan_amount, mortgage, num_payments, payments_made)
+
+        buy_paid = mortgage_paid + (price * (tax + insurance) / 100) * escalated_weight + maintenance_paid
+
+        # The side with the smaller outlay invests the difference at the start of the year;
+        # years after the sale have no outlays, so their growth factor does not matter
+        difference = buy_paid - rent_paid
+        investment_growth = np.exp(_log_growth(investment) * stay)
+        gain_factor = investment_growth * np.exp(-_log_growth(investment) * year) - 1
+        invested = difference * gain_factor
+        renter_gain = down * (investment_growth - 1) + np.sum(np.maximum(invested, 0.0), axis=1, keepdims=True)
+        buyer_gain = np.sum(np.maximum(-invested, 0.0), axis=1, keepdims=True)
+
+        resale_value = price * np.exp(_log_growth(appreciation) * stay) * (1 - selling / 100) - balance
+        rent_cost = np.sum(rent_paid, axis=1, keepdims=True) - renter_gain
+        buy_cost = down + np.sum(buy_paid, axis=1, keepdims=True) - resale_value - buyer_gain
+
+    return rent_cost[:, 0], buy_cost[:, 0]
+
+@timed("calculation.compare_stepped")
+def compare_rent_vs_buy_stepped(length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate,
+                                property_tax_rate=1.2, maintenance_rate=1.0, selling_cost_rate=8.0, appreciation_rate=None,
+                                rent_inflation_rate=0.0, tax_escalation_rate=0.0, insurance_rate=0.0, loan_term=None,
+                                chunk_cells=DEFAULT_CHUNK_CELLS):
+    """
+    Compare renting vs. buying for many scenarios with the year-stepped cost model.
+
+    Every argument may be a scalar or an array; arrays are broadcast against each other.
+    See stepped_costs for the model; costs are rounded to cents.
+
+    :param chunk_cells: Scenario-year cells evaluated at once (scenarios x years of the longest stay)
+    :return: Dictionary of "Rent Cost", "Buy Cost" and "Recommendation Code" arrays
+    """
+    if appreciation_rate is None:
+        appreciation_rate = investment_interest_rate
+    if loan_term is None:
+        loan_term = length_of_stay
+    values = [np.asarray(value, dtype=float) for value in (
+        length_of_stay, monthly_rent, home_price, down_payment, mortgage_rate, investment_interest_rate,
+        property_tax_rate, maintenance_rate, selling_cost_rate, appreciation_rate, rent_inflation_rate,
+        tax_escalation_rate, insurance_rate, loan_term
+    )]
+    shape = np.broadcast_shapes(*(value.shape for value in values))
+    size = int(np.prod(shape))
+    count("evaluations", size)
+
+    # Scalars stay scalars; arrays are flattened to one value per scenario
+    columns = [value if value.ndim == 0 else np.broadcast_to(value, shape).ravel() for value in values]
+    num_years = max(int(np.ceil(np.max(values[0]))), 1) if size else 1
+    step = max(chunk_cells // num_years, 1)
+
+    rent_cost = np.empty(size)
+    buy_cost = np.empty(size)
+    for start in range(0, size, step):
+        chunk = [column if column.ndim == 0 else column[start:start + step] for column in columns]
+        rent_cost[start:start + step], buy_cost[start:start + step] = stepped_costs(*chunk)
+
+    final_rent_cost = np.round(rent_cost, 2).reshape(shape)
+    final_buy_cost = np.round(buy_cost, 2).reshape(shape)
+
+    return {
+        "Rent Cost": final_rent_cost,
+        "Buy Cost": final_buy_cost,
+        "Recommendation Code": recommendation_codes(final_rent_cost, final_buy_cost)
+    }
+
+def model_inputs(model="simple"):
+    """
+    Input names accepted by a cost model.
+
+    :param model: "simple" or "stepped"
+    :return: Tuple of input names
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown cost model: {model}")
+    names = (*INPUT_DEFAULTS, *INPUT_FALLBACKS)
+    return names if model == "simple" else (*names, *STEPPED_DEFAULTS, *STEPPED_FALLBACKS)
+
+def compare_with_model(inputs, model="simple"):
+    """
+    Compare renting vs. buying with the selected cost model.
+
+    :param inputs: Dictionary of input name to scalar or array (names the model does not know are ignored)
+    :param model: "simple" for compare_rent_vs_buy's flat model, "stepped" for the year-stepped model
+    :return: Dictionary of "Rent Cost", "Buy Cost" and "Recommendation Code" arrays
+    """
+    names = model_inputs(model)
+    selected = {name: value for name, value in inputs.items() if name in names}
+    if model == "simple":
+        return compare_rent_vs_buy_batch(**selected)
+    return compare_rent_vs_buy_stepped(**selected)
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from instrumentation import count, span, timed
+
+# Default location of the binary cache, next to the source datasets
+CACHE_DIR = os.environ.get("RENT_OR_BUY_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", ".cache"))
+
+# Bump when the on-disk layout changes so old caches are rebuilt
+CACHE_VERSION = 2
+
+def file_digest(file_path):
+    """
+    Compute the SHA-256 digest of a file in chunks.
+
+    :param file_path: Path to the file
+    :return: Hexadecimal digest string
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _cache_name(file_path, loader_name, options):
+    """Name of the cache entry for one source file, loader and set of loader options."""
+    key = json.dumps([CACHE_VERSION, os.path.abspath(file_path), loader_name, options], sort_keys=True, default=str)
+    stem = os.path.splitext(os.path.basename(file_path))[0].replace(" ", "_")
+    return f"{stem}-{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+
+def _read_manifest(manifest_path):
+    """Load a cache manifest, returning None if it is missing or unreadable."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+def _write_manifest(manifest_path, manifest):
+    """Atomically replace a cache manifest."""
+    directory = os.path.dirname(manifest_path)
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temporary_path, manifest_path)
+    except BaseException:
+        # Do not leave a partial temporary file behind in the cache directory
+        os.unlink(temporary_path)
+        raise
+
+def _save_columns(frame, data_dir):
+    """Write each DataFrame column as its own .npy file and describe them for the manifest."""
+    columns = []
+    for position, name in enumerate(frame.columns):
+        series = frame[name]
+        values = series.to_numpy()
+        file_name = f"{position}.npy"
+
+        if str(series.dtype) == "category":
+            # Categoricals keep their category order: integer codes plus the categories in a second file
+            kind = "category"
+            categories = series.cat.categories.to_numpy()
+            categories_file = f"{position}.categories.npy"
+            np.save(os.path.join(data_dir, categories_file), categories.astype(str) if categories.dtype.kind in "OTU" else categories)
+            np.save(os.path.join(data_dir, file_name), series.cat.codes.to_numpy())
+            columns.append({"name": name, "file": file_name, "kind": kind, "dtype": "category",
+                            "categories": categories_file, "ordered": bool(series.cat.ordered)})
+            continue
+        elif values.dtype.kind in "biufcmM":
+            # Plain numeric, boolean and datetime columns can be memory-mapped
+            kind = "array"
+        elif len(values) and all(isinstance(value, str) for value in values):
+            # Pure text columns become fixed-width unicode arrays, which can also be memory-mapped
+            kind = "string"
+            values = values.astype(str)
+        else:
+            # Mixed columns (e.g. numbers with "?" placeholders) keep their Python objects
+            kind = "object"
+            values = values.astype(object)
+
+        np.save(os.path.join(data_dir, file_name), values, allow_pickle=(kind == "object"))
+        columns.append({"name": name, "file": file_name, "kind": kind, "dtype": str(series.dtype)})
+    return columns
+
+def _load_columns(data_dir, columns, mmap):
+    """Load the cached column arrays, memory-mapping them where the dtype allows it."""
+    arrays = {}
+    for column in columns:
+        path = os.path.join(data_dir, column["file"])
+        if column["kind"] == "category":
+            # Decoded to plain values; cached_table rebuilds the categorical from the codes instead
+            codes = np.load(path)
+            categories = np.load(os.path.join(data_dir, column["categories"]))
+            values = categories[codes].astype(object)
+            values[codes < 0] = None
+            arrays[column["name"]] = values
+        elif column["kind"] == "object":
+            arrays[column["name"]] = np.load(path, allow_pickle=True)
+        else:
+            arrays[column["name"]] = np.load(path, mmap_mode="r" if mmap else None)
+    return arrays
+
+def _ensure_cache(file_path, loader, loader_name, options, cache_dir):
+    """Return (data directory, manifest) for a valid cache entry, building it if needed."""
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    os.makedirs(cache_dir, exist_ok=True)
+    name = _cache_name(file_path, loader_name, options)
+    manifest_path = os.path.join(cache_dir, name + ".json")
+
+    stat = os.stat(file_path)
+    manifest = _read_manifest(manifest_path)
+    if manifest is not None:
+        data_dir = os.path.join(cache_dir, manifest["data_dir"])
+        if manifest["mtime_ns"] == stat.st_mtime_ns and manifest["size"] == stat.st_size and os.path.isdir(data_dir):
+            count("data.cache_hits")
+            return data_dir, manifest
+
+        # The file was touched; only rebuild if its content actually changed
+        digest = file_digest(file_path)
+        if manifest["sha256"] == digest and os.path.isdir(data_dir):
+            manifest.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            _write_manifest(manifest_path, manifest)
+            count("data.cache_hits")
+            return data_dir, manifest
+    else:
+        digest = file_digest(file_path)
+
+    # Parse the source once and write its columns into a fresh data directory
+    count("data.cache_misses")
+    with span("data.parse"):
+        frame = loader(file_path, **options)
+    temporary_dir = tempfile.mkdtemp(dir=cache_dir, prefix=name + ".tmp-")
+    columns = _save_columns(frame, temporary_dir)
+    data_dir_name = f"{name}-{digest[:16]}"
+    data_dir = os.path.join(cache_dir, data_dir_name)
+    try:
+        os.rename(temporary_dir, data_dir)
+    except OSError:
+        # Another process cached the same content first (the rename fails on its non-empty directory); use that copy
+        shutil.rmtree(temporary_dir, ignore_errors=True)
+        if not os.path.isdir(data_dir):
+            raise
+
+    manifest = {
+        "source": os.path.abspath(file_path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest,
+        "data_dir": data_dir_name,
+        "columns": columns
+    }
+    _write_manifest(manifest_path, manifest)
+
+    # Remove data directories left behind by older versions of the source. Another process may
+    # have cached a newer version since, so keep whatever the manifest on disk now points to
+    current = _read_manifest(manifest_path) or manifest
+    keep = {data_dir_name, current["data_dir"]}
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(name + "-") and entry not in keep:
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+
+    return data_dir, manifest
+
+@timed("data.load")
+def load_cached_columns(file_path, loader, loader_name=None, cache_dir=None, mmap=True, **options):
+    """
+    Load a dataset as a dictionary of NumPy column arrays, served from the binary cache.
+
+    Numeric and text columns are memory-mapped read-only, so repeated loads cost a few
+    file opens instead of a full parse.
+
+    :param file_path: Path to the source file
+    :param loader: Function called as loader(file_path, **options) returning a DataFrame on a cache miss
+    :param loader_name: Name used in the cache key (defaults to the loader's qualified name)
+    :param cache_dir: Directory holding the cache (defaults to CACHE_DIR)
+    :param mmap: Memory-map the column files instead of reading them into memory
+    :param options: Keyword arguments passed to the loader, also part of the cache key
+    :return: Dictionary of column name to array, in the original column order
+    """
+    loader_name = loader_name or f"{loader.__module__}.{loader.__qualname__}"
+    data_dir, manifest = _ensure_cache(file_path, loader, loader_name, options, cache_dir)
+    return _load_columns(data_dir, manifest["columns"], mmap)
+
+@timed("data.load")
+def cached_table(file_path, loader, loader_name=None, cache_dir=None, **options):
+    """
+    Load a dataset as a DataFrame, served from the binary cache when the source is unchanged.
+
+    The cache is keyed by the source path, loader and options, and validated against the
+    source's modification time, size and SHA-256 digest. If the cache cannot be written
+    the loader is called directly.
+
+    :param file_path: Path to the source file
+    :param loader: Function called as loader(file_path, **options) returning a DataFrame on a cache miss
+    :param loader_name: Name used in the cache key (defaults to the loader's qualified name)
+    :param cache_dir: Directory holding the cache (defaults to CACHE_DIR)
+    :param options: Keyword arguments passed to the loader, also part of the cache key
+    :return: DataFrame with a default RangeIndex
+    """
+    import pandas as pd
+
+    loader_name = loader_name or f"{loader.__module__}.{loader.__qualname__}"
+    try:
+        data_dir, manifest = _ensure_cache(file_path, loader, loader_name, options, cache_dir)
+    except OSError:
+        # Read-only checkouts still work, just without the speed-up
+        return loader(file_path, **options)
+
+    plain = [column for column in manifest["columns"] if column["kind"] != "category"]
+    arrays = _load_columns(data_dir, plain, mmap=True)
+    for column in manifest["columns"]:
+        if column["kind"] == "category":
+            codes = np.load(os.path.join(data_dir, column["file"]))
+            categories = np.load(os.path.join(data_dir, column["categories"]))
+            arrays[column["name"]] = pd.Categorical.from_codes(codes, categories, ordered=column["ordered"])
+        else:
+            # Copy memory-mapped columns so the frame does not keep the cache files open
+            arrays[column["name"]] = np.array(arrays[column["name"]])
+    frame = pd.DataFrame({column["name"]: arrays[column["name"]] for column in manifest["columns"]})
+
+    # Restore extension dtypes (e.g. strings) that the NumPy arrays cannot carry
+    for column in plain:
+        if column["kind"] != "array" and str(frame[column["name"]].dtype) != column["dtype"]:
+            try:
+                frame[column["name"]] = frame[column["name"]].astype(column["dtype"])
+            except (TypeError, ValueError):
+                pass
+    return frame
+
+def _read_excel(file_path, **options):
+    """Parse an Excel workbook with pandas."""
+    import pandas as pd
+    return pd.read_excel(file_path, **options)
+
+def _read_csv(file_path, **options):
+    """Parse a CSV file with pandas."""
+    import pandas as pd
+    return pd.read_csv(file_path, **options)
+
+def read_excel_cached(file_path, **options):
+    """
+    Cached equivalent of pd.read_excel(file_path, **options).
+
+    :param file_path: Path to the Excel workbook
+    :param options: Keyword arguments for pd.read_excel, e.g. sheet_name
+    :return: DataFrame with the workbook contents
+    """
+    return cached_table(file_path, _read_excel, loader_name="read_excel", **options)
+
+def read_csv_cached(file_path, **options):
+    """
+    Cached equivalent of pd.read_csv(file_path, **options).
+
+    :param file_path: Path to the CSV file
+    :param options: Keyword arguments for pd.read_csv
+    :return: DataFrame with the file contents
+    """
+    return cached_table(file_path, _read_csv, loader_name="read_csv", **options)
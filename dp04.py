@@ -0,0 +1,156 @@
+import csv
+import numpy as np
+from data_cache import cached_table
+
+# ACS DP04 (selected housing characteristics) export for the metro areas of the project
+DP04_FILE = "data/USA DP04 Random Cities.csv"
+
+# Separator ACS uses in column headers, reused to join section, parent and label into metric names
+PATH_SEPARATOR = "!!"
+
+# Column header suffixes of the per-metro estimate and margin of error columns
+ESTIMATE_SUFFIX = "!!Estimate"
+MARGIN_SUFFIX = "!!Margin of Error"
+
+# Metrics behind the columns of the hand-extracted "USA DP04 vacancy value cost.csv"
+VACANCY_METRICS = {
+    "Vacant housing units": ("HOUSING OCCUPANCY!!Total housing units!!Vacant housing units", "Housing Unit Error Margin"),
+    "Median House Value (dollars)": ("VALUE!!Owner-occupied units!!Median (dollars)", "House Value Error Margin"),
+    "Median Buy Cost (dollars)": ("SELECTED MONTHLY OWNER COSTS (SMOC)!!Housing units with a mortgage!!Median (dollars)", "Buy Cost Error Margin"),
+    "Median Rent Cost (dollars)": ("GROSS RENT!!Occupied units paying rent!!Median (dollars)", "Rent Cost Error Margin")
+}
+
+def parse_numbers(values):
+    """
+    Parse ACS number strings such as "172,174", "±2,319" or "6.4" in one vectorized pass.
+
+    Empty cells and ACS annotations such as "(X)", "N" or "*****" become NaN.
+
+    :param values: Sequence or array of strings
+    :return: Float array
+    """
+    import pandas as pd
+
+    text = np.asarray(values, dtype=str)
+    cleaned = np.char.replace(np.char.replace(np.char.strip(text), ",", ""), "±", "")
+    return pd.to_numeric(pd.Series(cleaned.ravel()), errors="coerce").to_numpy(dtype=float).reshape(text.shape)
+
+def _indent(label):
+    """Indentation depth of a "Label (Grouping)" cell (ACS indents with non-breaking spaces)."""
+    return len(label) - len(label.lstrip("\xa0 "))
+
+def parse_dp04(file_path=DP04_FILE):
+    """
+    Parse a wide DP04 export into a tidy long table with one row per metric and metro.
+
+    Section header rows (in capitals, without values) and indentation give every row a
+    unique metric name "SECTION!!Parent!!Label", e.g.
+    "GROSS RENT!!Occupied units paying rent!!Median (dollars)".
+
+    :param file_path: Path of the DP04 CSV export
+    :return: DataFrame with section, metric, label, metro, estimate and margin columns (estimate and margin as floats)
+    """
+    import pandas as pd
+
+    with open(file_path, newline="", encoding="utf-8-sig") as source:
+        reader = csv.reader(source)
+        header = next(reader)
+        rows = [row for row in reader if row and row[0].strip()]
+
+    # Pair each metro's estimate column with its margin of error column
+    metros = []
+    estimate_columns = []
+    margin_columns = []
+    for position, column in enumerate(header):
+        if column.endswith(ESTIMATE_SUFFIX):
+            metro = column[:-len(ESTIMATE_SUFFIX)]
+            margin_column = f"{metro}{MARGIN_SUFFIX}"
+            if margin_column not in header:
+                raise ValueError(f"No margin of error column for {metro}")
+            metros.append(metro.strip())
+            estimate_columns.append(position)
+            margin_columns.append(header.index(margin_column))
+    if not metros:
+        raise ValueError(f"No '{ESTIMATE_SUFFIX}' columns in {file_path}")
+
+    # Resolve every row's section and parent from the indentation of the rows above it
+    sections, metrics, labels, value_rows = [], [], [], []
+    parents = []
+    section = ""
+    for row in rows:
+        label = row[0].strip("\xa0 ")
+        depth = _indent(row[0])
+        cells = [row[position] if position < len(row) else "" for position in estimate_columns + margin_columns]
+        if depth == 0 and not any(cell.strip() for cell in cells):
+            section = label
+            parents = []
+            continue
+
+        # Keep only the ancestors that are less indented than this row
+        parents = [(parent_depth, parent) for parent_depth, parent in parents if parent_depth < depth]
+        sections.append(section)
+        metrics.append(PATH_SEPARATOR.join([section] + [parent for _, parent in parents] + [label]))
+        labels.append(label)
+        value_rows.append(cells)
+        parents.append((depth, label))
+
+    values = parse_numbers(value_rows) if value_rows else np.empty((0, 2 * len(metros)))
+    num_metrics, num_metros = len(metrics), len(metros)
+    return pd.DataFrame({
+        "section": pd.Categorical(np.repeat(sections, num_metros)),
+        "metric": pd.Categorical(np.repeat(metrics, num_metros), categories=list(dict.fromkeys(metrics))),
+        "label": np.repeat(labels, num_metros),
+        "metro": pd.Categorical(np.tile(metros, num_metrics), categories=metros),
+        "estimate": values[:, :num_metros].ravel(),
+        "margin": values[:, num_metros:].ravel()
+    })
+
+def load_dp04(file_path=DP04_FILE, cache_dir=None):
+    """
+    Load the long DP04 table, served from the binary data cache after the first parse.
+
+    :param file_path: Path of the DP04 CSV export
+    :param cache_dir: Cache directory (defaults to data_cache.CACHE_DIR)
+    :return: DataFrame returned by parse_dp04
+    """
+    return cached_table(file_path, parse_dp04, loader_name="parse_dp04", cache_dir=cache_dir)
+
+def metric_table(long_table, metrics):
+    """
+    Select metrics from the long table into one row per metro.
+
+    :param long_table: DataFrame returned by parse_dp04 or load_dp04
+    :param metrics: Dictionary of output column name to metric name
+    :return: DataFrame with a "metro" column, then the estimate of each metric and its margin under "<column> Margin"
+    """
+    import pandas as pd
+
+    metros = list(dict.fromkeys(long_table["metro"].astype(str)))
+    table = {"metro": metros}
+    metric_names = long_table["metric"].astype(str).to_numpy()
+    metro_names = long_table["metro"].astype(str).to_numpy()
+    for column, metric in metrics.items():
+        selected = metric_names == metric
+        if not selected.any():
+            raise KeyError(f"Unknown metric: {metric}")
+        positions = {metro: position for position, metro in zip(np.flatnonzero(selected), metro_names[selected])}
+        rows = [positions.get(metro) for metro in metros]
+        table[column] = [long_table["estimate"].iat[row] if row is not None else np.nan for row in rows]
+        table[f"{column} Margin"] = [long_table["margin"].iat[row] if row is not None else np.nan for row in rows]
+    return pd.DataFrame(table)
+
+def vacancy_table(file_path=DP04_FILE, cache_dir=None):
+    """
+    Build the vacancy, home value and cost table used by the vacancy charts straight from the DP04 export.
+
+    :param file_path: Path of the DP04 CSV export
+    :param cache_dir: Cache directory (defaults to data_cache.CACHE_DIR)
+    :return: DataFrame with the columns of "USA DP04 vacancy value cost.csv" as floats; cells the export
+             leaves empty or annotated (e.g. "*****" margins) are NaN, which the charts leave blank
+    """
+    wide = metric_table(load_dp04(file_path, cache_dir), {column: metric for column, (metric, _) in VACANCY_METRICS.items()})
+    table = {"City": wide["metro"]}
+    for column, (_, margin_column) in VACANCY_METRICS.items():
+        table[column] = wide[column].astype(float)
+        table[margin_column] = wide[f"{column} Margin"].astype(float)
+    return type(wide)(table)
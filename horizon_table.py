@@ -0,0 +1,214 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+from instrumentation import count, timed
+from break_even import solve_break_even
+from city_index import INDEX_COLUMNS, normalize_key
+from data_cache import CACHE_DIR
+
+# Rent & Buy workbook the table is computed from
+RENT_AND_BUY_FILE = "data/Random Cities in USA (Rent & Buy).xlsx"
+
+# Default location of the persisted table
+HORIZON_FILE = os.path.join(CACHE_DIR, "break_even_horizons.npz")
+
+# Bump when the calculation changes so persisted tables are recomputed in full
+HORIZON_VERSION = 1
+
+# Standard assumptions: down payment as a fraction of the home price, and the annual
+# investment interest rate (as percentage), which the home also appreciates at
+DOWN_PAYMENT_FRACTIONS = (0.05, 0.10, 0.20, 0.30)
+INVESTMENT_RATES = (2.0, 4.0, 6.0, 8.0)
+
+def row_hashes(data):
+    """
+    Hash the key and calculator inputs of every row of the Rent & Buy dataset.
+
+    :param data: DataFrame loaded from "Random Cities in USA (Rent & Buy).xlsx"
+    :return: Tuple of the normalized (city, location, bedrooms) keys and a uint64 array of row hashes
+    """
+    keys = [normalize_key(*key) for key in zip(data["City"], data["Location"], data["Number of Bedrooms"])]
+    values = np.column_stack([np.asarray(data[column], dtype=float) for column in INDEX_COLUMNS.values()])
+    hashes = np.array([
+        int.from_bytes(hashlib.blake2b(repr((key, row.tobytes())).encode(), digest_size=8).digest(), "little")
+        for key, row in zip(keys, values)
+    ], dtype=np.uint64)
+    return keys, hashes
+
+def _settings_hash(down_payment_fractions, investment_rates):
+    """Hash of everything besides the rows that the horizons depend on."""
+    settings = repr((HORIZON_VERSION, tuple(map(float, down_payment_fractions)), tuple(map(float, investment_rates))))
+    return hashlib.blake2b(settings.encode(), digest_size=8).hexdigest()
+
+def _solve_horizons(data, rows, down_payment_fractions, investment_rates):
+    """Break-even lengths of stay of some rows for every down payment and rate assumption (rows x down payments x rates)."""
+    inputs = {name: np.asarray(data[column], dtype=float)[rows, np.newaxis, np.newaxis] for name, column in INDEX_COLUMNS.items()}
+    inputs["down_payment"] = inputs["home_price"] * np.asarray(down_payment_fractions, dtype=float)[np.newaxis, :, np.newaxis]
+    inputs["investment_interest_rate"] = np.asarray(investment_rates, dtype=float)[np.newaxis, np.newaxis, :]
+    inputs["length_of_stay"] = 1.0
+    shape = (len(rows), len(down_payment_fractions), len(investment_rates))
+    return np.broadcast_to(solve_break_even(inputs, "length_of_stay"), shape)
+
+@timed("calculation.horizon_table")
+def build_horizon_table(data, previous=None, down_payment_fractions=DOWN_PAYMENT_FRACTIONS, investment_rates=INVESTMENT_RATES):
+    """
+    Compute the break-even length of stay of every row under the standard assumptions,
+    reusing a previous table's rows whose inputs did not change.
+
+    A row is reused when its key and its rent, price and mortgage rate hash the same as in
+    the previous table (and the table was built with the same assumptions); all other rows
+    are solved together in one vectorized call. Horizons are NaN where renting and buying
+    do not cross within break_even.DEFAULT_BRACKETS.
+
+    :param data: DataFrame loaded from "Random Cities in USA (Rent & Buy).xlsx"
+    :param previous: Table returned by an earlier build or load_horizon_table, or None
+    :param down_payment_fractions: Down payments as fractions of the home price
+    :param investment_rates: Annual investment interest rates (as percentage)
+    :return: Table dictionary with "cities", "locations", "bedrooms", "row_hashes", "down_payment_fractions",
+             "investment_rates", "settings", "horizons" (rows x down payments x rates), the key-to-row "positions"
+             and the number of "recomputed" rows
+    """
+    keys, hashes = row_hashes(data)
+    settings = _settings_hash(down_payment_fractions, investment_rates)
+    horizons = np.full((len(keys), len(down_payment_fractions), len(investment_rates)), np.nan)
+
+    stale = np.ones(len(keys), dtype=bool)
+    if previous is not None and previous["settings"] == settings:
+        previous_rows = {(key, row_hash): row for key, row_hash, row in
+                         zip(_keys(previous), previous["row_hashes"].tolist(), range(len(previous["row_hashes"])))}
+        for row, (key, row_hash) in enumerate(zip(keys, hashes.tolist())):
+            reused = previous_rows.get((key, row_hash))
+            if reused is not None:
+                horizons[row] = previous["horizons"][reused]
+                stale[row] = False
+
+    rows = np.flatnonzero(stale)
+    if len(rows):
+        horizons[rows] = _solve_horizons(data, rows, down_payment_fractions, investment_rates)
+    count("horizon.recomputed_rows", len(rows))
+
+    table = {
+        "cities": np.array([key[0] for key in keys], dtype=str),
+        "locations": np.array([key[1] for key in keys], dtype=str),
+        "bedrooms": np.array([key[2] for key in keys], dtype=np.int64),
+        "row_hashes": hashes,
+        "down_payment_fractions": np.asarray(down_payment_fractions, dtype=float),
+        "investment_rates": np.asarray(investment_rates, dtype=float),
+        "settings": settings,
+        "horizons": horizons
+    }
+    table["positions"] = _positions(table)
+    table["recomputed"] = len(rows)
+    return table
+
+def _keys(table):
+    """Normalized (city, location, bedrooms) keys of a table's rows."""
+    return list(zip(table["cities"].tolist(), table["locations"].tolist(), table["bedrooms"].tolist()))
+
+def _positions(table):
+    """Key-to-row mapping, keeping the first row of duplicated keys like build_city_index."""
+    positions = {}
+    for position, key in enumerate(_keys(table)):
+        positions.setdefault(key, position)
+    return positions
+
+# Arrays persisted in the table file
+_SAVED_ARRAYS = ("cities", "locations", "bedrooms", "row_hashes", "down_payment_fractions", "investment_rates", "horizons")
+
+def save_horizon_table(table, file_path=HORIZON_FILE):
+    """
+    Atomically write a table to an .npz file.
+
+    :param table: Table returned by build_horizon_table
+    :param file_path: Destination path
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+    try:
+        with os.fdopen(handle, "wb") as table_file:
+            np.savez(table_file, settings=np.array(table["settings"]), **{name: table[name] for name in _SAVED_ARRAYS})
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        # Do not leave a partial temporary file behind in the cache directory
+        os.unlink(temporary_path)
+        raise
+
+def load_horizon_table(file_path=HORIZON_FILE):
+    """
+    Read a table written by save_horizon_table.
+
+    :param file_path: Path of the .npz file
+    :return: Table dictionary (see build_horizon_table), or None if the file is missing or unreadable
+    """
+    try:
+        with np.load(file_path, allow_pickle=False) as saved:
+            table = {name: saved[name] for name in _SAVED_ARRAYS}
+            table["settings"] = str(saved["settings"])
+    except (OSError, KeyError, ValueError):
+        return None
+    table["positions"] = _positions(table)
+    table["recomputed"] = 0
+    return table
+
+def refresh_horizon_table(data_file=RENT_AND_BUY_FILE, table_file=HORIZON_FILE,
+                          down_payment_fractions=DOWN_PAYMENT_FRACTIONS, investment_rates=INVESTMENT_RATES):
+    """
+    Bring the persisted table up to date with the Rent & Buy workbook, recomputing only changed rows.
+
+    :param data_file: Path of the Rent & Buy workbook
+    :param table_file: Path of the persisted table
+    :param down_payment_fractions: Down payments as fractions of the home price
+    :param investment_rates: Annual investment interest rates (as percentage)
+    :return: The refreshed table (its "recomputed" entry counts the rows solved again)
+    """
+    from data_cache import read_excel_cached
+
+    previous = load_horizon_table(table_file)
+    table = build_horizon_table(read_excel_cached(data_file), previous, down_payment_fractions, investment_rates)
+    # Rewrite the file only if a row was recomputed, added, removed or moved
+    if previous is None or table["recomputed"] or _keys(table) != _keys(previous):
+        save_horizon_table(table, table_file)
+    return table
+
+def _grid_position(values, value, name):
+    """Position of an assumption on the table's grid."""
+    matches = np.flatnonzero(np.isclose(values, value))
+    if not len(matches):
+        raise ValueError(f"{name} {value} is not on the table's grid: {values.tolist()}")
+    return int(matches[0])
+
+def lookup_horizon(table, city, location, bedrooms, down_payment_fraction=None, investment_interest_rate=None):
+    """
+    Read the break-even length of stay of one row.
+
+    :param table: Table returned by build_horizon_table, load_horizon_table or refresh_horizon_table
+    :param city: City name
+    :param location: "City Centre" or "Outside City Centre"
+    :param bedrooms: Number of bedrooms
+    :param down_payment_fraction: One of the table's down payment fractions (None for all)
+    :param investment_interest_rate: One of the table's investment rates (None for all)
+    :return: Years after which buying beats renting (NaN without a crossover), or the down payments x rates
+             array when an assumption is left out; None if the row is not in the table
+    """
+    try:
+        row = table["positions"].get(normalize_key(city, location, bedrooms))
+    except ValueError:
+        return None
+    if row is None:
+        return None
+    horizons = table["horizons"][row]
+    if down_payment_fraction is not None:
+        horizons = horizons[_grid_position(table["down_payment_fractions"], down_payment_fraction, "Down payment fraction")]
+    if investment_interest_rate is not None:
+        horizons = horizons[..., _grid_position(table["investment_rates"], investment_interest_rate, "Investment rate")]
+    return float(horizons) if np.ndim(horizons) == 0 else horizons
+
+# Refresh the persisted table and print a few horizons only when the script is executed directly, not on import
+if __name__ == "__main__":
+    horizon_table = refresh_horizon_table()
+    print(f"Recomputed {horizon_table['recomputed']} of {len(horizon_table['row_hashes'])} rows")
+    for city, location, bedrooms in list(horizon_table["positions"])[:5]:
+        horizon = lookup_horizon(horizon_table, city, location, bedrooms, down_payment_fraction=0.20, investment_interest_rate=4.0)
+        print(f"{city}, {location}, {bedrooms} bedrooms: {horizon:.1f} years")
@@ -0,0 +1,284 @@
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+# Set RENT_OR_BUY_INSTRUMENT=1 to record spans and counters for the whole run ("profile" and/or "memory" add those captures)
+ENV_ENABLE = "RENT_OR_BUY_INSTRUMENT"
+
+# Optional file the run summary is written to at exit (.prom for Prometheus text, JSON otherwise)
+ENV_OUTPUT = "RENT_OR_BUY_INSTRUMENT_OUTPUT"
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = "rent_or_buy"
+
+# Number of functions and allocation sites kept in the profile and memory summaries
+TOP_ENTRIES = 20
+
+class _State:
+    """Process-wide instrumentation state."""
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.spans = {}
+        self.counters = {}
+        self.profiler = None
+        self.memory = False
+        self.started = time.time()
+
+_state = _State()
+
+# Shared do-nothing context returned by span() while instrumentation is off
+_NULL_SPAN = contextlib.nullcontext()
+
+class _Span:
+    """Context manager timing one span and adding it to the per-name totals."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        with _state.lock:
+            totals = _state.spans.get(self.name)
+            if totals is None:
+                _state.spans[self.name] = {"count": 1, "total": elapsed, "min": elapsed, "max": elapsed}
+            else:
+                totals["count"] += 1
+                totals["total"] += elapsed
+                totals["min"] = min(totals["min"], elapsed)
+                totals["max"] = max(totals["max"], elapsed)
+        return False
+
+def span(name):
+    """
+    Time a block of code under a span name, e.g. "data.load" or "render.save".
+
+    While instrumentation is disabled this returns a shared no-op context manager.
+
+    :param name: Span name; spans with the same name are aggregated
+    :return: Context manager
+    """
+    if not _state.enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+def count(name, amount=1):
+    """
+    Add to a named counter, e.g. the number of scenarios evaluated. Does nothing while disabled.
+
+    :param name: Counter name
+    :param amount: Amount to add
+    """
+    if not _state.enabled:
+        return
+    with _state.lock:
+        _state.counters[name] = _state.counters.get(name, 0) + amount
+
+def timed(name):
+    """
+    Decorator recording every call of a function as a span.
+
+    :param name: Span name
+    :return: Decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return function(*args, **kwargs)
+            with _Span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def is_enabled():
+    """Return whether spans and counters are being recorded."""
+    return _state.enabled
+
+def enable(profile=False, memory=False):
+    """
+    Start recording spans and counters.
+
+    :param profile: Also run cProfile over everything until disable()
+    :param memory: Also trace allocations with tracemalloc until disable()
+    """
+    _state.enabled = True
+    if profile and _state.profiler is None:
+        import cProfile
+        _state.profiler = cProfile.Profile()
+        _state.profiler.enable()
+    if memory and not _state.memory:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _state.memory = True
+
+def _profile_summary(profiler):
+    """Summarize cProfile statistics as the functions with the largest cumulative time."""
+    import pstats
+
+    stats = pstats.Stats(profiler).stats
+    rows = []
+    for (file_name, line, function), (_, calls, total, cumulative, _) in stats.items():
+        rows.append({"function": f"{os.path.basename(file_name)}:{line}({function})", "calls": calls,
+                     "total": total, "cumulative": cumulative})
+    return sorted(rows, key=lambda row: row["cumulative"], reverse=True)[:TOP_ENTRIES]
+
+def _memory_summary():
+    """Summarize tracemalloc's current and peak usage and the largest allocation sites."""
+    import tracemalloc
+
+    current, peak = tracemalloc.get_traced_memory()
+    top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ENTRIES]
+    return {
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "top": [{"location": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                 "bytes": stat.size, "blocks": stat.count} for stat in top]
+    }
+
+def summary():
+    """
+    Build the structured summary of everything recorded since the last reset().
+
+    :return: Dictionary with "spans" (count, total, min, max and mean seconds per name), "counters",
+             and "profile" and "memory" sections when those captures are running
+    """
+    with _state.lock:
+        spans = {name: {**totals, "mean": totals["total"] / totals["count"]} for name, totals in _state.spans.items()}
+        counters = dict(_state.counters)
+
+    result = {"started": _state.started, "elapsed": time.time() - _state.started, "spans": spans, "counters": counters}
+    if _state.profiler is not None:
+        _state.profiler.disable()
+        result["profile"] = _profile_summary(_state.profiler)
+        _state.profiler.enable()
+    if _state.memory:
+        result["memory"] = _memory_summary()
+    return result
+
+def disable():
+    """
+    Stop recording and stop any cProfile or tracemalloc capture.
+
+    :return: Summary of the recorded run
+    """
+    result = summary()
+    _state.enabled = False
+    if _state.profiler is not None:
+        _state.profiler.disable()
+        _state.profiler = None
+    if _state.memory:
+        import tracemalloc
+        tracemalloc.stop()
+        _state.memory = False
+    return result
+
+def reset():
+    """Clear the recorded spans and counters."""
+    with _state.lock:
+        _state.spans.clear()
+        _state.counters.clear()
+        _state.started = time.time()
+
+@contextlib.contextmanager
+def capture(profile=False, memory=False):
+    """
+    Record one run and collect its summary.
+
+    with capture() as run:
+        ...
+    run["summary"]  # filled in when the block exits
+
+    :param profile: Also run cProfile
+    :param memory: Also trace allocations
+    :return: Context manager yielding a dictionary that receives the "summary"
+    """
+    was_enabled = _state.enabled
+    reset()
+    enable(profile=profile, memory=memory)
+    run = {}
+    try:
+        yield run
+    finally:
+        run["summary"] = disable()
+        if was_enabled:
+            enable()
+
+def _label(value):
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def to_prometheus(result):
+    """
+    Format a summary in the Prometheus text exposition format.
+
+    :param result: Dictionary returned by summary()
+    :return: Text with one sample per line
+    """
+    lines = [
+        f"# HELP {METRIC_PREFIX}_span_seconds_total Total time spent in each instrumented span.",
+        f"# TYPE {METRIC_PREFIX}_span_seconds_total counter"
+    ]
+    lines += [f'{METRIC_PREFIX}_span_seconds_total{{span="{_label(name)}"}} {totals["total"]:.9f}' for name, totals in result["spans"].items()]
+    lines += [
+        f"# HELP {METRIC_PREFIX}_span_calls_total Number of times each instrumented span ran.",
+        f"# TYPE {METRIC_PREFIX}_span_calls_total counter"
+    ]
+    lines += [f'{METRIC_PREFIX}_span_calls_total{{span="{_label(name)}"}} {totals["count"]}' for name, totals in result["spans"].items()]
+    lines += [
+        f"# HELP {METRIC_PREFIX}_events_total Instrumented event counters.",
+        f"# TYPE {METRIC_PREFIX}_events_total counter"
+    ]
+    lines += [f'{METRIC_PREFIX}_events_total{{counter="{_label(name)}"}} {value}' for name, value in result["counters"].items()]
+    if "memory" in result:
+        lines += [
+            f"# HELP {METRIC_PREFIX}_memory_peak_bytes Peak traced memory.",
+            f"# TYPE {METRIC_PREFIX}_memory_peak_bytes gauge",
+            f"{METRIC_PREFIX}_memory_peak_bytes {result['memory']['peak_bytes']}"
+        ]
+    return "\n".join(lines) + "\n"
+
+def to_json(result):
+    """
+    Format a summary as JSON.
+
+    :param result: Dictionary returned by summary()
+    :return: JSON text
+    """
+    return json.dumps(result, indent=2)
+
+def write_summary(path, result=None):
+    """
+    Write a summary to a file, as Prometheus text for a .prom file and JSON otherwise.
+
+    :param path: Output path
+    :param result: Summary to write (defaults to the current summary())
+    """
+    result = summary() if result is None else result
+    text = to_prometheus(result) if path.endswith(".prom") else to_json(result)
+    with open(path, "w", encoding="utf-8") as output:
+        output.write(text)
+
+def _enable_from_environment():
+    """Enable instrumentation for the whole run when RENT_OR_BUY_INSTRUMENT is set."""
+    setting = os.environ.get(ENV_ENABLE, "").strip().lower()
+    if setting in ("", "0", "false", "no"):
+        return
+    enable(profile="profile" in setting, memory="memory" in setting)
+    output = os.environ.get(ENV_OUTPUT)
+    if output:
+        atexit.register(lambda: write_summary(output))
+
+_enable_from_environment()
@@ -0,0 +1,295 @@
+import functools
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+# Floats are rounded to this many decimals in cache keys, so 5, 5.0 and 5.0000000000001 share an entry
+KEY_DECIMALS = 9
+
+# Default number of entries kept in memory per memoized function
+DEFAULT_MAX_SIZE = 4096
+
+# Optional SQLite file that the default cached wrappers persist to, so a restarted worker starts warm
+MEMO_STORE = os.environ.get("RENT_OR_BUY_MEMO_STORE")
+
+def normalize_key(value, decimals=KEY_DECIMALS):
+    """
+    Normalize a value into a hashable cache key component.
+
+    Numbers become floats rounded to a fixed number of decimals (with -0.0 folded into 0.0),
+    strings are stripped, arrays and sequences become tuples and mappings become sorted tuples.
+
+    :param value: Argument value
+    :param decimals: Decimals kept for floats
+    :return: Hashable, JSON-serializable key component
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return round(float(value), decimals) + 0.0
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, np.ndarray):
+        return normalize_key(value.tolist(), decimals) if value.ndim else normalize_key(value.item(), decimals)
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_key(item, decimals) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(name), normalize_key(item, decimals)) for name, item in value.items()))
+    if value is None:
+        return None
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+def _freeze(value):
+    """Make cached arrays read-only so callers cannot change a shared result."""
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, dict):
+        return {name: _freeze(item) for name, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_freeze(item) for item in value)
+    return value
+
+def _detach(value):
+    """Copy the containers of a cached result so callers can modify what they get back."""
+    if isinstance(value, dict):
+        return {name: _detach(item) for name, item in value.items()}
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_detach(item) for item in value)
+    return value
+
+class DiskStore:
+    """
+    Persistent key-value store for cached results, backed by a local SQLite file.
+
+    Values are pickled; keys are JSON strings of the normalized cache keys.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the SQLite database file (created if missing)
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+
+    def get(self, key):
+        """Return (value, expiry time) for a key, or None if it is not stored."""
+        with self._lock:
+            row = self._connection.execute("SELECT value, expires FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key, value, expires=None):
+        """Store a value, replacing any previous one."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO results (key, value, expires) VALUES (?, ?, ?)", (key, blob, expires))
+
+    def delete(self, key):
+        """Remove a key if present."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def clear(self, prefix=None):
+        """Remove every stored value, or only those whose key starts with prefix."""
+        with self._lock, self._connection:
+            if prefix is None:
+                self._connection.execute("DELETE FROM results")
+            else:
+                self._connection.execute("DELETE FROM results WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+class ResultCache:
+    """
+    Thread-safe in-memory result cache with LRU eviction, optional TTL and an optional DiskStore behind it.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=None, store=None, namespace="", clock=time.time):
+        """
+        :param max_size: Maximum number of entries kept in memory (least recently used are evicted first)
+        :param ttl: Seconds an entry stays valid (None keeps entries until evicted)
+        :param store: DiskStore that misses are looked up in and new results are written to
+        :param namespace: Prefix separating this cache's keys from others in a shared store
+        :param clock: Function returning the current time in seconds (wall clock, so expiry survives restarts)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.store = store
+        self.namespace = namespace
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store_key(self, key):
+        return f"{self.namespace}:{json.dumps(key)}"
+
+    def get(self, key, default=None):
+        """
+        Look up a normalized key, counting a hit or a miss.
+
+        :param key: Key built with normalize_key
+        :param default: Value returned on a miss
+        :return: Cached value or default
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.store is not None:
+            stored = self.store.get(self._store_key(key))
+            if stored is not None and (stored[1] is None or stored[1] > now):
+                with self._lock:
+                    self._insert(key, stored[0], stored[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                return stored[0]
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key, value):
+        """Store a value under a normalized key."""
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._insert(key, value, expires)
+        if self.store is not None:
+            self.store.set(self._store_key(key), value, expires)
+
+    def _insert(self, key, value, expires):
+        """Add an entry and evict the least recently used ones beyond max_size (lock held)."""
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (including the persisted ones of this namespace) and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+        if self.store is not None:
+            self.store.clear(prefix=f"{self.namespace}:")
+
+    def stats(self):
+        """
+        Report the cache counters.
+
+        :return: Dictionary with hits, misses, disk hits, evictions, current size and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+def memoize(function=None, max_size=DEFAULT_MAX_SIZE, ttl=None, store=None, decimals=KEY_DECIMALS):
+    """
+    Memoize a function on its normalized arguments.
+
+    Positional and keyword calls share entries because arguments are bound to the function's
+    signature with defaults applied. The wrapper exposes the ResultCache as .cache.
+
+    :param function: Function to wrap (omit to use as @memoize(...))
+    :param max_size: Maximum number of in-memory entries
+    :param ttl: Seconds an entry stays valid
+    :param store: DiskStore to persist results to
+    :param decimals: Decimals kept for float arguments in keys
+    :return: Memoized function
+    """
+    if function is None:
+        return functools.partial(memoize, max_size=max_size, ttl=ttl, store=store, decimals=decimals)
+
+    signature = inspect.signature(function)
+    cache = ResultCache(max_size=max_size, ttl=ttl, store=store, namespace=f"{function.__module__}.{function.__qualname__}")
+    missing = object()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = normalize_key(bound.arguments, decimals)
+
+        result = cache.get(key, missing)
+        if result is missing:
+            result = _freeze(function(*args, **kwargs))
+            cache.set(key, result)
+        return _detach(result)
+
+    wrapper.cache = cache
+    wrapper.cache_clear = cache.clear
+    wrapper.cache_stats = cache.stats
+    return wrapper
+
+def _default_store():
+    """Open the shared DiskStore named by RENT_OR_BUY_MEMO_STORE, if any."""
+    return DiskStore(MEMO_STORE) if MEMO_STORE else None
+
+def _cached_wrappers():
+    """Memoized versions of the calculator, break-even and sensitivity functions."""
+    from calculator import compare_rent_vs_buy
+    from break_even import solve_break_even
+    from sensitivity_grid import sensitivity_curves
+
+    store = _default_store()
+    return {
+        "cached_compare_rent_vs_buy": memoize(compare_rent_vs_buy, store=store),
+        "cached_solve_break_even": memoize(solve_break_even, store=store),
+        "cached_sensitivity_curves": memoize(sensitivity_curves, max_size=256, store=store)
+    }
+
+_wrappers = None
+
+def __getattr__(name):
+    """
+    Build the cached wrappers on first use, so importing this module opens no database.
+    """
+    global _wrappers
+    if name in ("cached_compare_rent_vs_buy", "cached_solve_break_even", "cached_sensitivity_curves"):
+        if _wrappers is None:
+            _wrappers = _cached_wrappers()
+        return _wrappers[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
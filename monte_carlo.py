@@ -0,0 +1,107 @@
+import numpy as np
+from instrumentation import count, timed
+from batch_calculator import complete_inputs, buy_costs
+from oecd import OECD_GROWTH_FILE, growth_history, load_growth_store
+
+# Number of simulated paths evaluated at once; bounds memory to chunk_size x years draws
+DEFAULT_CHUNK_SIZE = 100000
+
+# Percentiles reported for the simulated rent and buy costs
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+def load_growth_history(file_path=OECD_GROWTH_FILE, country="USA"):
+    """
+    Load the annual house price growth rates of one country from the OECD file.
+
+    :param file_path: Path to the OECD per annum growth rate CSV
+    :param country: ISO country code in the REF_AREA column, e.g. "USA"
+    :return: Array of annual growth rates (as percentage), oldest year first
+    """
+    try:
+        return growth_history(load_growth_store(file_path), country)
+    except KeyError:
+        raise ValueError(f"No growth data for country: {country}") from None
+
+def _year_weights(length_of_stay):
+    """Fraction of each simulated year that falls within the stay (1 for full years)."""
+    num_years = int(np.ceil(length_of_stay))
+    weights = np.ones(num_years)
+    weights[-1] = length_of_stay - (num_years - 1)
+    return weights
+
+def _simulate_chunk(rng, size, inputs, weights, appreciation_history, investment_volatility, fixed_buy_cost):
+    """Draw one chunk of paths and return their rent and buy costs."""
+    num_years = len(weights)
+
+    # Appreciation is bootstrapped from history; investment returns are normal around the expected rate
+    appreciation = rng.choice(appreciation_history, size=(size, num_years))
+    returns = rng.normal(inputs["investment_interest_rate"], investment_volatility, size=(size, num_years))
+
+    # Monthly compounding within each year, as in compare_rent_vs_buy
+    home_appreciation = inputs["home_price"] * np.prod((1 + (appreciation / 100) / 12) ** (12 * weights), axis=1)
+    total_resale_value = home_appreciation - home_appreciation * (inputs["selling_cost_rate"] / 100)
+
+    # Simple (non-compounded) return on the down payment, year by year
+    investment = inputs["down_payment"] * ((returns / 100) * weights).sum(axis=1)
+    rent_cost = inputs["monthly_rent"] * 12 * inputs["length_of_stay"] - investment
+    buy_cost = fixed_buy_cost - total_resale_value
+    return rent_cost, buy_cost
+
+@timed("calculation.monte_carlo")
+def simulate_rent_vs_buy(base_inputs, num_paths=10000, appreciation_history=None, investment_volatility=10.0, seed=None,
+                         chunk_size=DEFAULT_CHUNK_SIZE, percentiles=DEFAULT_PERCENTILES, return_samples=False):
+    """
+    Simulate rent vs. buy costs under uncertain home appreciation and investment returns.
+
+    Every path draws one appreciation rate per year from the historical series and one
+    investment return per year from a normal distribution around investment_interest_rate.
+    With a constant appreciation and zero volatility, each path reproduces compare_rent_vs_buy.
+    Paths are evaluated in chunks of chunk_size; each chunk has its own random stream
+    derived from seed, so a run is reproducible for a given seed and chunk size.
+
+    :param base_inputs: Dictionary of compare_rent_vs_buy arguments for one scenario
+    :param num_paths: Number of simulated paths
+    :param appreciation_history: Annual appreciation rates (as percentage) to resample (defaults to the OECD USA series)
+    :param investment_volatility: Standard deviation of annual investment returns (percentage points)
+    :param seed: Seed for the random number generator
+    :param chunk_size: Number of paths evaluated at once
+    :param percentiles: Percentiles to report for the rent and buy costs
+    :param return_samples: Also return the simulated cost arrays
+    :return: Dictionary with the path count, probability that buying wins, mean costs and cost percentiles
+    """
+    inputs = {name: float(value) for name, value in complete_inputs(base_inputs).items()}
+    if inputs["length_of_stay"] <= 0:
+        raise ValueError("Length of stay must be positive.")
+    if appreciation_history is None:
+        appreciation_history = load_growth_history()
+    appreciation_history = np.asarray(appreciation_history, dtype=float)
+    weights = _year_weights(inputs["length_of_stay"])
+
+    # Everything except the resale value is the same on every path
+    fixed_inputs = {name: inputs[name] for name in ("length_of_stay", "home_price", "down_payment", "mortgage_rate",
+                                                    "property_tax_rate", "maintenance_rate", "selling_cost_rate")}
+    without_appreciation = float(buy_costs(investment_interest_rate=0.0, **fixed_inputs))
+    fixed_buy_cost = without_appreciation + (inputs["home_price"] - inputs["home_price"] * (inputs["selling_cost_rate"] / 100))
+
+    count("monte_carlo.paths", num_paths)
+    rent_cost = np.empty(num_paths)
+    buy_cost = np.empty(num_paths)
+    for chunk, start in enumerate(range(0, num_paths, chunk_size)):
+        stop = min(start + chunk_size, num_paths)
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk,)))
+        rent_cost[start:stop], buy_cost[start:stop] = _simulate_chunk(
+            rng, stop - start, inputs, weights, appreciation_history, investment_volatility, fixed_buy_cost
+        )
+
+    summary = {
+        "Paths": num_paths,
+        "Probability Buy Wins": float(np.mean(buy_cost < rent_cost)),
+        "Mean Rent Cost": float(rent_cost.mean()),
+        "Mean Buy Cost": float(buy_cost.mean()),
+        "Rent Cost Percentiles": dict(zip(percentiles, np.percentile(rent_cost, percentiles).tolist())),
+        "Buy Cost Percentiles": dict(zip(percentiles, np.percentile(buy_cost, percentiles).tolist()))
+    }
+    if return_samples:
+        summary["Rent Cost"] = rent_cost
+        summary["Buy Cost"] = buy_cost
+    return summary
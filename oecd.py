@@ -0,0 +1,184 @@
+import csv
+import numpy as np
+
+# OECD annual real house price growth rates (SDMX-CSV export)
+OECD_GROWTH_FILE = "data/OECD percent per annum growth rate.csv"
+
+# OECD five-year average growth rates by country name
+OECD_FIVE_YEAR_FILE = "data/OECD five year average growth rate.csv"
+
+# Statistics precomputed for every window length and end year
+STATISTICS = ("mean", "volatility", "cagr")
+
+def load_growth_store(file_path=OECD_GROWTH_FILE):
+    """
+    Load the OECD growth rates into a country x year array and precompute trailing-window statistics.
+
+    For every country, window length N (1 to the number of years) and end year, the store holds
+    the mean annual growth, its volatility (sample standard deviation) and the compound annual
+    growth rate (CAGR) of the N years ending at that year. Windows with a missing year are NaN.
+
+    :param file_path: Path of the SDMX-CSV file with REF_AREA, TIME_PERIOD and OBS_VALUE columns
+    :return: Dictionary with "countries" (codes), "names", "positions" (code and name to row), "years",
+             "growth" (countries x years, percent), "last" (column of each country's latest observation),
+             and one countries x windows x years array per statistic
+    """
+    observations = {}
+    names = {}
+    with open(file_path, newline="", encoding="utf-8-sig") as source:
+        for row in csv.DictReader(source):
+            if not row["OBS_VALUE"]:
+                continue
+            country = row["REF_AREA"]
+            names.setdefault(country, row.get("Reference area") or country)
+            # Keep the first observation per year if a country has several dwelling series
+            observations.setdefault((country, int(row["TIME_PERIOD"])), float(row["OBS_VALUE"]))
+
+    countries = list(names)
+    years = np.array(sorted({year for _, year in observations}), dtype=np.int64)
+    country_rows = {country: position for position, country in enumerate(countries)}
+    year_columns = {int(year): position for position, year in enumerate(years)}
+
+    growth = np.full((len(countries), len(years)), np.nan)
+    for (country, year), value in observations.items():
+        growth[country_rows[country], year_columns[year]] = value
+
+    positions = dict(country_rows)
+    for country, name in names.items():
+        positions.setdefault(name, country_rows[country])
+
+    observed = ~np.isnan(growth)
+    last = np.where(observed.any(axis=1), growth.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1), -1)
+
+    store = {
+        "countries": countries,
+        "names": [names[country] for country in countries],
+        "positions": positions,
+        "years": years,
+        "growth": growth,
+        "last": last
+    }
+    store.update(_window_statistics(growth))
+    return store
+
+def _window_statistics(growth):
+    """Trailing-window mean, volatility and CAGR for every window length and end year, from cumulative sums."""
+    num_countries, num_years = growth.shape
+    missing = np.isnan(growth)
+    values = np.where(missing, 0.0, growth)
+
+    def cumulative(array):
+        return np.concatenate([np.zeros((num_countries, 1)), np.cumsum(array, axis=1)], axis=1)
+
+    sums = cumulative(values)
+    squares = cumulative(values ** 2)
+    logs = cumulative(np.log1p(values / 100))
+    gaps = cumulative(missing.astype(float))
+
+    statistics = {name: np.full((num_countries, num_years, num_years), np.nan) for name in STATISTICS}
+    for window in range(1, num_years + 1):
+        end = np.arange(window, num_years + 1)
+        start = end - window
+        complete = (gaps[:, end] - gaps[:, start]) == 0
+        total = sums[:, end] - sums[:, start]
+        mean = total / window
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (squares[:, end] - squares[:, start] - window * mean ** 2) / (window - 1) if window > 1 else np.full_like(mean, np.nan)
+            volatility = np.sqrt(np.maximum(variance, 0.0))
+        cagr = np.expm1((logs[:, end] - logs[:, start]) / window) * 100
+
+        statistics["mean"][:, window - 1, end - 1] = np.where(complete, mean, np.nan)
+        statistics["volatility"][:, window - 1, end - 1] = np.where(complete, volatility, np.nan)
+        statistics["cagr"][:, window - 1, end - 1] = np.where(complete, cagr, np.nan)
+    return statistics
+
+def _row(store, country):
+    """Row of a country given by code or name."""
+    position = store["positions"].get(str(country).strip())
+    if position is None:
+        raise KeyError(f"No growth data for country: {country}")
+    return position
+
+def growth_history(store, country):
+    """
+    Observed annual growth rates of one country.
+
+    :param store: Store returned by load_growth_store
+    :param country: ISO code (e.g. "USA") or name (e.g. "United States")
+    :return: Array of annual growth rates (as percentage), oldest year first, without missing years
+    """
+    growth = store["growth"][_row(store, country)]
+    return growth[~np.isnan(growth)]
+
+def growth_statistic(store, country, years, statistic="cagr", end_year=None):
+    """
+    Look up a precomputed trailing-window statistic in O(1).
+
+    :param store: Store returned by load_growth_store
+    :param country: ISO code or name
+    :param years: Window length in years (rounded up; capped at the length of the series)
+    :param statistic: "mean", "volatility" or "cagr"
+    :param end_year: Last year of the window (defaults to the country's latest observation)
+    :return: Statistic as a percentage (NaN if the window has a missing year)
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic: {statistic}")
+    row = _row(store, country)
+    if end_year is None:
+        column = int(store["last"][row])
+    else:
+        column = int(np.searchsorted(store["years"], end_year))
+        if column >= len(store["years"]) or store["years"][column] != end_year:
+            raise KeyError(f"No growth data for year: {end_year}")
+
+    # A window cannot reach back before the first year of the series
+    window = min(max(int(np.ceil(years)), 1), column + 1)
+    return float(store[statistic][row, window - 1, column])
+
+def expected_appreciation(store, country, years, end_year=None):
+    """
+    Expected annual home appreciation for a country over a holding period: the CAGR of the
+    trailing window of the same length.
+
+    :param store: Store returned by load_growth_store
+    :param country: ISO code or name
+    :param years: Holding period in years
+    :param end_year: Last year of history to use (defaults to the latest observation)
+    :return: Effective annual appreciation (as percentage)
+    """
+    return growth_statistic(store, country, years, "cagr", end_year)
+
+def calculator_appreciation_rate(annual_rate):
+    """
+    Convert an effective annual appreciation into the monthly-compounded annual rate that
+    compare_rent_vs_buy's appreciation_rate expects, so both grow the home price equally.
+
+    :param annual_rate: Effective annual rate (as percentage), scalar or array
+    :return: Nominal annual rate compounded monthly (as percentage)
+    """
+    return 12 * np.expm1(np.log1p(np.asarray(annual_rate, dtype=float) / 100) / 12) * 100
+
+def appreciation_rate_for(store, country, years, end_year=None):
+    """
+    appreciation_rate input for compare_rent_vs_buy from a country's history over the holding period.
+
+    :param store: Store returned by load_growth_store
+    :param country: ISO code or name
+    :param years: Holding period in years (length_of_stay)
+    :param end_year: Last year of history to use (defaults to the latest observation)
+    :return: Appreciation rate (as percentage, compounded monthly)
+    """
+    return float(calculator_appreciation_rate(expected_appreciation(store, country, years, end_year)))
+
+def load_five_year_averages(file_path=OECD_FIVE_YEAR_FILE):
+    """
+    Load the OECD five-year average growth rates.
+
+    :param file_path: Path of the CSV with Country and "Average 2016-2021" columns
+    :return: Dictionary of country name to average annual growth (as percentage)
+    """
+    with open(file_path, newline="", encoding="utf-8-sig") as source:
+        reader = csv.reader(source)
+        next(reader)
+        return {row[0].strip(): float(row[1]) for row in reader if len(row) > 1 and row[1].strip()}
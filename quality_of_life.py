@@ -1,4 +1,34 @@
-import pandas as pd
+import numpy as np
+from data_cache import read_excel_cached
+from instrumentation import timed
+
+# Index columns of the Quality of Life dataset, in the order used by the weighted formula
+INDEX_COLUMNS = [
+    "Purchasing Power Index",
+    "Safety Index",
+    "Health Care Index",
+    "Climate Index",
+    "Cost Of Living Index",
+    "Property Price to Income Ratio",
+    "Traffic Commute Time Index",
+    "Pollution Index"
+]
+
+# Upper bounds (inclusive) of each category band
+THRESHOLDS = {
+    "Purchasing Power Index": [40, 80, 120, 160],
+    "Safety Index": [20, 40, 60, 80],
+    "Health Care Index": [20, 40, 60, 80],
+    "Climate Index": [20, 40, 60, 80],
+    "Cost Of Living Index": [20, 40, 60, 80],
+    "Property Price to Income Ratio": [2, 4, 6, 8],
+    "Traffic Commute Time Index": [20, 40, 60, 80],
+    "Pollution Index": [20, 40, 60, 80],
+    "Quality of Life Index": [48, 96, 144, 192]
+}
+
+# Labels for categorization
+LABELS = ["Very Low", "Low", "Moderate", "High", "Very High"]
 
 def load_data(file_path, sheet_name="Sheet1"):
     """
@@ -7,8 +37,8 @@ def load_data(file_path, sheet_name="Sheet1"):
     :param sheet_name: Name of the sheet to load (default is "Sheet1").
     :return: DataFrame containing the data from the specified sheet.
     """
-    # Load the Excel sheet into a DataFrame
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
+    # Load the Excel sheet into a DataFrame (served from the binary cache when unchanged)
+    df = read_excel_cached(file_path, sheet_name=sheet_name)
 
     # Replace "?" with None to handle missing values
     df.replace("?", None, inplace=True)  # Replace missing values
@@ -31,6 +61,7 @@ def categorize_value(value, thresholds, labels):
     # If the value exceeds all thresholds, return the last label
     return labels[-1]
 
+@timed("calculation.quality_of_life")
 def compute_quality_of_life(data, city):
     """
     Compute the Quality of Life Index for a given city.
@@ -60,25 +91,17 @@ def compute_quality_of_life(data, city):
         # If any value is missing or cannot be converted to float, print a message and return
         print("Missing value in dataset.")
         return
+    # Empty cells read as NaN; leave the city unscored like score_quality_of_life instead of clipping NaN to 0
+    if any(np.isnan(value) for value in (pp, safety, health, climate, col, prop, traffic, pollution)):
+        print("Missing value in dataset.")
+        return
     
     # Compute Quality of Life Index using a weighted formula
     qol = max(0, 100 + pp / 2.5 - prop * 1.0 - col / 10 + safety / 2.0 + health / 2.5 - traffic / 2.0 - pollution * 2.0 / 3.0 + climate / 3.0)
     
-    # Define thresholds and labels for categorization
-    thresholds = {
-        "Purchasing Power Index": [40, 80, 120, 160],
-        "Safety Index": [20, 40, 60, 80],
-        "Health Care Index": [20, 40, 60, 80],
-        "Climate Index": [20, 40, 60, 80],
-        "Cost Of Living Index": [20, 40, 60, 80],
-        "Property Price to Income Ratio": [2, 4, 6, 8],
-        "Traffic Commute Time Index": [20, 40, 60, 80],
-        "Pollution Index": [20, 40, 60, 80],
-        "Quality of Life Index": [48, 96, 144, 192]
-    }
-    
-    # Labels for categorization
-    labels = ["Very Low", "Low", "Moderate", "High", "Very High"]
+    # Thresholds and labels for categorization
+    thresholds = THRESHOLDS
+    labels = LABELS
     
     # Print categorized values for each index
     print(f"Purchasing Power Index: {pp} ({categorize_value(pp, thresholds['Purchasing Power Index'], labels)})")
@@ -91,6 +114,75 @@ def compute_quality_of_life(data, city):
     print(f"Pollution Index: {pollution} ({categorize_value(pollution, thresholds['Pollution Index'], labels)})")
     print(f"Quality of Life Index: {qol} ({categorize_value(qol, thresholds['Quality of Life Index'], labels)})")
 
+def score_quality_of_life_arrays(columns):
+    """
+    Compute the Quality of Life Index and category bands for many cities in one vectorized pass.
+
+    :param columns: Mapping of index column name to array of values (missing values as NaN)
+    :return: Dictionary with a float array per index, "Quality of Life Index", and an int8 band code
+             per index under "<name> Band" (index into LABELS, -1 where the value is missing)
+    """
+    values = {name: np.asarray(columns[name], dtype=float) for name in INDEX_COLUMNS}
+    pp, safety, health, climate, col, prop, traffic, pollution = (values[name] for name in INDEX_COLUMNS)
+
+    # Same weighted formula as compute_quality_of_life; missing inputs propagate as NaN
+    qol = 100 + pp / 2.5 - prop * 1.0 - col / 10 + safety / 2.0 + health / 2.5 - traffic / 2.0 - pollution * 2.0 / 3.0 + climate / 3.0
+    values["Quality of Life Index"] = np.where(np.isnan(qol), np.nan, np.maximum(0, qol))
+
+    scores = dict(values)
+    for name, thresholds in THRESHOLDS.items():
+        # right=True puts a value equal to a threshold in the lower band, like categorize_value
+        band = np.digitize(values[name], thresholds, right=True).astype(np.int8)
+        band[np.isnan(values[name])] = -1
+        scores[f"{name} Band"] = band
+    return scores
+
+def rank_positions(scores):
+    """
+    Order cities by their Quality of Life Index, highest first.
+
+    :param scores: Dictionary returned by score_quality_of_life_arrays
+    :return: Array of row positions in rank order; unscored (NaN) cities come last in their original order
+    """
+    # Stable sort on the negated index keeps NaN cities at the end in dataset order
+    return np.argsort(-scores["Quality of Life Index"], kind="stable")
+
+@timed("calculation.quality_of_life")
+def score_quality_of_life(data):
+    """
+    Score every city of the dataset at once.
+
+    :param data: DataFrame containing quality of life data for cities.
+    :return: DataFrame with the city, each index and its category, the Quality of Life Index and its category.
+             Cities with a missing value get a NaN index and a missing category, as compute_quality_of_life reports them.
+    """
+    import pandas as pd
+
+    # Convert the index columns to numbers; "?" placeholders and None become NaN
+    columns = {name: pd.to_numeric(data[name], errors="coerce").to_numpy(dtype=float) for name in INDEX_COLUMNS}
+    scores = score_quality_of_life_arrays(columns)
+
+    labels = np.array(LABELS + [None], dtype=object)
+    table = {"City": data["City"].to_numpy()}
+    for name in THRESHOLDS:
+        table[name] = scores[name]
+        table[f"{name} Category"] = labels[scores[f"{name} Band"]]
+    return pd.DataFrame(table)
+
+def rank_quality_of_life(data):
+    """
+    Rank every city by its Quality of Life Index, highest first.
+
+    :param data: DataFrame containing quality of life data for cities.
+    :return: Scored DataFrame (see score_quality_of_life) sorted by rank, with a "Rank" column; unscored cities come last
+    """
+    table = score_quality_of_life(data)
+
+    order = rank_positions({"Quality of Life Index": table["Quality of Life Index"].to_numpy()})
+    table = table.iloc[order].reset_index(drop=True)
+    table.insert(0, "Rank", np.arange(1, len(table) + 1))
+    return table
+
 # Update file path for correct data loading
 if __name__ == "__main__":
     # Path to the Excel file containing quality of life data
@@ -0,0 +1,209 @@
+import dataclasses
+from dataclasses import dataclass
+from enum import IntEnum
+import numpy as np
+from calculator import rent_vs_buy_costs
+from batch_calculator import (INPUT_DEFAULTS, INPUT_FALLBACKS, INPUT_NAMES, RECOMMENDATION_BUY, RECOMMENDATION_EITHER,
+                              RECOMMENDATION_INVALID, RECOMMENDATION_RENT, RECOMMENDATIONS, complete_inputs,
+                              compare_rent_vs_buy_batch)
+
+class Recommendation(IntEnum):
+    """Recommendation codes; members equal the RECOMMENDATION_* codes of the batch functions."""
+    EITHER = RECOMMENDATION_EITHER
+    RENT = RECOMMENDATION_RENT
+    BUY = RECOMMENDATION_BUY
+    INVALID = RECOMMENDATION_INVALID
+
+    @property
+    def label(self):
+        """Recommendation string of the code, "Invalid scenario." for INVALID."""
+        return RECOMMENDATIONS[self]
+
+    @property
+    def legacy_label(self):
+        """Recommendation string as returned by compare_rent_vs_buy, which reports NaN costs as "Either."."""
+        return RECOMMENDATIONS[_EITHER if self is _INVALID else self]
+
+    @staticmethod
+    def from_costs(rent_cost, buy_cost):
+        """Recommend the cheaper option, either when both cost the same, or invalid when a cost is NaN."""
+        if rent_cost < buy_cost:
+            return _RENT
+        if rent_cost > buy_cost:
+            return _BUY
+        if rent_cost == buy_cost:
+            return _EITHER
+        return _INVALID
+
+# Members bound once; looking them up on the enum class is slow in per-scenario code
+_EITHER, _RENT, _BUY, _INVALID = Recommendation.EITHER, Recommendation.RENT, Recommendation.BUY, Recommendation.INVALID
+
+# Scenario record: one float field per compare_rent_vs_buy argument; NaN means an input
+# with a fallback (appreciation_rate) follows its fallback input
+SCENARIO_DTYPE = np.dtype([(name, np.float64) for name in INPUT_NAMES])
+
+# Result record: rounded costs and the recommendation code
+RESULT_DTYPE = np.dtype([("rent_cost", np.float64), ("buy_cost", np.float64), ("recommendation", np.int8)])
+
+@dataclass(slots=True)
+class ScenarioInputs:
+    """
+    Inputs of one rent vs. buy comparison, without the per-instance dictionary of a plain object.
+
+    Fields and defaults are the compare_rent_vs_buy arguments.
+    """
+    length_of_stay: float
+    monthly_rent: float
+    home_price: float
+    down_payment: float
+    mortgage_rate: float
+    investment_interest_rate: float
+    property_tax_rate: float = INPUT_DEFAULTS["property_tax_rate"]
+    maintenance_rate: float = INPUT_DEFAULTS["maintenance_rate"]
+    selling_cost_rate: float = INPUT_DEFAULTS["selling_cost_rate"]
+    appreciation_rate: float | None = None
+
+    @classmethod
+    def from_mapping(cls, inputs):
+        """
+        Build scenario inputs from a dictionary of compare_rent_vs_buy arguments.
+
+        :param inputs: Dictionary or other mapping (extra keys such as "city" are ignored)
+        :return: ScenarioInputs
+        """
+        for name, default in INPUT_DEFAULTS.items():
+            if default is None and name not in inputs:
+                raise KeyError(f"Missing required input: {name}")
+        return cls(**{name: inputs[name] for name in INPUT_NAMES if name in inputs})
+
+    def as_dict(self):
+        """
+        compare_rent_vs_buy arguments as a dictionary; inputs following their fallback are left out.
+
+        :return: Dictionary of argument name to value
+        """
+        inputs = {name: getattr(self, name) for name in INPUT_DEFAULTS}
+        inputs.update({name: getattr(self, name) for name in INPUT_FALLBACKS if getattr(self, name) is not None})
+        return inputs
+
+    def replace(self, **changes):
+        """
+        Copy of the scenario with some inputs changed.
+
+        :param changes: New input values by name
+        :return: ScenarioInputs
+        """
+        return dataclasses.replace(self, **changes)
+
+    def compare(self):
+        """
+        Compare renting and buying for this scenario.
+
+        :return: ComparisonResult
+        """
+        return compare_scenario(self)
+
+@dataclass(slots=True)
+class ComparisonResult:
+    """Result of one rent vs. buy comparison, with the recommendation as a code."""
+    rent_cost: float
+    buy_cost: float
+    recommendation: Recommendation
+
+    @classmethod
+    def from_costs(cls, rent_cost, buy_cost):
+        """
+        Build a result from rounded costs.
+
+        :param rent_cost: Total rent cost
+        :param buy_cost: Total buy cost
+        :return: ComparisonResult
+        """
+        return cls(rent_cost, buy_cost, Recommendation.from_costs(rent_cost, buy_cost))
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Build a result from one element of a RESULT_DTYPE array.
+
+        :param record: Structured array element
+        :return: ComparisonResult with Python floats
+        """
+        return cls(float(record["rent_cost"]), float(record["buy_cost"]), Recommendation(int(record["recommendation"])))
+
+    def as_dict(self):
+        """
+        The result as returned by compare_rent_vs_buy, including its "Either." for NaN costs.
+
+        :return: Dictionary with "Rent Cost", "Buy Cost" and "Recommendation"
+        """
+        return {"Rent Cost": self.rent_cost, "Buy Cost": self.buy_cost, "Recommendation": self.recommendation.legacy_label}
+
+def compare_scenario(scenario):
+    """
+    Compare renting vs. buying for one scenario without building the result dictionary.
+
+    :param scenario: ScenarioInputs
+    :return: ComparisonResult whose as_dict() equals compare_rent_vs_buy(**scenario.as_dict()); NaN costs
+             get the INVALID code, which the dictionary reports as "Either." like compare_rent_vs_buy
+    """
+    rent_cost, buy_cost = rent_vs_buy_costs(
+        scenario.length_of_stay, scenario.monthly_rent, scenario.home_price, scenario.down_payment, scenario.mortgage_rate,
+        scenario.investment_interest_rate, scenario.property_tax_rate, scenario.maintenance_rate, scenario.selling_cost_rate,
+        scenario.appreciation_rate
+    )
+    return ComparisonResult.from_costs(rent_cost, buy_cost)
+
+def scenario_records(inputs):
+    """
+    Pack scenarios into one structured array.
+
+    :param inputs: Dictionary, DataFrame or other mapping of argument name to value or array; arrays are
+                   broadcast against each other, missing optional rates get their defaults
+    :return: 1-D array of SCENARIO_DTYPE records
+    """
+    columns = complete_inputs(inputs)
+    shape = np.broadcast_shapes(*(values.shape for values in columns.values()))
+    records = np.empty(int(np.prod(shape)), dtype=SCENARIO_DTYPE)
+    for name in INPUT_FALLBACKS:
+        records[name] = np.nan
+    for name, values in columns.items():
+        records[name] = np.broadcast_to(values, shape).ravel()
+    return records
+
+def compare_records(scenarios):
+    """
+    Compare renting vs. buying for every scenario record in one vectorized pass.
+
+    :param scenarios: Array of SCENARIO_DTYPE records
+    :return: Array of RESULT_DTYPE records, matching compare_rent_vs_buy to the cent
+    """
+    inputs = {name: scenarios[name] for name in INPUT_DEFAULTS}
+    for name, fallback in INPUT_FALLBACKS.items():
+        values = scenarios[name]
+        if not np.isnan(values).all():
+            inputs[name] = np.where(np.isnan(values), inputs[fallback], values)
+    return result_records(compare_rent_vs_buy_batch(**inputs))
+
+def result_records(result):
+    """
+    Pack the arrays returned by the batch functions into one structured array.
+
+    :param result: Dictionary of "Rent Cost", "Buy Cost" and "Recommendation Code" arrays
+    :return: Array of RESULT_DTYPE records shaped like the result arrays
+    """
+    records = np.empty(np.shape(result["Rent Cost"]), dtype=RESULT_DTYPE)
+    records["rent_cost"] = result["Rent Cost"]
+    records["buy_cost"] = result["Buy Cost"]
+    records["recommendation"] = result["Recommendation Code"]
+    return records
+
+def result_dicts(records):
+    """
+    View result records as compare_rent_vs_buy dictionaries, one at a time.
+
+    :param records: Array of RESULT_DTYPE records
+    :return: Generator of dictionaries with "Rent Cost", "Buy Cost" and "Recommendation"
+    """
+    for record in np.ravel(records):
+        yield ComparisonResult.from_record(record).as_dict()
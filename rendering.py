@@ -0,0 +1,358 @@
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from instrumentation import timed
+from sensitivity_grid import sensitivity_curves
+
+# Workbook columns used to build per-city report inputs
+CITY_REPORT_COLUMNS = {
+    "monthly_rent": "Rent per Month",
+    "home_price": "Buy Apartment Price Total",
+    "mortgage_rate": "Mortgage Intrest Rate"
+}
+
+class SensitivityChart:
+    """
+    Reusable sensitivity sweep chart.
+
+    The axes, both cost lines, the legend and the grid are built once; update() only replaces
+    the line data and labels, so one chart can render any number of sweeps or scenarios.
+    """
+
+    def __init__(self, ax=None, figsize=(8, 5)):
+        """
+        :param ax: Matplotlib axes to draw on (defaults to a new headless figure)
+        :param figsize: Figure size in inches when a new figure is created
+        """
+        if ax is None:
+            ax = new_figure(figsize).add_subplot()
+        self.ax = ax
+        self.figure = ax.figure
+        self.factor = None
+        (self.rent_line,) = ax.plot([], [], label='Rent Cost', marker='o')
+        (self.buy_line,) = ax.plot([], [], label='Buy Cost', marker='s')
+        ax.set_ylabel("Cost (USD)")
+        ax.legend()
+        ax.grid()
+
+    @timed("render.draw")
+    def update(self, factor, values, rent_costs, buy_costs):
+        """
+        Show one sensitivity sweep.
+
+        :param factor: Name of the varied input factor
+        :param values: Values of the factor
+        :param rent_costs: Rent cost at each value
+        :param buy_costs: Buy cost at each value
+        :return: The chart
+        """
+        self.rent_line.set_data(values, rent_costs)
+        self.buy_line.set_data(values, buy_costs)
+        if factor != self.factor:
+            label = factor.replace("_", " ").title()
+            self.ax.set_xlabel(label)
+            self.ax.set_title(f"Impact of {label} on Rent vs. Buy Cost")
+            self.factor = factor
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return self
+
+    def render(self, target=None, fmt="png", dpi=100):
+        """
+        Write the chart to a file or in-memory bytes, keeping it for the next update.
+
+        :param target: File path or binary file object; None returns the encoded bytes
+        :param fmt: Image format, e.g. "png" or "svg"
+        :param dpi: Resolution for raster formats
+        :return: The target, or the encoded image bytes when target is None
+        """
+        return save_figure(self.figure, target, fmt, dpi, clear=False)
+
+def draw_sensitivity(ax, factor, values, rent_costs, buy_costs):
+    """
+    Draw one sensitivity sweep on a set of axes.
+
+    :param ax: Matplotlib axes to draw on
+    :param factor: Name of the varied input factor
+    :param values: Values of the factor
+    :param rent_costs: Rent cost at each value
+    :param buy_costs: Buy cost at each value
+    :return: SensitivityChart that can show further sweeps on the same axes
+    """
+    return SensitivityChart(ax).update(factor, values, rent_costs, buy_costs)
+
+# Bar column, color, legend label, y-axis label and title of the two vacancy charts
+VACANCY_CHARTS = (
+    ("Vacant housing units", 'slategrey', "Vacant housing units", "Number Vacant", "Vacancy & Cost"),
+    ("Median House Value (dollars)", 'tan', "Median home value", "Home Value (USD)", "Home Value & Cost")
+)
+
+# Cost line column, color and legend label drawn on the secondary axes of both charts
+VACANCY_LINES = (
+    ("Median Buy Cost (dollars)", 'forestgreen', "Median buy cost"),
+    ("Median Rent Cost (dollars)", 'darkred', "Median rent cost")
+)
+
+class VacancyChart:
+    """
+    Reusable vacancy & cost and home value & cost chart.
+
+    Subplots, twin axes, bars, cost lines, tick formatters and legends are built once;
+    update() sets the bar heights, line data and city labels in place. A table with a
+    different number of cities rebuilds the layout.
+    """
+
+    def __init__(self, table, ax1=None, ax2=None, figsize=(20, 5)):
+        """
+        :param table: DataFrame with "City", "Vacant housing units", "Median House Value (dollars)",
+                      "Median Buy Cost (dollars)" and "Median Rent Cost (dollars)" columns
+        :param ax1: Axes for the vacant housing units chart (defaults to a new headless figure)
+        :param ax2: Axes for the median home value chart
+        :param figsize: Figure size in inches when a new figure is created
+        """
+        self.owns_figure = ax1 is None
+        if self.owns_figure:
+            ax1, ax2 = new_figure(figsize).subplots(1, 2)
+        self.axes = (ax1, ax2)
+        self.figure = ax1.figure
+        self._build(len(table))
+        self.update(table)
+
+    def _build(self, size):
+        """Create the bars, lines, formatters and legends for a number of cities."""
+        import matplotlib.ticker as mticker
+
+        positions = range(size)
+        self.size = size
+        self.cities = None
+        self.bars = []
+        self.lines = []
+        self.secondary_axes = []
+        for ax, (_, color, label, ylabel, title) in zip(self.axes, VACANCY_CHARTS):
+            # Primary y-axis - bars
+            self.bars.append(ax.bar(positions, [0] * size, color=color, label=label))
+            ax.set_xlabel("City", fontsize=14)
+            ax.set_ylabel(ylabel, color='black')
+            ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, pos: f"{int(x/1000)}K"))
+            ax.legend(loc="upper left")
+
+            # Secondary y-axis - median buy and rent costs
+            secondary = ax.twinx()
+            self.lines.append([secondary.plot(positions, [0] * size, color=line_color, marker='o', linestyle='-', label=line_label)[0]
+                               for _, line_color, line_label in VACANCY_LINES])
+            secondary.set_ylabel("Cost (USD)", color='black')
+            secondary.legend(loc="best")
+
+            ax.set_title(title, fontsize=14, fontweight="bold")
+            self.secondary_axes.append(secondary)
+
+    @timed("render.draw")
+    def update(self, table):
+        """
+        Show the vacancy and cost figures of a table of cities.
+
+        :param table: DataFrame with the columns described in __init__
+        :return: The chart
+        """
+        if len(table) != self.size:
+            for ax, secondary in zip(self.axes, self.secondary_axes):
+                secondary.remove()
+                ax.cla()
+            self._build(len(table))
+
+        for ax, secondary, bars, lines, (column, *_) in zip(self.axes, self.secondary_axes, self.bars, self.lines, VACANCY_CHARTS):
+            for bar, height in zip(bars, table.loc[:, column]):
+                bar.set_height(height)
+            for line, (line_column, *_) in zip(lines, VACANCY_LINES):
+                line.set_ydata(table.loc[:, line_column])
+            ax.relim()
+            ax.autoscale_view()
+            secondary.relim()
+            secondary.autoscale_view()
+
+        # City labels only change (and need a new layout) when the cities do
+        cities = list(table.loc[:, "City"])
+        if cities != self.cities:
+            for ax in self.axes:
+                ax.set_xticks(range(len(cities)))  # Set ticks at positions 0, 1, 2, etc.
+                ax.set_xticklabels(cities, rotation=85, ha='right')  # Set labels and rotate them
+            self.cities = cities
+            if self.owns_figure:
+                self.figure.tight_layout()
+        return self
+
+    def render(self, target=None, fmt="png", dpi=100):
+        """
+        Write the chart to a file or in-memory bytes, keeping it for the next update.
+
+        :param target: File path or binary file object; None returns the encoded bytes
+        :param fmt: Image format, e.g. "png" or "svg"
+        :param dpi: Resolution for raster formats
+        :return: The target, or the encoded image bytes when target is None
+        """
+        return save_figure(self.figure, target, fmt, dpi, clear=False)
+
+def draw_vacancy(ax1, ax2, table):
+    """
+    Draw the vacancy & cost and home value & cost charts with cost lines on secondary axes.
+
+    :param ax1: Axes for the vacant housing units chart
+    :param ax2: Axes for the median home value chart
+    :param table: DataFrame with "City", "Vacant housing units", "Median House Value (dollars)",
+                  "Median Buy Cost (dollars)" and "Median Rent Cost (dollars)" columns
+    :return: The two secondary (cost) axes
+    """
+    return VacancyChart(table, ax1, ax2).secondary_axes
+
+def new_figure(figsize=(8, 5)):
+    """
+    Create a figure on the non-interactive Agg canvas, outside pyplot's global figure registry.
+
+    Such figures never need a display and are freed as soon as they are no longer referenced.
+
+    :param figsize: Figure size in inches
+    :return: Matplotlib Figure
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+@timed("render.save")
+def save_figure(figure, target=None, fmt="png", dpi=100, clear=True):
+    """
+    Write a figure to a file or an in-memory buffer and release its artists.
+
+    :param figure: Figure created by new_figure
+    :param target: File path or binary file object; None returns the encoded bytes
+    :param fmt: Image format, e.g. "png" or "svg"
+    :param dpi: Resolution for raster formats
+    :param clear: Release the artists after saving; chart templates keep them for the next update
+    :return: The target, or the encoded image bytes when target is None
+    """
+    buffer = io.BytesIO() if target is None else target
+    try:
+        figure.savefig(buffer, format=fmt, dpi=dpi)
+    finally:
+        # Drop every artist so the figure's memory is released deterministically
+        if clear:
+            figure.clear()
+    return buffer.getvalue() if target is None else target
+
+def sensitivity_figures(base_inputs):
+    """
+    Build one headless figure per sensitivity sweep.
+
+    :param base_inputs: Dictionary of compare_rent_vs_buy arguments
+    :return: Generator of (factor, Figure) pairs
+    """
+    for factor, (values, rent_costs, buy_costs) in sensitivity_curves(base_inputs).items():
+        yield factor, SensitivityChart().update(factor, values, rent_costs, buy_costs).figure
+
+def vacancy_figure(table):
+    """
+    Build the headless vacancy and home value figure.
+
+    :param table: Vacancy table as expected by draw_vacancy
+    :return: Matplotlib Figure
+    """
+    return VacancyChart(table).figure
+
+def _file_name(*parts):
+    """Build a file-system safe name from labels such as city names."""
+    return "_".join(re.sub(r"[^A-Za-z0-9]+", "-", str(part)).strip("-") for part in parts)
+
+def render_sensitivity(base_inputs, output_dir=None, fmt="png", prefix="sensitivity", dpi=100, chart=None):
+    """
+    Render every sensitivity sweep to image files or in-memory bytes.
+
+    All sweeps are drawn on one chart template, updating its lines instead of building a figure per sweep.
+
+    :param base_inputs: Dictionary of compare_rent_vs_buy arguments
+    :param output_dir: Directory for the images; None returns the encoded bytes instead
+    :param fmt: Image format, e.g. "png" or "svg"
+    :param prefix: File name prefix
+    :param dpi: Resolution for raster formats
+    :param chart: SensitivityChart to reuse across calls (defaults to a new one)
+    :return: Dictionary of factor name to file path (or image bytes)
+    """
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    chart = chart or SensitivityChart()
+    rendered = {}
+    for factor, (values, rent_costs, buy_costs) in sensitivity_curves(base_inputs).items():
+        target = None if output_dir is None else os.path.join(output_dir, f"{_file_name(prefix, factor)}.{fmt}")
+        rendered[factor] = chart.update(factor, values, rent_costs, buy_costs).render(target, fmt, dpi)
+    return rendered
+
+def render_vacancy(table, target=None, fmt="png", dpi=100, chart=None):
+    """
+    Render the vacancy and home value figure to a file or in-memory bytes.
+
+    :param table: Vacancy table as expected by draw_vacancy
+    :param target: File path or binary file object; None returns the encoded bytes
+    :param fmt: Image format, e.g. "png" or "svg"
+    :param dpi: Resolution for raster formats
+    :param chart: VacancyChart to update and keep (by default a new figure is built and released after saving)
+    :return: The target, or the encoded image bytes when target is None
+    """
+    if chart is None:
+        return save_figure(vacancy_figure(table), target, fmt, dpi)
+    return chart.update(table).render(target, fmt, dpi)
+
+def city_report_jobs(data, length_of_stay, down_payment, investment_interest_rate):
+    """
+    Build one sensitivity report job per (City, Location, Number of Bedrooms) row of the dataset.
+
+    :param data: DataFrame loaded from "Random Cities in USA (Rent & Buy).xlsx"
+    :param length_of_stay: Years planning to stay in the home
+    :param down_payment: Down payment amount
+    :param investment_interest_rate: Annual investment interest (as percentage)
+    :return: Dictionary of report name to compare_rent_vs_buy inputs
+    """
+    jobs = {}
+    for _, row in data.iterrows():
+        name = _file_name(row["City"], row["Location"], f"{row['Number of Bedrooms']}BR")
+        inputs = {argument: float(row[column]) for argument, column in CITY_REPORT_COLUMNS.items()}
+        jobs[name] = {
+            "length_of_stay": length_of_stay,
+            "down_payment": down_payment,
+            "investment_interest_rate": investment_interest_rate,
+            **inputs
+        }
+    return jobs
+
+# Sensitivity chart reused by every city report rendered in this process
+_city_chart = None
+
+def _render_city_job(name, base_inputs, output_dir, fmt, dpi):
+    """Render one city's report in a worker process, reusing the process's chart template."""
+    global _city_chart
+    if _city_chart is None:
+        _city_chart = SensitivityChart()
+    return name, render_sensitivity(base_inputs, output_dir, fmt, prefix=name, dpi=dpi, chart=_city_chart)
+
+def render_city_reports(jobs, output_dir, fmt="png", dpi=100, max_workers=None):
+    """
+    Render sensitivity reports for many cities in parallel worker processes.
+
+    :param jobs: Dictionary of report name to compare_rent_vs_buy inputs (see city_report_jobs)
+    :param output_dir: Directory for the images
+    :param fmt: Image format, e.g. "png" or "svg"
+    :param dpi: Resolution for raster formats
+    :param max_workers: Number of worker processes (defaults to the CPU count; 1 renders in this process)
+    :return: Dictionary of report name to {factor: file path}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers == 1 or len(jobs) <= 1:
+        return dict(_render_city_job(name, inputs, output_dir, fmt, dpi) for name, inputs in jobs.items())
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        futures = [executor.submit(_render_city_job, name, inputs, output_dir, fmt, dpi) for name, inputs in jobs.items()]
+        return dict(future.result() for future in futures)
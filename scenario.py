@@ -0,0 +1,217 @@
+import numpy as np
+from batch_calculator import COST_COLUMNS, INPUT_DEFAULTS, INPUT_FALLBACKS, INPUT_NAMES, RECOMMENDATIONS, rounded_costs
+from sensitivity_grid import sensitivity_factors
+
+# Intermediate terms of compare_rent_vs_buy: name -> (inputs or terms it depends on, formula).
+# The formulas evaluate in the same order as compare_rent_vs_buy, so cached results match it exactly.
+TERMS = {
+    "investment": (("down_payment", "investment_interest_rate", "length_of_stay"),
+                   lambda down, rate, stay: (down * (rate / 100)) * stay),
+    "rent_total": (("monthly_rent", "length_of_stay", "investment"),
+                   lambda rent, stay, investment: (rent * 12 * stay) - investment),
+    "loan_amount": (("home_price", "down_payment"),
+                    lambda price, down: price - down),
+    "num_payments": (("length_of_stay",),
+                     lambda stay: stay * 12),
+    "monthly_interest_rate": (("mortgage_rate",),
+                              lambda rate: (rate / 100) / 12),
+    "payment_growth": (("monthly_interest_rate", "num_payments"),
+                       lambda rate, payments: (1 + rate) ** payments),
+    "monthly_payment": (("loan_amount", "monthly_interest_rate", "payment_growth", "num_payments"),
+                        lambda loan, rate, growth, payments: loan * (rate * growth) / (growth - 1) if rate > 0 else loan / payments),
+    "mortgage_total": (("monthly_payment", "num_payments"),
+                       lambda payment, payments: payment * payments),
+    "appreciation": (("appreciation_rate", "investment_interest_rate"),
+                     lambda appreciation, investment: investment if appreciation is None else appreciation),
+    "appreciation_factor": (("appreciation", "length_of_stay"),
+                            lambda rate, stay: (1 + (rate / 100) / 12)**(12 * stay)),
+    "home_appreciation": (("home_price", "appreciation_factor"),
+                          lambda price, factor: price * factor),
+    "resale_value": (("home_appreciation", "selling_cost_rate"),
+                     lambda value, rate: value - value * (rate / 100)),
+    "tax_total": (("property_tax_rate", "home_price", "length_of_stay"),
+                  lambda rate, price, stay: (rate / 100) * price * stay),
+    "maintenance_total": (("maintenance_rate", "home_price", "length_of_stay"),
+                          lambda rate, price, stay: (rate / 100) * price * stay),
+    "buy_total": (("down_payment", "mortgage_total", "tax_total", "maintenance_total", "resale_value"),
+                  lambda down, mortgage, tax, maintenance, resale: down + mortgage + tax + maintenance - resale),
+    "Rent Cost": (("rent_total",), lambda total: round(total, 2)),
+    "Buy Cost": (("buy_total",), lambda total: round(total, 2))
+}
+
+def _dependents(name):
+    """Terms that depend on an input or term, directly or through other terms."""
+    found = set()
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        for term, (dependencies, _) in TERMS.items():
+            if current in dependencies and term not in found:
+                found.add(term)
+                pending.append(term)
+    return found
+
+# Terms to invalidate when an input changes
+DEPENDENTS = {name: _dependents(name) for name in INPUT_NAMES}
+
+# Inputs each cost side depends on, e.g. the rent cost does not depend on the home price
+SIDE_INPUTS = {side: {name for name in INPUT_NAMES if side in DEPENDENTS[name]} for side in COST_COLUMNS}
+
+class Scenario:
+    """
+    One rent vs. buy scenario for interactive what-if sessions.
+
+    Intermediate terms (loan amount, payment growth, appreciation factor, tax and maintenance
+    totals, ...) and the sensitivity sweeps are cached. Changing an input recomputes only the
+    terms that depend on it, and only the sweep sides (rent or buy curve) it affects:
+
+    scenario = Scenario(inputs)
+    scenario.result()                 # same as compare_rent_vs_buy(**inputs)
+    scenario.update(monthly_rent=1500)
+    scenario.sensitivity_curves()     # only the rent curves are recomputed
+    """
+
+    def __init__(self, inputs):
+        """
+        :param inputs: Dictionary of compare_rent_vs_buy arguments (extra keys such as "city" are ignored)
+        """
+        self.values = {}
+        for name, default in INPUT_DEFAULTS.items():
+            if name in inputs:
+                self.values[name] = inputs[name]
+            elif default is not None:
+                self.values[name] = default
+            else:
+                raise KeyError(f"Missing required input: {name}")
+        for name in INPUT_FALLBACKS:
+            self.values[name] = inputs.get(name)
+
+        self.stale = set(TERMS)
+        self.sweeps = {}
+        self.stale_sweeps = {}
+        self.recomputed = 0  # terms and sweep sides evaluated, for measuring incremental updates
+
+    @property
+    def inputs(self):
+        """Current compare_rent_vs_buy arguments."""
+        inputs = {name: self.values[name] for name in INPUT_DEFAULTS}
+        inputs.update({name: self.values[name] for name in INPUT_FALLBACKS if self.values[name] is not None})
+        return inputs
+
+    def update(self, **changes):
+        """
+        Change one or more inputs and invalidate what depends on them.
+
+        :param changes: New input values by name (appreciation_rate=None restores its fallback)
+        :return: Set of sensitivity factors whose curves changed
+        """
+        for name in changes:
+            if name not in INPUT_NAMES:
+                raise ValueError(f"Unknown input: {name}")
+
+        changed_sweeps = set()
+        for name, value in changes.items():
+            if self.values[name] == value:
+                continue
+            self.values[name] = value
+            self.stale |= DEPENDENTS[name]
+            for factor in self.sweeps:
+                stale = self.stale_sweeps.setdefault(factor, {})
+                for side in COST_COLUMNS:
+                    if name == factor:
+                        # The sweep range depends on the factor's own value; its points do not
+                        stale.setdefault(side, "range")
+                    elif name in SIDE_INPUTS[side]:
+                        stale[side] = "all"
+                if stale:
+                    changed_sweeps.add(factor)
+        return changed_sweeps
+
+    def get(self, name):
+        """
+        Value of an input or intermediate term, recomputed only if something it depends on changed.
+
+        :param name: Input name or a key of TERMS
+        :return: Value
+        """
+        if name not in TERMS:
+            return self.values[name]
+        if name in self.stale:
+            dependencies, formula = TERMS[name]
+            self.values[name] = formula(*(self.get(dependency) for dependency in dependencies))
+            self.stale.discard(name)
+            self.recomputed += 1
+        return self.values[name]
+
+    def result(self):
+        """
+        Compare renting and buying for the current inputs.
+
+        :return: Dictionary with "Rent Cost", "Buy Cost" and "Recommendation", as returned by compare_rent_vs_buy
+        """
+        rent_cost, buy_cost = self.get("Rent Cost"), self.get("Buy Cost")
+        # Like compare_rent_vs_buy, NaN costs compare neither way and fall through to "Either."
+        if rent_cost < buy_cost:
+            recommendation = RECOMMENDATIONS[1]
+        elif rent_cost > buy_cost:
+            recommendation = RECOMMENDATIONS[2]
+        else:
+            recommendation = RECOMMENDATIONS[0]
+        return {"Rent Cost": rent_cost, "Buy Cost": buy_cost, "Recommendation": recommendation}
+
+    def _sweep_side(self, factor, values, side, previous):
+        """Costs of one side along a sweep, reusing the points of the previous sweep where possible."""
+        if factor not in SIDE_INPUTS[side]:
+            # The side does not depend on the swept factor, so it is flat at the current cost
+            if previous is not None and len(previous[1]) == len(values):
+                return previous[1]
+            return np.full(len(values), self.get(side))
+
+        start = 0
+        costs = np.empty(len(values))
+        if previous is not None:
+            old_values, old_costs = previous
+            # np.arange with the same start and step reproduces the same leading points
+            start = min(len(old_values), len(values))
+            if not np.array_equal(old_values[:start], values[:start]):
+                start = 0
+            elif start == len(values) == len(old_values):
+                return old_costs
+            costs[:start] = old_costs[:start]
+        if start < len(values):
+            self.recomputed += 1
+            costs[start:] = rounded_costs(**{**self.inputs, factor: values[start:]}, sides=(side,))[side]
+        return costs
+
+    def curve(self, factor):
+        """
+        Compute one sensitivity sweep, recomputing only the sides an update affected.
+
+        :param factor: Input swept by the curve, a key of sensitivity_grid.sensitivity_factors
+        :return: Tuple of (values, rent costs, buy costs) arrays
+        """
+        factors = sensitivity_factors(self.values)
+        if factor not in factors:
+            raise ValueError(f"Unknown factor: {factor}")
+        cached = self.sweeps.get(factor)
+        stale = {side: "all" for side in COST_COLUMNS} if cached is None else self.stale_sweeps.pop(factor, {})
+        if not stale:
+            return cached
+
+        start, stop, step = factors[factor]
+        values = np.arange(start, stop + step, step)
+        sides = {}
+        for position, side in enumerate(COST_COLUMNS, start=1):
+            # Sides untouched by the update, or whose sweep only moved its range, keep their points
+            reuse = cached is not None and stale.get(side, "range") == "range"
+            sides[side] = self._sweep_side(factor, values, side, (cached[0], cached[position]) if reuse else None)
+        self.sweeps[factor] = (values, sides["Rent Cost"], sides["Buy Cost"])
+        return self.sweeps[factor]
+
+    def sensitivity_curves(self):
+        """
+        Compute every one-at-a-time sensitivity sweep, reusing what an update did not affect.
+
+        :return: Dictionary of factor name to (values, rent costs, buy costs) arrays, like sensitivity_grid.sensitivity_curves
+        """
+        return {factor: self.curve(factor) for factor in sensitivity_factors(self.values)}
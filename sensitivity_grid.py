@@ -0,0 +1,194 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from instrumentation import timed
+from batch_calculator import INPUT_NAMES, complete_inputs, compare_rent_vs_buy_batch
+
+# Number of grid points evaluated per vectorized chunk
+DEFAULT_CHUNK_SIZE = 250000
+
+# Workbook columns that vary together when a grid axis runs over the cities of the dataset
+CITY_AXIS_COLUMNS = {
+    "monthly_rent": "Rent per Month",
+    "home_price": "Buy Apartment Price Total",
+    "mortgage_rate": "Mortgage Intrest Rate"
+}
+
+def _normalize_axes(axes):
+    """Validate grid axes and return (factor names, value arrays) per axis."""
+    normalized = []
+    for key, values in axes.items():
+        # A tuple key zips several factors into one axis, e.g. rent, price and rate per city
+        factors = key if isinstance(key, tuple) else (key,)
+        columns = values if isinstance(key, tuple) else (values,)
+        columns = tuple(np.asarray(column, dtype=float).ravel() for column in columns)
+
+        for factor in factors:
+            if factor not in INPUT_NAMES:
+                raise ValueError(f"Unknown factor: {factor}")
+        if len(factors) != len(columns) or len({len(column) for column in columns}) != 1:
+            raise ValueError(f"Axis {key} needs one equally long array per factor.")
+        normalized.append((factors, columns))
+    return normalized
+
+def _evaluate_chunk(base_inputs, axes, shape, start, stop):
+    """Evaluate grid points start..stop of the flattened grid in one vectorized pass."""
+    inputs = dict(base_inputs)
+    positions = np.unravel_index(np.arange(start, stop), shape)
+    for (factors, columns), position in zip(axes, positions):
+        for factor, column in zip(factors, columns):
+            inputs[factor] = column[position]
+
+    result = compare_rent_vs_buy_batch(**inputs)
+    return start, result["Rent Cost"], result["Buy Cost"], result["Recommendation Code"]
+
+@timed("calculation.grid")
+def evaluate_sensitivity_grid(base_inputs, axes, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=None):
+    """
+    Evaluate rent and buy costs over a full N-dimensional grid of input factors.
+
+    The flattened grid is split into chunks that are evaluated vectorized, fanned out
+    across a process pool when there is more than one chunk.
+
+    :param base_inputs: Dictionary of compare_rent_vs_buy arguments held fixed for factors not on an axis
+    :param axes: Ordered dictionary of factor name to grid values; a tuple of factor names maps to a tuple of arrays that vary together
+    :param chunk_size: Number of grid points per vectorized evaluation
+    :param max_workers: Number of worker processes (defaults to the CPU count; 1 evaluates in this process)
+    :return: Result cube dictionary with "axes" and "Rent Cost", "Buy Cost" and "Recommendation Code" arrays shaped like the grid
+    """
+    normalized = _normalize_axes(axes)
+    shape = tuple(len(columns[0]) for _, columns in normalized)
+    total = int(np.prod(shape))
+
+    # Fixed inputs are scalars; axis values are filled in per chunk
+    axis_factors = {factor for factors, _ in normalized for factor in factors}
+    inputs = {}
+    for name, value in complete_inputs({**base_inputs, **{factor: 0.0 for factor in axis_factors}}).items():
+        if name in axis_factors:
+            continue
+        if np.ndim(value) != 0:
+            raise ValueError(f"Input {name} must be a scalar or a grid axis.")
+        inputs[name] = float(value)
+
+    rent_cost = np.empty(total)
+    buy_cost = np.empty(total)
+    recommendation = np.empty(total, dtype=np.int8)
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+
+    def store(chunk):
+        start, rent, buy, code = chunk
+        stop = start + len(rent)
+        rent_cost[start:stop], buy_cost[start:stop], recommendation[start:stop] = rent, buy, code
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(bounds) <= 1:
+        for start, stop in bounds:
+            store(_evaluate_chunk(inputs, normalized, shape, start, stop))
+    else:
+        workers = min(workers, len(bounds))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep only a couple of chunks per worker in flight so finished results never pile up
+            pending = set()
+            for start, stop in bounds:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        store(future.result())
+                pending.add(executor.submit(_evaluate_chunk, inputs, normalized, shape, start, stop))
+            for future in pending:
+                store(future.result())
+
+    return {
+        "axes": {key: (values if isinstance(key, tuple) else columns[0]) for (key, values), (_, columns) in zip(axes.items(), normalized)},
+        "Rent Cost": rent_cost.reshape(shape),
+        "Buy Cost": buy_cost.reshape(shape),
+        "Recommendation Code": recommendation.reshape(shape)
+    }
+
+def city_axis(data):
+    """
+    Build a grid axis that runs over every row of the Rent & Buy dataset.
+
+    :param data: DataFrame loaded from "Random Cities in USA (Rent & Buy).xlsx"
+    :return: (axis key, axis values) pair to use as an entry of the axes dictionary
+    """
+    return tuple(CITY_AXIS_COLUMNS), tuple(np.asarray(data[column], dtype=float) for column in CITY_AXIS_COLUMNS.values())
+
+def slice_cube(cube, fixed):
+    """
+    Select a sub-cube by fixing some axes at given positions.
+
+    :param cube: Result cube returned by evaluate_sensitivity_grid
+    :param fixed: Dictionary of axis key to integer position along that axis
+    :return: Result cube without the fixed axes
+    """
+    keys = list(cube["axes"])
+    selector = tuple(fixed.get(key, slice(None)) for key in keys)
+    for key in fixed:
+        if key not in cube["axes"]:
+            raise KeyError(f"Unknown axis: {key}")
+
+    return {
+        "axes": {key: values for key, values in cube["axes"].items() if key not in fixed},
+        "Rent Cost": cube["Rent Cost"][selector],
+        "Buy Cost": cube["Buy Cost"][selector],
+        "Recommendation Code": cube["Recommendation Code"][selector]
+    }
+
+def cube_to_frame(cube):
+    """
+    Flatten a result cube into a long table with one row per grid point.
+
+    :param cube: Result cube returned by evaluate_sensitivity_grid
+    :return: DataFrame with one column per factor and the result columns
+    """
+    import pandas as pd
+
+    shape = cube["Rent Cost"].shape
+    positions = np.unravel_index(np.arange(int(np.prod(shape))), shape)
+    columns = {}
+    for (key, values), position in zip(cube["axes"].items(), positions):
+        if isinstance(key, tuple):
+            for factor, column in zip(key, values):
+                columns[factor] = np.asarray(column)[position]
+        else:
+            columns[key] = np.asarray(values)[position]
+
+    for name in ("Rent Cost", "Buy Cost", "Recommendation Code"):
+        columns[name] = cube[name].ravel()
+    return pd.DataFrame(columns)
+
+def sensitivity_factors(base_inputs):
+    """
+    Define the one-at-a-time sensitivity sweeps drawn by plot_sensitivity_analysis.
+
+    :param base_inputs: Dictionary of compare_rent_vs_buy arguments
+    :return: Dictionary of factor name to (start, stop, step)
+    """
+    return {
+        "length_of_stay": (1, base_inputs["length_of_stay"], 1),
+        "monthly_rent": (0, base_inputs["monthly_rent"], 100),
+        "home_price": (0, base_inputs["home_price"], 1000),
+        "down_payment": (0, base_inputs["down_payment"], 1000),
+        "mortgage_rate": (0, base_inputs["mortgage_rate"], 0.5),
+        "investment_interest_rate": (0, base_inputs["investment_interest_rate"], 0.5)
+    }
+
+@timed("calculation.sensitivity")
+def sensitivity_curves(base_inputs):
+    """
+    Compute the rent and buy cost curves of every one-at-a-time sensitivity sweep.
+
+    Each sweep is a single vectorized evaluation instead of one scalar call per point.
+
+    :param base_inputs: Dictionary of compare_rent_vs_buy arguments (extra keys such as "city" are ignored)
+    :return: Dictionary of factor name to (values, rent costs, buy costs) arrays
+    """
+    inputs = complete_inputs(base_inputs)
+    curves = {}
+    for factor, (start, stop, step) in sensitivity_factors(base_inputs).items():
+        # Generate a range of values for the current factor
+        values = np.arange(start, stop + step, step)
+        result = compare_rent_vs_buy_batch(**{**inputs, factor: values})
+        curves[factor] = (values, result["Rent Cost"], result["Buy Cost"])
+    return curves
@@ -0,0 +1,460 @@
+import argparse
+import asyncio
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+import numpy as np
+from batch_calculator import INPUT_DEFAULTS, INPUT_FALLBACKS, INPUT_NAMES, RECOMMENDATIONS, compare_rent_vs_buy_batch
+from break_even import solve_break_even
+from city_index import build_city_index, lookup_city
+from data_cache import read_excel_cached
+from memo import ResultCache, normalize_key
+from quality_of_life import load_data, rank_quality_of_life
+
+# Datasets loaded once when the service starts
+RENT_AND_BUY_FILE = "data/Random Cities in USA (Rent & Buy).xlsx"
+QUALITY_OF_LIFE_FILE = "data/Random Cities in USA (Quality of Life Index).xlsx"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1 << 20
+
+# Micro-batching: concurrent compare requests arriving within BATCH_DELAY seconds share one evaluation
+DEFAULT_BATCH_DELAY = 0.002
+DEFAULT_MAX_BATCH_SIZE = 4096
+
+# Number of compare results remembered for repeated scenarios
+DEFAULT_CACHE_SIZE = 65536
+
+# Inputs taken from the city data when a request names a city instead of giving them
+CITY_INPUTS = ("monthly_rent", "home_price", "mortgage_rate")
+
+STATUS_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+class ServiceError(Exception):
+    """Error reported to the client as a JSON body with an HTTP status code."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _json_value(value):
+    """Convert NumPy scalars to JSON values, mapping NaN and infinities to null."""
+    if isinstance(value, (np.integer, np.bool_)):
+        return value.item()
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+def _number(payload, name):
+    """Read one numeric field of a request body."""
+    value = payload[name]
+    # Python's json module accepts the non-standard NaN and Infinity tokens, so check for them too
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ServiceError(400, f"Input {name} must be a finite number.")
+    return float(value)
+
+def compare_scenarios(scenarios):
+    """
+    Evaluate many complete compare_rent_vs_buy scenarios in one vectorized call.
+
+    :param scenarios: List of dictionaries with a float for every compare_rent_vs_buy argument
+    :return: List of result dictionaries shaped like compare_rent_vs_buy's (costs are None where undefined)
+    """
+    inputs = {name: np.array([scenario[name] for scenario in scenarios]) for name in INPUT_DEFAULTS}
+    for name, fallback in INPUT_FALLBACKS.items():
+        inputs[name] = np.array([scenario.get(name, scenario[fallback]) for scenario in scenarios])
+    result = compare_rent_vs_buy_batch(**inputs)
+    return [
+        {"Rent Cost": _json_value(rent), "Buy Cost": _json_value(buy), "Recommendation": RECOMMENDATIONS[code]}
+        for rent, buy, code in zip(result["Rent Cost"], result["Buy Cost"], result["Recommendation Code"])
+    ]
+
+class MicroBatcher:
+    """
+    Merge items submitted concurrently into batches evaluated by one function call.
+
+    The first item of a batch starts a short timer; everything submitted before it fires
+    (or before the batch is full) is evaluated together in the executor.
+    """
+
+    def __init__(self, evaluate, executor=None, max_delay=DEFAULT_BATCH_DELAY, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        """
+        :param evaluate: Function mapping a list of items to a list of results in the same order
+        :param executor: Executor running evaluate (None uses the event loop's default executor)
+        :param max_delay: Seconds to wait for more items after the first one of a batch
+        :param max_batch_size: Number of items that triggers an immediate evaluation
+        """
+        self.evaluate = evaluate
+        self.executor = executor
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.items = 0
+        self._pending = []
+        self._timer = None
+        # The event loop only keeps weak references to tasks, so running batches are held here
+        self._tasks = set()
+
+    async def submit(self, item):
+        """Queue one item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        """Start evaluating every pending item as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._run(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def drain(self):
+        """Evaluate the pending items and wait for every running batch to finish."""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, pending):
+        """Evaluate one batch in the executor and resolve its futures."""
+        self.batches += 1
+        self.items += len(pending)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.evaluate, [item for item, _ in pending])
+        except Exception as error:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+class RentOrBuyService:
+    """
+    Asynchronous HTTP/JSON service for rent vs. buy comparison, break-even, quality of life and city lookup.
+
+    Endpoints:
+        GET  /health
+        GET  /lookup?city=...&location=...&bedrooms=...   (no query lists the cities)
+        GET  /quality-of-life?city=...                     (no query ranks every city)
+        POST /compare      one scenario or a list of scenarios
+        POST /break-even   a scenario plus "factor" and optional "lower" and "upper"
+
+    A scenario gives every compare_rent_vs_buy argument, or "city", "location" and "bedrooms"
+    in place of monthly_rent, home_price and mortgage_rate.
+    """
+
+    def __init__(self, rent_and_buy_file=RENT_AND_BUY_FILE, quality_of_life_file=QUALITY_OF_LIFE_FILE, max_workers=None,
+                 batch_delay=DEFAULT_BATCH_DELAY, max_batch_size=DEFAULT_MAX_BATCH_SIZE, cache_size=DEFAULT_CACHE_SIZE, store=None):
+        """
+        :param rent_and_buy_file: Path of the Rent & Buy workbook
+        :param quality_of_life_file: Path of the Quality of Life workbook
+        :param max_workers: Number of worker threads for the numeric work
+        :param batch_delay: Seconds a compare request waits for others to share its evaluation
+        :param max_batch_size: Largest number of scenarios evaluated together
+        :param cache_size: Number of compare results remembered for repeated scenarios
+        :param store: memo.DiskStore persisting compare results across restarts
+        """
+        self.rent_and_buy_file = rent_and_buy_file
+        self.quality_of_life_file = quality_of_life_file
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rent-or-buy")
+        self.batcher = MicroBatcher(compare_scenarios, self.executor, batch_delay, max_batch_size)
+        self.results = ResultCache(max_size=cache_size, store=store, namespace="compare")
+        self.city_index = None
+        self.quality_ranking = None
+        self.server = None
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/lookup"): self.lookup,
+            ("GET", "/quality-of-life"): self.quality_of_life,
+            ("POST", "/compare"): self.compare,
+            ("POST", "/break-even"): self.break_even
+        }
+
+    def load(self):
+        """Load the datasets and build the lookup index and quality of life ranking."""
+        self.city_index = build_city_index(read_excel_cached(self.rent_and_buy_file))
+        ranking = rank_quality_of_life(load_data(self.quality_of_life_file))
+        self.quality_ranking = [{name: _json_value(value) for name, value in row.items()} for row in ranking.to_dict("records")]
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Load the datasets and start listening.
+
+        :param host: Interface to bind
+        :param port: Port to bind (0 picks a free port)
+        :return: The bound (host, port)
+        """
+        if self.city_index is None:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.load)
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """Stop listening, finish the running batches and shut the worker pool down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        await self.batcher.drain()
+        self.executor.shutdown(wait=False)
+
+    async def dispatch(self, method, path, body=b""):
+        """
+        Route one request to its endpoint.
+
+        :param method: HTTP method
+        :param path: Request target including the query string
+        :param body: Raw request body
+        :return: (status code, JSON-serializable payload)
+        """
+        target = urlsplit(path)
+        handler = self.routes.get((method, target.path))
+        if handler is None:
+            if any(route_path == target.path for _, route_path in self.routes):
+                return 405, {"error": f"Method {method} not allowed for {target.path}"}
+            return 404, {"error": f"Unknown endpoint: {target.path}"}
+
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            return 400, {"error": "Request body is not valid JSON."}
+        try:
+            return 200, await handler(dict(parse_qsl(target.query)), payload)
+        except ServiceError as error:
+            return error.status, {"error": error.message}
+
+    def _scenario(self, payload, solve_for=None):
+        """Turn one request body into complete calculator inputs, checking every input but the solved-for one."""
+        if not isinstance(payload, dict):
+            raise ServiceError(400, "A scenario must be a JSON object.")
+        scenario = dict(payload)
+        if "city" in scenario and not all(name in scenario for name in CITY_INPUTS):
+            city_data = lookup_city(self.city_index, scenario.get("city"), scenario.get("location"), scenario.get("bedrooms"))
+            if city_data is None:
+                raise ServiceError(404, "No data found for the given inputs.")
+            # Inputs the request gives itself take precedence over the city data
+            for name, value in city_data.items():
+                scenario.setdefault(name, value)
+
+        inputs = {}
+        for name, default in INPUT_DEFAULTS.items():
+            if name in scenario:
+                inputs[name] = _number(scenario, name)
+            elif default is not None:
+                inputs[name] = default
+            else:
+                raise ServiceError(400, f"Missing required input: {name}")
+        for name in INPUT_FALLBACKS:
+            if name in scenario:
+                inputs[name] = _number(scenario, name)
+        if solve_for != "length_of_stay" and inputs["length_of_stay"] <= 0:
+            raise ServiceError(400, "Input length_of_stay must be positive.")
+        return inputs
+
+    async def health(self, query, payload):
+        """Report that the service is up."""
+        return {"status": "ok", "batches": self.batcher.batches, "scenarios": self.batcher.items, "cache": self.results.stats()}
+
+    async def lookup(self, query, payload):
+        """Look up rent, home price and mortgage rate for a city, location and bedroom count."""
+        if not query:
+            return {"cities": self.city_index["cities"]}
+        city_data = lookup_city(self.city_index, query.get("city"), query.get("location"), query.get("bedrooms"))
+        if city_data is None:
+            raise ServiceError(404, "No data found for the given inputs.")
+        return city_data
+
+    async def quality_of_life(self, query, payload):
+        """Return the quality of life scores of one city, or the ranking of every city."""
+        if "city" not in query:
+            return self.quality_ranking
+        for row in self.quality_ranking:
+            if row["City"] == query["city"].strip():
+                return row
+        raise ServiceError(404, f"City '{query['city']}' not found in dataset.")
+
+    async def compare(self, query, payload):
+        """Compare renting and buying for one scenario or a list of scenarios."""
+        if isinstance(payload, list):
+            scenarios = [self._scenario(scenario) for scenario in payload]
+            return await asyncio.gather(*(self._compare_one(scenario) for scenario in scenarios))
+        return await self._compare_one(self._scenario(payload))
+
+    async def _compare_one(self, scenario):
+        """Serve a repeated scenario from the result cache, otherwise evaluate it in the next batch."""
+        key = normalize_key(scenario)
+        result = self.results.get(key)
+        if result is None:
+            result = await self.batcher.submit(scenario)
+            if result["Rent Cost"] is None or result["Buy Cost"] is None:
+                raise ServiceError(400, "The inputs give no finite costs.")
+            self.results.set(key, result)
+        return dict(result)
+
+    async def break_even(self, query, payload):
+        """Solve for the value of one factor at which renting and buying cost the same."""
+        if not isinstance(payload, dict) or "factor" not in payload:
+            raise ServiceError(400, "Missing factor.")
+        factor = payload["factor"]
+        if factor not in INPUT_NAMES:
+            raise ServiceError(400, f"Unknown factor: {factor}")
+        inputs = self._scenario({**payload, **({} if factor in payload else {factor: 0.0})}, solve_for=factor)
+        bounds = {name: _number(payload, name) for name in ("lower", "upper") if name in payload}
+
+        loop = asyncio.get_running_loop()
+        root = await loop.run_in_executor(self.executor, lambda: solve_break_even(inputs, factor, **bounds))
+        return {"factor": factor, "Break Even": _json_value(float(root))}
+
+    async def _handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line."}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Invalid Content-Length header."}, keep_alive=False)
+                    break
+                if length > MAX_BODY_SIZE:
+                    await self._respond(writer, 413, {"error": "Request body too large."}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except Exception as error:
+                    status, payload = 500, {"error": str(error)}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        """Write one JSON response."""
+        try:
+            # Strict JSON: a NaN or infinity that slipped through is a server error, not a bare NaN token
+            body = json.dumps(payload, allow_nan=False).encode()
+        except ValueError as error:
+            status, body = 500, json.dumps({"error": str(error)}).encode()
+        head = (
+            f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+class ServiceClient:
+    """Minimal asynchronous HTTP/JSON client for the service, e.g. for tests against an in-process server."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+
+    async def request(self, method, path, payload=None):
+        """
+        Send one request on a fresh connection.
+
+        :param method: HTTP method
+        :param path: Request target including the query string
+        :param payload: JSON-serializable request body, if any
+        :return: (status code, decoded JSON response)
+        """
+        body = b"" if payload is None else json.dumps(payload).encode()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            head = (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode("latin-1") + body)
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            return status, json.loads(await reader.readexactly(length))
+        finally:
+            writer.close()
+
+    async def get(self, path):
+        """Send a GET request."""
+        return await self.request("GET", path)
+
+    async def post(self, path, payload):
+        """Send a POST request with a JSON body."""
+        return await self.request("POST", path, payload)
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    """Run the service until cancelled."""
+    service = RentOrBuyService(**options)
+    host, port = await service.start(host, port)
+    print(f"Serving on http://{host}:{port}")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Rent or Buy HTTP/JSON service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="Worker threads for the numeric work")
+    parser.add_argument("--batch-delay", type=float, default=DEFAULT_BATCH_DELAY, help="Seconds to wait for requests to batch together")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, max_workers=args.workers, batch_delay=args.batch_delay))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
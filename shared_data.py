@@ -0,0 +1,259 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from instrumentation import count, timed
+
+# Byte alignment of every array in the shared block
+ALIGNMENT = 64
+
+# Code of a missing value in an interned text column
+MISSING_CODE = -1
+
+# Source files of the tables shared by load_shared_tables
+RENT_AND_BUY_FILE = "data/Random Cities in USA (Rent & Buy).xlsx"
+QUALITY_OF_LIFE_FILE = "data/Random Cities in USA (Quality of Life Index).xlsx"
+
+def _is_missing(value):
+    """Whether a cell of a text column is empty (None, NaN or pandas' NA)."""
+    return value is None or value != value or type(value).__name__ == "NAType"
+
+def _column_array(values, strings):
+    """Convert one column to (kind, array): numbers as they are, text as codes into the intern table."""
+    values = np.asarray(values)
+    if values.dtype.kind in "biufcmM":
+        return "array", values
+    if values.dtype.kind == "U":
+        values = values.astype(object)
+
+    cells = values.ravel()
+    if all(isinstance(value, str) or _is_missing(value) for value in cells):
+        codes = np.fromiter((MISSING_CODE if not isinstance(value, str) else strings.setdefault(value, len(strings))
+                             for value in cells), dtype=np.int32, count=len(cells))
+        return "text", codes.reshape(values.shape)
+    try:
+        # Numbers with empty placeholders, such as the Quality of Life columns after "?" is replaced
+        return "array", np.array([np.nan if _is_missing(value) else value for value in cells], dtype=float).reshape(values.shape)
+    except (TypeError, ValueError):
+        raise TypeError("Shared columns must hold numbers or text, not mixed values") from None
+
+def _open_block(name):
+    """Attach to an existing block without registering it with this process's resource tracker."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before Python 3.13 attaching registers the block for cleanup at exit. Pool workers share the
+    # owner's tracker, where unregistering would also drop the owner's registration, so skip it instead
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+class SharedTables:
+    """
+    Read-only tables of NumPy columns packed into one shared memory block.
+
+    The owner loads the tables once with create(); other processes attach() with the small
+    handle and see the same memory without copying or unpickling any column, so the total
+    footprint does not grow with the number of workers. Text columns are stored as int32
+    codes into one intern table of unique strings (city names, locations, labels), kept in
+    the block as UTF-8.
+
+    with SharedTables.create({"cities": frame}) as tables:
+        with worker_pool(tables) as executor:
+            ...  # workers call worker_tables()["cities"]
+    """
+
+    def __init__(self, memory, layout, owner=False):
+        """
+        :param memory: SharedMemory block holding the columns and the intern table
+        :param layout: Dictionary describing where each column lives in the block (see create)
+        :param owner: Whether this process created the block and unlinks it on exit
+        """
+        self.memory = memory
+        self.layout = layout
+        self.owner = owner
+
+        def view(dtype, shape, offset):
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf, offset=offset)
+            array.flags.writeable = False
+            return array
+
+        self.tables = {
+            table: {column: view(dtype, shape, offset) for column, (kind, dtype, shape, offset) in columns.items()}
+            for table, columns in layout["tables"].items()
+        }
+        offsets = view(np.int64, (layout["strings"]["count"] + 1,), layout["strings"]["offsets"])
+        blob = bytes(memory.buf[layout["strings"]["blob"]:layout["strings"]["blob"] + int(offsets[-1])])
+        self.strings = tuple(blob[start:stop].decode("utf-8") for start, stop in zip(offsets[:-1], offsets[1:]))
+        self._codes = None
+
+    @classmethod
+    @timed("data.share")
+    def create(cls, tables):
+        """
+        Copy tables into a new shared memory block.
+
+        :param tables: Dictionary of table name to DataFrame or mapping of column name to array-like
+        :return: SharedTables owning the block
+        """
+        strings = {}
+        arrays = {table: {str(column): _column_array(values[column], strings) for column in values} for table, values in tables.items()}
+        encoded = [string.encode("utf-8") for string in strings]
+        string_offsets = np.concatenate([[0], np.cumsum([len(string) for string in encoded], dtype=np.int64)]).astype(np.int64)
+
+        size = 0
+        def place(nbytes):
+            nonlocal size
+            offset = -(-size // ALIGNMENT) * ALIGNMENT
+            size = offset + nbytes
+            return offset
+
+        layout = {"tables": {}, "strings": {"count": len(encoded), "offsets": place(string_offsets.nbytes),
+                                            "blob": place(int(string_offsets[-1]))}}
+        for table, columns in arrays.items():
+            layout["tables"][table] = {column: (kind, values.dtype.str, values.shape, place(values.nbytes))
+                                       for column, (kind, values) in columns.items()}
+
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            memory.buf[layout["strings"]["offsets"]:layout["strings"]["offsets"] + string_offsets.nbytes] = string_offsets.tobytes()
+            memory.buf[layout["strings"]["blob"]:layout["strings"]["blob"] + int(string_offsets[-1])] = b"".join(encoded)
+            for table, columns in arrays.items():
+                for column, (_, values) in columns.items():
+                    _, dtype, shape, offset = layout["tables"][table][column]
+                    np.ndarray(shape, dtype=values.dtype, buffer=memory.buf, offset=offset)[...] = values
+        except BaseException:
+            memory.close()
+            memory.unlink()
+            raise
+        count("data.shared_bytes", size)
+        return cls(memory, layout, owner=True)
+
+    @classmethod
+    def attach(cls, handle):
+        """
+        Attach to tables created by another process, without copying them.
+
+        :param handle: The owner's handle attribute
+        :return: SharedTables viewing the owner's block
+        """
+        name, layout = handle
+        return cls(_open_block(name), layout)
+
+    @property
+    def handle(self):
+        """Small picklable (block name, layout) pair for attach()."""
+        return self.memory.name, self.layout
+
+    def __getitem__(self, table):
+        """Dictionary of column name to read-only array (text columns as intern codes)."""
+        return self.tables[table]
+
+    def text_columns(self, table):
+        """Names of a table's interned text columns."""
+        return [column for column, (kind, *_) in self.layout["tables"][table].items() if kind == "text"]
+
+    def code(self, string):
+        """
+        Intern code of a string, for comparing against text columns.
+
+        :param string: String such as a city name
+        :return: Code, or MISSING_CODE if the string does not occur in any table
+        """
+        if self._codes is None:
+            self._codes = {value: code for code, value in enumerate(self.strings)}
+        return self._codes.get(string, MISSING_CODE)
+
+    def decode(self, codes):
+        """
+        Strings of intern codes.
+
+        :param codes: Array of codes
+        :return: Object array of strings (None where missing)
+        """
+        codes = np.asarray(codes)
+        lookup = np.array(self.strings + (None,), dtype=object)
+        return lookup[np.where(codes < 0, len(self.strings), codes)]
+
+    def frame(self, table):
+        """
+        Copy one table into a DataFrame with decoded text columns.
+
+        :param table: Table name
+        :return: DataFrame
+        """
+        import pandas as pd
+
+        text = set(self.text_columns(table))
+        return pd.DataFrame({column: self.decode(values) if column in text else np.array(values)
+                             for column, values in self.tables[table].items()})
+
+    def close(self):
+        """Detach from the block; the owner also frees it. Arrays taken from the tables must not be used afterwards."""
+        self.tables = {}
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+            self.owner = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+@timed("data.load")
+def load_shared_tables(rent_and_buy_file=RENT_AND_BUY_FILE, quality_of_life_file=QUALITY_OF_LIFE_FILE, dp04_file=None, oecd_file=None):
+    """
+    Load the city rent & buy table, the Quality of Life table, the DP04 long table and the OECD
+    growth store once into shared memory.
+
+    :param rent_and_buy_file: Path of the Rent & Buy workbook
+    :param quality_of_life_file: Path of the Quality of Life workbook
+    :param dp04_file: Path of the DP04 export (defaults to dp04.DP04_FILE)
+    :param oecd_file: Path of the OECD growth rates (defaults to oecd.OECD_GROWTH_FILE)
+    :return: SharedTables with "cities", "quality_of_life", "dp04" and "oecd" tables; the OECD
+             table holds the store's "countries", "names", "years", "growth" and "last" arrays
+    """
+    from data_cache import read_excel_cached
+    from dp04 import DP04_FILE, load_dp04
+    from oecd import OECD_GROWTH_FILE, load_growth_store
+    from quality_of_life import load_data
+
+    store = load_growth_store(oecd_file or OECD_GROWTH_FILE)
+    return SharedTables.create({
+        "cities": read_excel_cached(rent_and_buy_file),
+        "quality_of_life": load_data(quality_of_life_file),
+        "dp04": load_dp04(dp04_file or DP04_FILE),
+        "oecd": {name: store[name] for name in ("countries", "names", "years", "growth", "last")}
+    })
+
+# Tables attached by this worker process (set by the worker_pool initializer)
+_worker_tables = None
+
+def _attach_worker(handle):
+    """Pool initializer attaching the shared tables once per worker."""
+    global _worker_tables
+    _worker_tables = SharedTables.attach(handle)
+
+def worker_tables():
+    """
+    Shared tables attached by the current worker process.
+
+    :return: SharedTables
+    """
+    if _worker_tables is None:
+        raise RuntimeError("No shared tables are attached in this process; start it with worker_pool")
+    return _worker_tables
+
+def worker_pool(tables, max_workers=None):
+    """
+    Process pool whose workers attach to shared tables once at start-up.
+
+    :param tables: SharedTables created in this process
+    :param max_workers: Number of worker processes (defaults to the CPU count)
+    :return: ProcessPoolExecutor; tasks read the tables through worker_tables()
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_worker, initargs=(tables.handle,))
@@ -0,0 +1,170 @@
+import numpy as np
+from instrumentation import count, timed
+from batch_calculator import RECOMMENDATION_RENT, complete_inputs, compare_rent_vs_buy_batch, monthly_mortgage_payment
+from break_even import cost_difference
+from sensitivity_grid import CITY_AXIS_COLUMNS
+
+# Holding periods searched by default (years)
+DEFAULT_STAY_RANGE = (1, 30)
+
+# Spacing of the first, coarse holding period grid (years); each refinement level is this many times finer
+COARSE_STEP = 1.0
+REFINEMENT = 12
+
+# Grid points refined at each level; budget limits put kinks in the objective, so the optimum
+# can lie next to the second or third best point rather than the best one
+CANDIDATES = 3
+
+# What the search minimizes: buy cost minus rent cost over the whole stay, or per year of the stay
+OBJECTIVES = ("total", "annual")
+
+# Keyword arguments of optimal_strategies other than base_inputs
+SEARCH_ARGUMENTS = ("min_down_payment", "max_down_payment", "max_monthly_payment", "stay_range", "resolution", "objective")
+
+# Workbook columns identifying one row of the Rent & Buy dataset
+CITY_KEY_COLUMNS = ("City", "Location", "Number of Bedrooms")
+
+def down_payment_bounds(inputs, length_of_stay, min_down_payment=0.0, max_down_payment=None, max_monthly_payment=None):
+    """
+    Range of down payments allowed by the budget constraints.
+
+    The monthly outlay of buying is the mortgage payment plus the monthly share of property tax
+    and maintenance. The mortgage payment is proportional to the loan, so a monthly budget sets
+    the smallest down payment that keeps the outlay within it.
+
+    :param inputs: Dictionary of compare_rent_vs_buy arguments (scalars or arrays)
+    :param length_of_stay: Holding period(s) in years, broadcast against the inputs
+    :param min_down_payment: Smallest down payment to consider
+    :param max_down_payment: Cash available for the down payment (defaults to the home price)
+    :param max_monthly_payment: Largest monthly outlay of buying (no limit by default)
+    :return: Tuple of lowest and highest down payment arrays; the range is empty (lowest > highest) where buying is not affordable
+    """
+    home_price = inputs["home_price"]
+    lower = np.maximum(min_down_payment, 0.0)
+    upper = home_price if max_down_payment is None else np.minimum(max_down_payment, home_price)
+    if max_monthly_payment is not None:
+        payment_per_dollar = monthly_mortgage_payment(1.0, inputs["mortgage_rate"], 12 * np.asarray(length_of_stay, dtype=float))
+        running_costs = home_price * (inputs["property_tax_rate"] + inputs["maintenance_rate"]) / 1200
+        with np.errstate(divide="ignore", invalid="ignore"):
+            largest_loan = (max_monthly_payment - running_costs) / payment_per_dollar
+        lower = np.maximum(lower, home_price - largest_loan)
+    return np.broadcast_arrays(lower, upper)
+
+def _best_down_payments(inputs, length_of_stay, objective, constraints):
+    """Cheapest feasible down payment and its objective value for every holding period of a grid."""
+    lower, upper = down_payment_bounds(inputs, length_of_stay, **constraints)
+    scenarios = {**inputs, "length_of_stay": length_of_stay}
+
+    # Rent minus buy cost is linear in the down payment, so the best down payment is an end of the range
+    values = []
+    for down_payment in (lower, upper):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            value = -cost_difference({**scenarios, "down_payment": down_payment})
+        values.append(value / length_of_stay if objective == "annual" else value)
+
+    down_payment = np.where(values[1] < values[0], upper, lower)
+    value = np.minimum(values[0], values[1])
+    return down_payment, np.where((lower <= upper) & np.isfinite(value), value, np.inf)
+
+@timed("calculation.optimal_strategy")
+def optimal_strategies(base_inputs, min_down_payment=0.0, max_down_payment=None, max_monthly_payment=None,
+                       stay_range=DEFAULT_STAY_RANGE, resolution=1 / 12, objective="total"):
+    """
+    Find the down payment and holding period that make buying cheapest relative to renting, for many scenarios at once.
+
+    The holding period is searched coarse to fine: a yearly grid over stay_range for every scenario,
+    then ever finer grids around each scenario's best few points until the spacing reaches the
+    resolution. For each holding period the best down payment is solved exactly, since the cost
+    difference is linear in it. Scenarios that cannot afford to buy under the constraints get NaN.
+
+    :param base_inputs: Dictionary of compare_rent_vs_buy arguments; values may be arrays of scenarios
+                        (length_of_stay and down_payment are searched and may be left out)
+    :param min_down_payment: Smallest down payment to consider (scalar or per scenario)
+    :param max_down_payment: Cash available for the down payment (defaults to the home price)
+    :param max_monthly_payment: Largest monthly outlay of buying: mortgage payment, property tax and maintenance
+    :param stay_range: Shortest and longest holding period in years
+    :param resolution: Spacing of the final holding period grid in years (defaults to one month)
+    :param objective: "total" minimizes buy cost minus rent cost, "annual" the same per year of the stay
+    :return: Dictionary of "length_of_stay", "down_payment", "Rent Cost", "Buy Cost" and "Recommendation Code" arrays
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    min_stay, max_stay = stay_range
+    if not 0 < min_stay <= max_stay:
+        raise ValueError(f"Invalid holding period range: {stay_range}")
+
+    inputs = complete_inputs({"length_of_stay": min_stay, "down_payment": 0.0, **base_inputs})
+    shape = np.broadcast_shapes(*(values.shape for values in inputs.values()),
+                                np.shape(min_down_payment), np.shape(max_down_payment), np.shape(max_monthly_payment))
+    size = int(np.prod(shape))
+    # One row per scenario against a column per holding period of the grid
+    columns = {name: np.broadcast_to(values, shape).reshape(size, 1) for name, values in inputs.items()}
+    constraints = {
+        name: None if value is None else np.broadcast_to(np.asarray(value, dtype=float), shape).reshape(size, 1)
+        for name, value in (("min_down_payment", min_down_payment), ("max_down_payment", max_down_payment),
+                            ("max_monthly_payment", max_monthly_payment))
+    }
+
+    step = min(COARSE_STEP, max_stay - min_stay) or resolution
+    grid = np.minimum(np.arange(min_stay, max_stay + step / 2, step), max_stay)
+    stays = np.broadcast_to(grid, (size, len(grid)))
+    rows = np.arange(size)
+    evaluations = 0
+    while True:
+        down_payments, values = _best_down_payments(columns, stays, objective, constraints)
+        evaluations += stays.size
+        best = np.argmin(values, axis=1)
+        best_stay = stays[rows, best]
+        if step <= resolution:
+            break
+
+        # Search the neighbourhoods of the best points on a finer grid
+        candidates = np.argsort(values, axis=1, kind="stable")[:, :CANDIDATES]
+        finer = max(step / REFINEMENT, resolution)
+        offsets = finer * np.arange(-round(step / finer), round(step / finer) + 1)
+        centres = np.take_along_axis(stays, candidates, axis=1)
+        stays = np.clip(centres[:, :, np.newaxis] + offsets, min_stay, max_stay).reshape(size, -1)
+        step = finer
+    count("strategy.evaluations", evaluations)
+
+    feasible = np.isfinite(values[rows, best])
+    length_of_stay = np.where(feasible, best_stay, np.nan)
+    down_payment = np.where(feasible, down_payments[rows, best], np.nan)
+
+    result = {
+        "length_of_stay": length_of_stay,
+        "down_payment": down_payment,
+        "Rent Cost": np.full(size, np.nan),
+        "Buy Cost": np.full(size, np.nan),
+        # Renting is the only option where buying is not affordable
+        "Recommendation Code": np.full(size, RECOMMENDATION_RENT, dtype=np.int8)
+    }
+    if feasible.any():
+        scenarios = {name: values[feasible, 0] for name, values in columns.items()}
+        costs = compare_rent_vs_buy_batch(**{**scenarios, "length_of_stay": length_of_stay[feasible], "down_payment": down_payment[feasible]})
+        for name, values in costs.items():
+            result[name][feasible] = values
+    return {name: values.reshape(shape) for name, values in result.items()}
+
+def city_strategies(data, investment_interest_rate, **constraints):
+    """
+    Build the optimal-strategy table for every (City, Location, Number of Bedrooms) row of the dataset.
+
+    :param data: DataFrame loaded from "Random Cities in USA (Rent & Buy).xlsx"
+    :param investment_interest_rate: Annual investment interest (as percentage)
+    :param constraints: Budget constraints, rates and search settings passed on to optimal_strategies
+                        (e.g. max_down_payment=60000, max_monthly_payment=2500, objective="annual")
+    :return: DataFrame with the key columns, the best "length_of_stay" and "down_payment", and the
+             resulting "Rent Cost", "Buy Cost" and "Recommendation Code"
+    """
+    inputs = {argument: np.asarray(data[column], dtype=float) for argument, column in CITY_AXIS_COLUMNS.items()}
+    rates = {name: constraints.pop(name) for name in list(constraints) if name not in SEARCH_ARGUMENTS}
+    result = optimal_strategies({**inputs, "investment_interest_rate": investment_interest_rate, **rates}, **constraints)
+    return data.loc[:, list(CITY_KEY_COLUMNS)].reset_index(drop=True).assign(**result)
+
+# Print the strategy table for the dataset only when the script is executed directly, not on import
+if __name__ == "__main__":
+    import pandas as pd
+
+    data = pd.read_excel("data/Random Cities in USA (Rent & Buy).xlsx")
+    print(city_strategies(data, investment_interest_rate=4.0, max_down_payment=60000, max_monthly_payment=3000).to_string())
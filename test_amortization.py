@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from amortization import amortization_schedule, iter_amortization_schedule, remaining_balance
+from batch_calculator import monthly_mortgage_payment
+
+class TestAmortizationSchedule(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up a small portfolio with different terms and a zero-rate loan """
+        self.loan_amount = np.array([240000.0, 100000.0, 50000.0])
+        self.mortgage_rate = np.array([5.0, 0.0, 7.5])
+        self.num_payments = np.array([360, 120, 28])
+
+    def test_payments_match_calculator(self):
+        """ Test that each monthly payment equals the fixed payment used by the calculator """
+        schedule = amortization_schedule(self.loan_amount, self.mortgage_rate, self.num_payments)
+        expected = monthly_mortgage_payment(self.loan_amount, self.mortgage_rate, self.num_payments)
+
+        self.assertEqual(schedule["Payment"].shape, (3, 360))
+        for loan, months in enumerate(self.num_payments):
+            np.testing.assert_allclose(schedule["Payment"][loan, :months], expected[loan])
+            np.testing.assert_array_equal(schedule["Payment"][loan, months:], 0)
+
+    def test_principal_repays_loan(self):
+        """ Test that principal payments add up to the loan and the balance ends at zero """
+        schedule = amortization_schedule(self.loan_amount, self.mortgage_rate, self.num_payments)
+
+        np.testing.assert_allclose(schedule["Principal"].sum(axis=1), self.loan_amount)
+        np.testing.assert_allclose(schedule["Balance"][:, -1], 0, atol=1e-6)
+        np.testing.assert_array_equal(schedule["Interest"][1], 0)
+
+    def test_generator_matches_matrix(self):
+        """ Test that streaming months gives the same values as the full matrix """
+        schedule = amortization_schedule(self.loan_amount, self.mortgage_rate, self.num_payments)
+
+        for month in iter_amortization_schedule(self.loan_amount, self.mortgage_rate, self.num_payments):
+            column = month["Month"] - 1
+            for name in ("Payment", "Interest", "Principal", "Balance"):
+                np.testing.assert_allclose(month[name], schedule[name][:, column])
+
+    def test_remaining_balance(self):
+        """ Test the closed form balance at the start, midway and past the end of the term """
+        balance = remaining_balance(100000, 0.0, 120, np.array([0, 60, 500]))
+
+        np.testing.assert_allclose(balance, [100000, 50000, 0])
+
+    def test_invalid_term(self):
+        """ Test that loans without any payments are rejected """
+        with self.assertRaises(ValueError):
+            amortization_schedule(1000, 5.0, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+import pandas as pd
+from calculator import compare_rent_vs_buy
+from batch_calculator import (compare_rent_vs_buy_batch, compare_rent_vs_buy_frame, recommendation_labels, RECOMMENDATION_INVALID,
+                              RECOMMENDATIONS)
+
+class TestCompareRentVsBuyBatch(unittest.TestCase):
+
+    def setUp(self):
+        """ Build a reproducible set of random scenarios, including zero mortgage rates """
+        rng = np.random.default_rng(502)
+        size = 2000
+        self.scenarios = {
+            "length_of_stay": np.where(rng.random(size) < 0.5, rng.uniform(0.5, 30, size), rng.integers(1, 30, size)),
+            "monthly_rent": np.round(rng.uniform(100, 5000, size), 2),
+            "home_price": np.round(rng.uniform(50000, 2000000, size)),
+            "down_payment": np.round(rng.uniform(0, 200000, size)),
+            "mortgage_rate": np.where(rng.random(size) < 0.2, 0.0, np.round(rng.uniform(0.5, 12, size), 2)),
+            "investment_interest_rate": rng.uniform(0, 10, size),
+            "property_tax_rate": rng.uniform(0, 3, size),
+            "maintenance_rate": rng.uniform(0, 2, size),
+            "selling_cost_rate": rng.uniform(0, 10, size)
+        }
+
+    def test_matches_scalar_function(self):
+        """ Test that every batch result matches the scalar function to the cent """
+        result = compare_rent_vs_buy_batch(**self.scenarios)
+        labels = recommendation_labels(result["Recommendation Code"])
+
+        for i in range(len(self.scenarios["length_of_stay"])):
+            expected = compare_rent_vs_buy(**{name: float(values[i]) for name, values in self.scenarios.items()})
+            self.assertEqual(result["Rent Cost"][i], expected["Rent Cost"])
+            self.assertEqual(result["Buy Cost"][i], expected["Buy Cost"])
+            self.assertEqual(labels[i], expected["Recommendation"])
+
+    def test_rounding_edge_cases(self):
+        """ Test the cases from test_calculator where the costs are cents apart or equal """
+        result = compare_rent_vs_buy_batch(1, 1, np.array([117.70, 117.59, 117.65]), 0, 0, 0)
+
+        np.testing.assert_array_equal(result["Rent Cost"], [12, 12, 12])
+        np.testing.assert_array_equal(result["Buy Cost"], [12.01, 11.99, 12])
+        self.assertEqual(recommendation_labels(result["Recommendation Code"]), [RECOMMENDATIONS[1], RECOMMENDATIONS[2], RECOMMENDATIONS[0]])
+
+    def test_scalar_half_cent(self):
+        """ Test that all-scalar inputs on a half cent round like the scalar function """
+        result = compare_rent_vs_buy_batch(1, 0.015 / 12, 300000, 0, 5, 0)
+        expected = compare_rent_vs_buy(1, 0.015 / 12, 300000, 0, 5, 0)
+
+        self.assertEqual(result["Rent Cost"].shape, ())
+        self.assertEqual(float(result["Rent Cost"]), expected["Rent Cost"])
+        self.assertEqual(float(result["Buy Cost"]), expected["Buy Cost"])
+
+    def test_broadcasting(self):
+        """ Test that scalars broadcast against arrays and shapes are preserved """
+        result = compare_rent_vs_buy_batch(np.array([[1], [5]]), 1200, 300000, 60000, np.array([0.0, 5.0, 7.0]), 4.0)
+
+        self.assertEqual(result["Rent Cost"].shape, (2, 3))
+        expected = compare_rent_vs_buy(5, 1200, 300000, 60000, 7.0, 4.0)
+        self.assertEqual(result["Buy Cost"][1, 2], expected["Buy Cost"])
+
+    def test_frame_input(self):
+        """ Test DataFrame input with default rate columns """
+        frame = pd.DataFrame({name: self.scenarios[name][:50] for name in list(self.scenarios)[:6]})
+        result = compare_rent_vs_buy_frame(frame)
+        expected = compare_rent_vs_buy(**{name: float(frame[name].iloc[7]) for name in frame.columns})
+
+        self.assertEqual(result["Buy Cost"][7], expected["Buy Cost"])
+
+    def test_separate_appreciation_rate(self):
+        """ Test that an explicit appreciation rate matches the scalar function and defaults to the investment rate """
+        appreciation = np.random.default_rng(17).uniform(-5, 12, 2000)
+        result = compare_rent_vs_buy_batch(**self.scenarios, appreciation_rate=appreciation)
+        for i in range(0, 2000, 7):
+            expected = compare_rent_vs_buy(**{name: float(values[i]) for name, values in self.scenarios.items()}, appreciation_rate=float(appreciation[i]))
+            self.assertEqual(result["Buy Cost"][i], expected["Buy Cost"])
+
+        default = compare_rent_vs_buy_batch(**self.scenarios)
+        explicit = compare_rent_vs_buy_batch(**self.scenarios, appreciation_rate=self.scenarios["investment_interest_rate"])
+        np.testing.assert_array_equal(default["Buy Cost"], explicit["Buy Cost"])
+
+    def test_invalid_scenarios(self):
+        """ Test that scenarios without defined costs are marked invalid rather than either """
+        result = compare_rent_vs_buy_batch(np.array([0, 1]), 1000, 300000, 60000, 5.0, 4.0)
+
+        self.assertTrue(np.isnan(result["Buy Cost"][0]))
+        self.assertEqual(result["Recommendation Code"][0], RECOMMENDATION_INVALID)
+        self.assertEqual(recommendation_labels(result["Recommendation Code"])[1], compare_rent_vs_buy(1, 1000, 300000, 60000, 5.0, 4.0)["Recommendation"])
+
+    def test_frame_missing_column(self):
+        """ Test that a missing required column raises a KeyError """
+        with self.assertRaises(KeyError):
+            compare_rent_vs_buy_frame({"length_of_stay": [1.0]})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from benchmark import BENCHMARKS, _calibrate, compare_results, run_benchmarks, synthetic_scenarios
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_every_benchmark_runs(self):
+        """ Test that every benchmark runs on a tiny dataset and reports its timings """
+        results = run_benchmarks(sizes=(20,), repeat=1, min_time=0)
+        self.assertEqual(set(results["results"]), {f"{name}[20]" for name in BENCHMARKS})
+        for result in results["results"].values():
+            self.assertGreater(result["best"], 0)
+            self.assertLessEqual(result["best"], result["median"])
+            self.assertEqual(result["loops"], 1)
+        self.assertIn("python", results["metadata"])
+
+    def test_fast_benchmarks_run_for_min_time(self):
+        """ Test that sub-millisecond benchmarks are timed over enough calls to last the minimum duration """
+        results = run_benchmarks(["batch_compare"], sizes=(20,), repeat=2, min_time=0.02)
+        result = results["results"]["batch_compare[20]"]
+        self.assertGreater(result["loops"], 1)
+        self.assertGreaterEqual(result["best"] * result["loops"], 0.01)
+        self.assertEqual(_calibrate(lambda: None, 0), 1)
+
+    def test_synthetic_data_is_fixed(self):
+        """ Test that the synthetic datasets are identical between runs """
+        first, second = synthetic_scenarios(50), synthetic_scenarios(50)
+        for name in first:
+            self.assertEqual(first[name].tolist(), second[name].tolist())
+
+    def test_compare_results(self):
+        """ Test that only slowdowns beyond the tolerance are reported """
+        baseline = {"results": {"a[1]": {"best": 1.0}, "b[1]": {"best": 1.0}, "c[1]": {"best": 1.0}}}
+        current = {"results": {"a[1]": {"best": 1.2}, "b[1]": {"best": 2.0}, "c[1]": {"best": 0.5}, "d[1]": {"best": 9.0}}}
+        regressions = compare_results(current, baseline, tolerance=0.25)
+        self.assertEqual([regression["benchmark"] for regression in regressions], ["b[1]"])
+        self.assertAlmostEqual(regressions[0]["ratio"], 2.0)
+
+    def test_unknown_benchmark(self):
+        """ Test that an unknown benchmark name raises a ValueError """
+        with self.assertRaises(ValueError):
+            run_benchmarks(["nothing"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from break_even import solve_break_even, cost_difference
+from batch_calculator import complete_inputs
+from calculator import compare_rent_vs_buy
+
+class TestSolveBreakEven(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up valid base inputs for tests """
+        self.base_inputs = {
+            "length_of_stay": 5,  # Years planning to stay in the home
+            "monthly_rent": 2000,  # Monthly rent cost in dollars
+            "home_price": 500000,  # Purchase price of the home in dollars
+            "down_payment": 100000,  # Initial down payment amount in dollars
+            "mortgage_rate": 5.0,  # Annual mortgage interest rate (percentage)
+            "investment_interest_rate": 4.0  # Annual investment interest rate (percentage)
+        }
+
+    def test_costs_equal_at_break_even(self):
+        """ Test that rent and buy costs are equal at the solved value of every factor """
+        for factor in ("length_of_stay", "monthly_rent", "home_price", "down_payment", "mortgage_rate", "investment_interest_rate"):
+            with self.subTest(factor=factor):
+                root = solve_break_even(self.base_inputs, factor)
+                result = compare_rent_vs_buy(**{**self.base_inputs, factor: float(root)})
+                self.assertAlmostEqual(result["Rent Cost"], result["Buy Cost"], delta=0.01)
+
+    def test_appreciation_rate_factor(self):
+        """ Test solving for a home appreciation rate that differs from the investment rate """
+        root = float(solve_break_even(self.base_inputs, "appreciation_rate"))
+        result = compare_rent_vs_buy(**self.base_inputs, appreciation_rate=root)
+        self.assertAlmostEqual(result["Rent Cost"], result["Buy Cost"], delta=0.01)
+
+    def test_matches_brute_force_sweep(self):
+        """ Test that the solver finds the crossover a dense sweep brackets """
+        values = np.arange(1, 10.001, 0.001)
+        sweep = [compare_rent_vs_buy(**{**self.base_inputs, "length_of_stay": value}) for value in values]
+        crossing = next(value for value, result in zip(values, sweep) if result["Rent Cost"] >= result["Buy Cost"])
+
+        self.assertAlmostEqual(float(solve_break_even(self.base_inputs, "length_of_stay")), crossing, delta=0.001)
+
+    def test_vectorized_scenarios(self):
+        """ Test that many scenarios are solved at once with few evaluations """
+        rng = np.random.default_rng(502)
+        inputs = {**self.base_inputs, "monthly_rent": rng.uniform(500, 4000, 1000), "mortgage_rate": rng.uniform(1, 10, 1000)}
+        root, evaluations = solve_break_even(inputs, "length_of_stay", return_evaluations=True)
+
+        solved = np.isfinite(root)
+        self.assertTrue(solved.any())
+        self.assertLess(evaluations, 60)
+        difference = cost_difference(complete_inputs({**inputs, "length_of_stay": root}))
+        np.testing.assert_allclose(difference[solved], 0, atol=1e-3)
+
+    def test_no_crossover(self):
+        """ Test that a bracket without a crossover returns NaN """
+        inputs = {**self.base_inputs, "monthly_rent": 1}
+        self.assertTrue(np.isnan(solve_break_even(inputs, "length_of_stay", lower=1, upper=2)))
+
+    def test_unknown_factor(self):
+        """ Test that an unknown factor raises a ValueError """
+        with self.assertRaises(ValueError):
+            solve_break_even(self.base_inputs, "city")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+import pandas as pd
+from bulk_score import iter_chunks, main, score_file
+from calculator import compare_rent_vs_buy
+from cost_model import compare_rent_vs_buy_stepped
+from data_cache import read_excel_cached
+
+class TestBulkScore(unittest.TestCase):
+
+    def setUp(self):
+        """Write a small scenario file naming cities from the Rent & Buy data."""
+        self.directory = tempfile.TemporaryDirectory()
+        data = read_excel_cached("data/Random Cities in USA (Rent & Buy).xlsx")
+        rows = np.arange(25) % len(data)
+        self.data = data.iloc[rows].reset_index(drop=True)
+        self.scenarios = pd.DataFrame({
+            "city": self.data["City"],
+            "location": self.data["Location"],
+            "bedrooms": self.data["Number of Bedrooms"],
+            "length_of_stay": 1 + np.arange(25) % 15,
+            "down_payment": 20000 + 5000 * np.arange(25),
+            "investment_interest_rate": 0.5 + 0.25 * np.arange(25)
+        })
+        self.scenarios.loc[3, "city"] = "Atlantis"
+        self.scenarios.loc[7, "down_payment"] = np.nan
+        self.input_path = os.path.join(self.directory.name, "scenarios.csv")
+        self.scenarios.to_csv(self.input_path, index=False)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_output(self, output):
+        """Compare every scored row with the scalar calculator."""
+        self.assertEqual(len(output), len(self.scenarios))
+        for i, row in self.scenarios.iterrows():
+            with self.subTest(row=i):
+                if i in (3, 7):
+                    self.assertTrue(np.isnan(output["Rent Cost"][i]))
+                    self.assertTrue(pd.isna(output["Recommendation"][i]))
+                    continue
+                expected = compare_rent_vs_buy(
+                    row["length_of_stay"], self.data["Rent per Month"][i], self.data["Buy Apartment Price Total"][i],
+                    row["down_payment"], self.data["Mortgage Intrest Rate"][i], row["investment_interest_rate"]
+                )
+                self.assertEqual(output["Rent Cost"][i], expected["Rent Cost"])
+                self.assertEqual(output["Buy Cost"][i], expected["Buy Cost"])
+                self.assertEqual(output["Recommendation"][i], expected["Recommendation"])
+
+    def test_score_csv_in_chunks(self):
+        """Test that a file scored in small chunks matches the scalar calculator row by row."""
+        output_path = os.path.join(self.directory.name, "scored.csv")
+        progress = []
+        stats = score_file(self.input_path, output_path, chunk_size=4, progress=progress.append)
+
+        self.assertEqual(stats["rows"], 25)
+        self.assertEqual(stats["unscored"], 2)
+        self.assertEqual(stats["chunks"], 7)
+        self.assertEqual(len(progress), 7)
+        self.check_output(pd.read_csv(output_path))
+
+    def test_stepped_model(self):
+        """Test scoring with the year-stepped cost model and per-row rent inflation."""
+        self.scenarios["rent_inflation_rate"] = 2.5
+        self.scenarios.loc[5, "rent_inflation_rate"] = np.nan
+        self.scenarios.to_csv(self.input_path, index=False)
+        output_path = os.path.join(self.directory.name, "scored.csv")
+        score_file(self.input_path, output_path, chunk_size=10, model="stepped")
+        output = pd.read_csv(output_path)
+
+        for i, inflation in ((4, 2.5), (5, 0.0)):
+            row = self.scenarios.iloc[i]
+            expected = compare_rent_vs_buy_stepped(
+                row["length_of_stay"], self.data["Rent per Month"][i], self.data["Buy Apartment Price Total"][i],
+                row["down_payment"], self.data["Mortgage Intrest Rate"][i], row["investment_interest_rate"],
+                rent_inflation_rate=inflation
+            )
+            self.assertEqual(output["Rent Cost"][i], expected["Rent Cost"])
+            self.assertEqual(output["Buy Cost"][i], expected["Buy Cost"])
+
+    def test_iter_chunks_sizes(self):
+        """Test that the reader yields fixed-size chunks."""
+        self.assertEqual([len(chunk) for chunk in iter_chunks(self.input_path, chunk_size=10)], [10, 10, 5])
+
+    def test_command_line(self):
+        """Test the command-line entry point and its summary line."""
+        output_path = os.path.join(self.directory.name, "scored.csv")
+        out = io.StringIO()
+        with redirect_stdout(out):
+            main([self.input_path, output_path, "--chunk-size", "8", "--quiet"])
+        self.assertIn("rows/sec", out.getvalue())
+        self.check_output(pd.read_csv(output_path))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_round_trip(self):
+        """Test Parquet input and output."""
+        parquet_input = os.path.join(self.directory.name, "scenarios.parquet")
+        output_path = os.path.join(self.directory.name, "scored.parquet")
+        self.scenarios.to_parquet(parquet_input, index=False)
+        score_file(parquet_input, output_path, chunk_size=4)
+        self.check_output(pd.read_parquet(output_path))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_output_with_late_missing_value(self):
+        """Test that gaps and fractions first appearing in a later chunk do not break the Parquet schema of integer columns."""
+        down_payments = [str(value) for value in self.scenarios["down_payment"].fillna(30000).astype(int)]
+        down_payments[21], down_payments[22] = "", "30000.5"
+        # Written as text so the early chunks read back as integers
+        self.scenarios.assign(down_payment=down_payments).to_csv(self.input_path, index=False)
+        output_path = os.path.join(self.directory.name, "scored.parquet")
+        score_file(self.input_path, output_path, chunk_size=4)
+
+        output = pd.read_parquet(output_path)
+        self.assertEqual(len(output), 25)
+        self.assertEqual(output["down_payment"].iloc[0], 20000)
+        self.assertTrue(np.isnan(output["down_payment"].iloc[21]))
+        self.assertTrue(np.isnan(output["Rent Cost"].iloc[21]))
+        self.assertFalse(np.isnan(output["Rent Cost"].iloc[20]))
+        self.assertEqual(output["down_payment"].iloc[22], 30000.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from city_index import build_city_index, lookup_city, lookup_cities, normalize_key
+import Rent_or_Buy_Integrated
+
+class TestCityIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the Excel data and build the index once for all tests."""
+        cls.df = pd.read_excel("data/Random Cities in USA (Rent & Buy).xlsx")
+        cls.index = build_city_index(cls.df)
+
+    def test_lookup_matches_dataframe_filter(self):
+        """Test that every row of the dataset is found with the values of the boolean filter."""
+        for _, row in self.df.iterrows():
+            with self.subTest(city=row["City"], location=row["Location"], bedrooms=row["Number of Bedrooms"]):
+                filtered = self.df[(self.df['City'] == row["City"]) &
+                                   (self.df['Location'] == row["Location"]) &
+                                   (self.df['Number of Bedrooms'] == row["Number of Bedrooms"])]
+                result = lookup_city(self.index, row["City"], row["Location"], str(row["Number of Bedrooms"]))
+                self.assertEqual(result["monthly_rent"], filtered['Rent per Month'].values[0])
+                self.assertEqual(result["home_price"], filtered['Buy Apartment Price Total'].values[0])
+                self.assertEqual(result["mortgage_rate"], filtered['Mortgage Intrest Rate'].values[0])
+
+    def test_missing_keys(self):
+        """Test that unknown or malformed keys return None instead of raising."""
+        self.assertIsNone(lookup_city(self.index, "Nowhere, ZZ", "City Centre", 1))
+        self.assertIsNone(lookup_city(self.index, "Anchorage, AK", "City Centre", "two"))
+        self.assertIsNone(lookup_city(self.index, "Anchorage, AK", "City Centre", 1.5))
+
+    def test_batch_lookup(self):
+        """Test that a batch lookup returns the same values as single lookups and flags misses."""
+        cities = list(self.df["City"]) + ["Nowhere, ZZ"]
+        bedrooms = list(self.df["Number of Bedrooms"]) + [1]
+        locations = list(self.df["Location"]) + ["City Centre"]
+        result = lookup_cities(self.index, cities, locations, bedrooms)
+
+        np.testing.assert_array_equal(result["found"], [True] * len(self.df) + [False])
+        np.testing.assert_array_equal(result["monthly_rent"][:-1], self.df["Rent per Month"])
+        self.assertTrue(np.isnan(result["home_price"][-1]))
+
+    def test_normalize_key(self):
+        """Test that keys are stripped and bedrooms converted to integers."""
+        self.assertEqual(normalize_key(" Tulsa, OK ", "City Centre ", "3"), ("Tulsa, OK", "City Centre", 3))
+
+    def test_get_user_inputs_retries_without_recursion(self):
+        """Test that repeated bad inputs are retried in a loop before valid inputs are accepted."""
+        answers = ["Nowhere, ZZ", "City Centre", "1"] * 50 + ["Tulsa, OK", "City Centre", "x"] + ["Tulsa, OK", "City Centre", "3", "5", "20000", "4"]
+        with patch("builtins.input", side_effect=answers), patch("builtins.print"):
+            inputs = Rent_or_Buy_Integrated.get_user_inputs()
+
+        expected = lookup_city(self.index, "Tulsa, OK", "City Centre", 3)
+        self.assertEqual(inputs["monthly_rent"], expected["monthly_rent"])
+        self.assertEqual(inputs["length_of_stay"], 5.0)
+        self.assertEqual(inputs["city"], "Tulsa, OK")
+
+if __name__ == "__main__":
+    unittest.main()
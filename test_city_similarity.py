@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+from city_similarity import (SIMILARITY_FEATURES, build_similarity_index, cities_within, city_features, nearest_neighbours,
+                             neighbours_within, similar_cities, standardize)
+from data_cache import read_excel_cached
+
+class TestCitySimilarity(unittest.TestCase):
+
+    def setUp(self):
+        """ Build a clustered random point set and the index of the dataset's cities """
+        rng = np.random.default_rng(24)
+        centres = rng.normal(size=(20, 4)) * 5
+        self.raw = centres[rng.integers(0, 20, 3000)] + rng.normal(size=(3000, 4)) * rng.uniform(0.5, 2, 4)
+        self.raw[rng.random(self.raw.shape) < 0.01] = np.nan
+        features = SIMILARITY_FEATURES[:4]
+        data = {feature: self.raw[:, position] for position, feature in enumerate(features)}
+        data["City"] = [f"City {i}" for i in range(len(self.raw))]
+        self.index = build_similarity_index(data, features=features, leaf_size=16)
+        self.queries = standardize(self.index, self.raw[rng.integers(0, len(self.raw), 300)] + rng.normal(size=(300, 4)))
+
+        self.cities = city_features(read_excel_cached("data/Random Cities in USA (Rent & Buy).xlsx"))
+        self.city_index = build_similarity_index(self.cities)
+
+    def brute_force(self, queries):
+        """ Distances from every query to every indexed point """
+        return np.sqrt(((queries[:, np.newaxis] - self.index["points"][np.newaxis]) ** 2).sum(axis=2))
+
+    def test_standardized_features(self):
+        """ Test that features are scaled to zero mean and unit deviation, with missing values at the mean """
+        points = self.index["points"]
+        np.testing.assert_allclose(points[~np.isnan(self.raw)].reshape(-1).mean(), 0, atol=0.05)
+        np.testing.assert_allclose(np.nanstd(np.where(np.isnan(self.raw), np.nan, points), axis=0), 1, rtol=1e-9)
+        self.assertTrue(np.all(points[np.isnan(self.raw)] == 0))
+
+    def test_nearest_neighbours_match_brute_force(self):
+        """ Test batched k-nearest-neighbour queries against an exhaustive search """
+        distances, rows = nearest_neighbours(self.index, self.queries, k=7)
+        expected = np.sort(self.brute_force(self.queries), axis=1)[:, :7]
+        np.testing.assert_allclose(distances, expected, rtol=1e-12)
+        np.testing.assert_allclose(np.take_along_axis(self.brute_force(self.queries), rows, axis=1), distances, rtol=1e-12)
+
+        # Asking for more neighbours than there are points pads the result
+        distances, rows = nearest_neighbours(self.city_index, self.city_index["points"][:1], k=len(self.cities) + 2)
+        self.assertEqual(list(rows[0, -2:]), [-1, -1])
+        self.assertTrue(np.isinf(distances[0, -1]))
+
+    def test_range_queries_match_brute_force(self):
+        """ Test batched radius queries against an exhaustive search """
+        all_distances = self.brute_force(self.queries)
+        for (distances, rows), expected in zip(neighbours_within(self.index, self.queries, 0.8), all_distances):
+            self.assertEqual(set(rows), set(np.flatnonzero(expected <= 0.8)))
+            self.assertTrue(np.all(np.diff(distances) >= 0))
+
+    def test_similar_cities(self):
+        """ Test similarity queries by city name on the Rent & Buy dataset """
+        names = list(self.cities["City"])
+        similar = similar_cities(self.city_index, names, k=3)
+        self.assertEqual(list(similar), names)
+        for city, others in similar.items():
+            self.assertEqual(len(others), 3)
+            self.assertNotIn(city, [other for other, _ in others])
+            self.assertEqual([distance for _, distance in others], sorted(distance for _, distance in others))
+
+        # Distances are symmetric
+        nearest, distance = similar["Kansas City, MO"][0]
+        self.assertAlmostEqual(dict(similar_cities(self.city_index, [nearest], k=9)[nearest])["Kansas City, MO"], distance)
+
+        within = cities_within(self.city_index, ["Kansas City, MO"], distance + 1e-9)["Kansas City, MO"]
+        self.assertEqual(within, [(nearest, distance)])
+
+        with self.assertRaises(KeyError):
+            similar_cities(self.city_index, ["Springfield, IL"])
+
+    def test_feature_weights(self):
+        """ Test that a zero-weighted feature no longer affects similarity """
+        weights = {feature: 0.0 for feature in SIMILARITY_FEATURES if feature != "Rent per Month"}
+        index = build_similarity_index(self.cities, weights=weights)
+        rents = dict(zip(self.cities["City"], self.cities["Rent per Month"]))
+        nearest = similar_cities(index, ["Houston, TX"], k=1)["Houston, TX"][0][0]
+        others = {city: abs(rent - rents["Houston, TX"]) for city, rent in rents.items() if city != "Houston, TX"}
+        self.assertEqual(nearest, min(others, key=others.get))
+
+        with self.assertRaises(ValueError):
+            build_similarity_index(self.cities, weights={"Bedrooms": 2.0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -41,8 +41,8 @@ class TestCompareCities(unittest.TestCase):
     Testing that plot_vacancy() function creates the intended plot of bars and lines, and labels intended axes
     """  
     def test_plot_function(self): 
-        with patch("pandas.read_excel") as mock_read_excel:
-            # Mock the DataFrame returned by pd.read_excel
+        with patch("Rent_or_Buy_Integrated.read_excel_cached") as mock_read_excel:
+            # Mock the DataFrame returned by the cached Excel reader
             mock_df = MagicMock()
             mock_read_excel.return_value = mock_df
 
@@ -60,7 +60,7 @@ class TestCompareCities(unittest.TestCase):
                            
                 Rent_or_Buy_Integrated.plot_vacancy(self.vacancy)  # Call the function from Rent_or_Buy_Integrated
                                  
-                mock_read_excel.assert_called_once_with(self.vacancy)  # Ensure pd.read_excel was called with the correct file
+                mock_read_excel.assert_called_once_with(self.vacancy)  # Ensure the cached reader was called with the correct file
                 mock_subplots.assert_called_once()
                 mock_ax1.bar.assert_called_once() 
                 mock_ax2.bar.assert_called_once()
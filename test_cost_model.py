@@ -0,0 +1,111 @@
+import math
+import unittest
+import numpy as np
+from batch_calculator import compare_rent_vs_buy_batch
+from cost_model import compare_rent_vs_buy_stepped, compare_with_model, model_inputs
+
+def reference_costs(stay, rent, price, down, mortgage, investment, tax, maintenance, selling, appreciation,
+                    inflation, escalation, insurance, term):
+    """ Plain year-by-year Python loop of the stepped model """
+    monthly_rate = mortgage / 1200
+    num_payments = 12 * term
+    if monthly_rate > 0:
+        payment = (price - down) * monthly_rate * (1 + monthly_rate) ** num_payments / ((1 + monthly_rate) ** num_payments - 1)
+    else:
+        payment = (price - down) / num_payments
+
+    def grow(rate, years):
+        return (1 + rate / 1200) ** (12 * years)
+
+    rent_total = buy_total = renter_gain = buyer_gain = 0.0
+    months_paid = 0.0
+    for year in range(math.ceil(stay)):
+        weight = min(stay - year, 1.0)
+        months = max(min(min(12 * stay, num_payments) - 12 * year, 12.0), 0.0)
+        rent_paid = 12 * rent * (1 + inflation / 100) ** year * weight
+        buy_paid = (payment * months
+                    + price * (tax + insurance) / 100 * (1 + escalation / 100) ** year * weight
+                    + price * grow(appreciation, year) * maintenance / 100 * weight)
+        months_paid += months
+        gain = grow(investment, stay - year) - 1
+        if buy_paid > rent_paid:
+            renter_gain += (buy_paid - rent_paid) * gain
+        else:
+            buyer_gain += (rent_paid - buy_paid) * gain
+        rent_total += rent_paid
+        buy_total += buy_paid
+
+    if months_paid < num_payments:
+        if monthly_rate > 0:
+            balance = (price - down) * ((1 + monthly_rate) ** num_payments - (1 + monthly_rate) ** months_paid) / ((1 + monthly_rate) ** num_payments - 1)
+        else:
+            balance = (price - down) * (1 - months_paid / num_payments)
+    else:
+        balance = 0.0
+    renter_gain += down * (grow(investment, stay) - 1)
+    resale = price * grow(appreciation, stay) * (1 - selling / 100) - balance
+    return rent_total - renter_gain, down + buy_total - resale - buyer_gain
+
+class TestSteppedCostModel(unittest.TestCase):
+
+    def setUp(self):
+        """ Build a reproducible set of random scenarios with every stepped input varying """
+        rng = np.random.default_rng(18)
+        size = 500
+        self.scenarios = {
+            "length_of_stay": np.where(rng.random(size) < 0.5, rng.uniform(0.5, 30, size), rng.integers(1, 30, size)),
+            "monthly_rent": np.round(rng.uniform(100, 5000, size), 2),
+            "home_price": np.round(rng.uniform(50000, 2000000, size)),
+            "down_payment": np.round(rng.uniform(0, 200000, size)),
+            "mortgage_rate": np.where(rng.random(size) < 0.2, 0.0, np.round(rng.uniform(0.5, 12, size), 2)),
+            "investment_interest_rate": rng.uniform(0, 10, size),
+            "property_tax_rate": rng.uniform(0, 3, size),
+            "maintenance_rate": rng.uniform(0, 2, size),
+            "selling_cost_rate": rng.uniform(0, 10, size),
+            "appreciation_rate": rng.uniform(-3, 8, size),
+            "rent_inflation_rate": rng.uniform(0, 6, size),
+            "tax_escalation_rate": rng.uniform(0, 4, size),
+            "insurance_rate": rng.uniform(0, 1, size),
+            "loan_term": rng.choice([15.0, 30.0], size)
+        }
+
+    def test_matches_reference_loop(self):
+        """ Test the vectorized model against a plain year-by-year loop """
+        result = compare_rent_vs_buy_stepped(**self.scenarios)
+        for i in range(len(self.scenarios["length_of_stay"])):
+            rent, buy = reference_costs(*(float(values[i]) for values in self.scenarios.values()))
+            self.assertAlmostEqual(result["Rent Cost"][i], rent, delta=0.011)
+            self.assertAlmostEqual(result["Buy Cost"][i], buy, delta=0.011)
+
+    def test_reduces_to_simple_model(self):
+        """ Test that without inflation, escalation, insurance or investment returns both models agree to the cent """
+        simple_inputs = {name: values for name, values in self.scenarios.items() if name in model_inputs("simple")}
+        simple_inputs.update(investment_interest_rate=0.0, appreciation_rate=0.0)
+        simple = compare_rent_vs_buy_batch(**simple_inputs)
+        stepped = compare_rent_vs_buy_stepped(**simple_inputs)
+        for name in ("Rent Cost", "Buy Cost", "Recommendation Code"):
+            np.testing.assert_array_equal(stepped[name], simple[name])
+
+    def test_chunking_and_broadcasting(self):
+        """ Test that results do not depend on the chunk size and that scalars broadcast """
+        whole = compare_rent_vs_buy_stepped(**self.scenarios)
+        chunked = compare_rent_vs_buy_stepped(**self.scenarios, chunk_cells=100)
+        np.testing.assert_array_equal(whole["Buy Cost"], chunked["Buy Cost"])
+
+        grid = compare_rent_vs_buy_stepped(np.array([[1], [10]]), 2000, 500000, 100000, 5.0, np.array([0.0, 4.0, 7.0]), rent_inflation_rate=3.0)
+        single = compare_rent_vs_buy_stepped(10, 2000, 500000, 100000, 5.0, 7.0, rent_inflation_rate=3.0)
+        self.assertEqual(grid["Rent Cost"].shape, (2, 3))
+        self.assertEqual(grid["Buy Cost"][1, 2], single["Buy Cost"])
+
+    def test_model_selection(self):
+        """ Test selecting the cost model by name """
+        inputs = {"length_of_stay": 5, "monthly_rent": 2000, "home_price": 500000, "down_payment": 100000,
+                  "mortgage_rate": 5.0, "investment_interest_rate": 4.0, "rent_inflation_rate": 3.0}
+        simple = compare_with_model(inputs, "simple")
+        self.assertEqual(simple["Buy Cost"], compare_rent_vs_buy_batch(**{name: inputs[name] for name in list(inputs)[:6]})["Buy Cost"])
+        self.assertNotEqual(compare_with_model(inputs, "stepped")["Rent Cost"], simple["Rent Cost"])
+        with self.assertRaises(ValueError):
+            compare_with_model(inputs, "monthly")
+
+if __name__ == "__main__":
+    unittest.main()
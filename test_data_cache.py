@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pandas as pd
+import data_cache
+from data_cache import _cache_name, _write_manifest, cached_table, load_cached_columns, read_excel_cached
+
+class TestDataCache(unittest.TestCase):
+
+    def setUp(self):
+        """Create a scratch cache directory and a small CSV source for each test."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.cache_dir, "source.csv")
+        with open(self.source, "w") as source:
+            source.write("City,Value,Mixed\nA,1.5,?\nB,2.5,3\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_excel_matches_pandas(self):
+        """Test that cached workbooks load identically to pd.read_excel, before and after caching."""
+        for file_path, options in [("data/Random Cities in USA (Rent & Buy).xlsx", {}),
+                                   ("data/Random Cities in USA (Quality of Life Index).xlsx", {"sheet_name": "Sheet1"})]:
+            with self.subTest(file_path=file_path):
+                expected = pd.read_excel(file_path, **options)
+                for _ in range(2):
+                    pd.testing.assert_frame_equal(read_excel_cached(file_path, cache_dir=self.cache_dir, **options), expected)
+
+    def test_cache_hit_skips_loader(self):
+        """Test that the loader only runs on the first load."""
+        loader = MagicMock(side_effect=lambda path: pd.read_csv(path))
+        first = cached_table(self.source, loader, loader_name="test", cache_dir=self.cache_dir)
+        second = cached_table(self.source, loader, loader_name="test", cache_dir=self.cache_dir)
+
+        self.assertEqual(loader.call_count, 1)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(list(second["Mixed"]), ["?", "3"])
+
+    def test_touched_file_with_same_content_is_not_reparsed(self):
+        """Test that a new modification time alone does not invalidate the cache."""
+        loader = MagicMock(side_effect=lambda path: pd.read_csv(path))
+        cached_table(self.source, loader, loader_name="test", cache_dir=self.cache_dir)
+        os.utime(self.source, ns=(time.time_ns(), time.time_ns() + 10**9))
+        cached_table(self.source, loader, loader_name="test", cache_dir=self.cache_dir)
+
+        self.assertEqual(loader.call_count, 1)
+
+    def test_changed_file_is_reparsed(self):
+        """Test that changed content rebuilds the cache and stale data is removed."""
+        cached_table(self.source, pd.read_csv, loader_name="test", cache_dir=self.cache_dir)
+        with open(self.source, "a") as source:
+            source.write("C,3.5,4\n")
+        frame = cached_table(self.source, pd.read_csv, loader_name="test", cache_dir=self.cache_dir)
+
+        self.assertEqual(list(frame["City"]), ["A", "B", "C"])
+        data_dirs = [entry for entry in os.listdir(self.cache_dir) if os.path.isdir(os.path.join(self.cache_dir, entry))]
+        self.assertEqual(len(data_dirs), 1)
+
+    def test_failed_manifest_write_removes_temporary_file(self):
+        """Test that a manifest write error propagates without leaving a temporary file behind."""
+        manifest_path = os.path.join(self.cache_dir, "entry.json")
+        with patch("data_cache.json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                _write_manifest(manifest_path, {"data_dir": "entry"})
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["source.csv"])
+
+    def test_concurrent_miss_reuses_other_copy(self):
+        """Test that losing the race to build the same entry reuses the winner's directory instead of reparsing."""
+        rename = os.rename
+        raced = []
+
+        def rename_after_other_process(source, destination):
+            if not raced:
+                # Another process finishes building the same entry between our parse and our rename
+                raced.append(True)
+                cached_table(self.source, pd.read_csv, loader_name="test", cache_dir=self.cache_dir)
+            rename(source, destination)
+
+        loader = MagicMock(side_effect=lambda path: pd.read_csv(path))
+        with patch("data_cache.os.rename", side_effect=rename_after_other_process):
+            frame = cached_table(self.source, loader, loader_name="test", cache_dir=self.cache_dir)
+
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(list(frame["City"]), ["A", "B"])
+        data_dirs = [entry for entry in os.listdir(self.cache_dir) if os.path.isdir(os.path.join(self.cache_dir, entry))]
+        self.assertEqual(len(data_dirs), 1)
+
+    def test_cleanup_keeps_newer_version(self):
+        """Test that a directory the manifest points to after our write is not removed as stale."""
+        name = _cache_name(self.source, "test", {})
+        newer_dir = os.path.join(self.cache_dir, f"{name}-{'f' * 16}")
+        write_manifest = data_cache._write_manifest
+
+        def write_then_other_process(manifest_path, manifest):
+            write_manifest(manifest_path, manifest)
+            # Another process caches a newer version of the source right after us
+            os.makedirs(newer_dir, exist_ok=True)
+            write_manifest(manifest_path, {**manifest, "sha256": "f" * 64, "data_dir": os.path.basename(newer_dir)})
+
+        with patch("data_cache._write_manifest", side_effect=write_then_other_process):
+            cached_table(self.source, pd.read_csv, loader_name="test", cache_dir=self.cache_dir)
+        self.assertTrue(os.path.isdir(newer_dir))
+
+    def test_columns_are_memory_mapped(self):
+        """Test that numeric and text columns are served as read-only memory maps."""
+        columns = load_cached_columns(self.source, pd.read_csv, loader_name="test", cache_dir=self.cache_dir)
+
+        self.assertIsInstance(columns["Value"], np.memmap)
+        self.assertIsInstance(columns["City"], np.memmap)
+        np.testing.assert_array_equal(columns["Value"], [1.5, 2.5])
+
+    def test_categorical_order_is_kept(self):
+        """Test that categorical columns keep their category order and missing values."""
+        def loader(path):
+            return pd.DataFrame({"Label": pd.Categorical(["b", None, "a"], categories=["b", "a"])})
+
+        cached_table(self.source, loader, loader_name="categorical", cache_dir=self.cache_dir)
+        frame = cached_table(self.source, loader, loader_name="categorical", cache_dir=self.cache_dir)
+        pd.testing.assert_frame_equal(frame, loader(self.source))
+
+        columns = load_cached_columns(self.source, loader, loader_name="categorical", cache_dir=self.cache_dir)
+        self.assertEqual(list(columns["Label"]), ["b", None, "a"])
+
+if __name__ == "__main__":
+    unittest.main()
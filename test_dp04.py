@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from compare_cities import vacancy_table as hand_extracted_vacancy_table
+from dp04 import DP04_FILE, load_dp04, metric_table, parse_dp04, parse_numbers, vacancy_table
+
+class TestDP04(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Parse the DP04 export once for all tests."""
+        cls.table = parse_dp04(DP04_FILE)
+
+    def test_parse_numbers(self):
+        """Test parsing of thousands separators, margins, decimals and ACS annotations."""
+        values = parse_numbers(["172,174", "±2,319", "6.4", "±0.7", "", "(X)", "*****"])
+        np.testing.assert_array_equal(values[:4], [172174, 2319, 6.4, 0.7])
+        self.assertTrue(np.isnan(values[4:]).all())
+
+    def test_long_table_shape(self):
+        """Test that every metric appears once per metro with typed values."""
+        metros = self.table["metro"].cat.categories
+        self.assertEqual(len(metros), 10)
+        self.assertTrue((self.table.groupby("metric", observed=True).size() == len(metros)).all())
+        self.assertEqual(self.table["estimate"].dtype, np.float64)
+        self.assertEqual(self.table["margin"].dtype, np.float64)
+        self.assertNotIn("VALUE", set(self.table["label"]))
+
+    def test_metric_paths_disambiguate_labels(self):
+        """Test that repeated labels such as "Median (dollars)" get distinct metric names."""
+        medians = self.table.loc[self.table["label"] == "Median (dollars)", "metric"].astype(str).unique()
+        self.assertIn("GROSS RENT!!Occupied units paying rent!!Median (dollars)", medians)
+        self.assertIn("SELECTED MONTHLY OWNER COSTS (SMOC)!!Housing units without a mortgage!!Median (dollars)", medians)
+        self.assertEqual(len(medians), 4)
+
+    def test_vacancy_table_matches_hand_extracted_csv(self):
+        """Test that the vacancy chart table built from the export matches the hand-extracted CSV."""
+        expected = hand_extracted_vacancy_table("data/USA DP04 vacancy value cost.csv")
+        actual = vacancy_table(DP04_FILE)
+        for column in ("Vacant housing units", "Median House Value (dollars)", "Median Buy Cost (dollars)", "Median Rent Cost (dollars)"):
+            np.testing.assert_array_equal(actual[column].to_numpy(), expected[column].to_numpy())
+        np.testing.assert_array_equal(actual["Rent Cost Error Margin"].to_numpy(),
+                                      parse_numbers(expected["Rent Cost Error Margin"].to_numpy()))
+
+    def test_vacancy_table_with_missing_cells(self):
+        """Test that an annotated margin and a missing estimate become NaN instead of failing the whole table."""
+        with open(DP04_FILE, encoding="utf-8-sig") as source:
+            lines = source.read().split("\n")
+        lines = [line.replace('"±2,604"', "*****", 1) if line.strip().startswith("Vacant housing units") else line for line in lines]
+        lines[150] = lines[150].replace('"1,428"', "(X)", 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "missing.csv")
+            with open(path, "w", encoding="utf-8") as target:
+                target.write("\n".join(lines))
+            table = vacancy_table(path, cache_dir=directory)
+        complete = vacancy_table(DP04_FILE)
+
+        self.assertTrue(np.isnan(table["Housing Unit Error Margin"].iloc[0]))
+        self.assertTrue(np.isnan(table["Median Rent Cost (dollars)"].iloc[0]))
+        self.assertEqual(table["Vacant housing units"].iloc[0], 23179)
+        np.testing.assert_array_equal(table["Median Rent Cost (dollars)"].iloc[1:], complete["Median Rent Cost (dollars)"].iloc[1:])
+
+    def test_cached_table_matches_parse(self):
+        """Test that the cached long table equals a fresh parse."""
+        with tempfile.TemporaryDirectory() as directory:
+            load_dp04(DP04_FILE, cache_dir=directory)
+            cached = load_dp04(DP04_FILE, cache_dir=directory)
+        pd.testing.assert_frame_equal(cached, self.table)
+
+    def test_metric_table_unknown_metric(self):
+        """Test that selecting an unknown metric raises a KeyError."""
+        with self.assertRaises(KeyError):
+            metric_table(self.table, {"x": "NOT A METRIC"})
+
+    def test_many_metros(self):
+        """Test a synthetic export with hundreds of metros."""
+        header = ["Label (Grouping)"]
+        for i in range(300):
+            header += [f"Metro {i} Metro Area!!Estimate", f"Metro {i} Metro Area!!Margin of Error"]
+        rows = [["SECTION"] + [""] * 600, ["\xa0\xa0\xa0\xa0Total"] + [f"{1000 + i:,}" if j % 2 == 0 else "±5" for i in range(300) for j in (0, 1)]]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "wide.csv")
+            pd.DataFrame(rows, columns=header).to_csv(path, index=False)
+            table = parse_dp04(path)
+        self.assertEqual(len(table), 300)
+        self.assertEqual(table["estimate"].iloc[-1], 1299)
+        self.assertTrue((table["margin"] == 5).all())
+
+if __name__ == "__main__":
+    unittest.main()
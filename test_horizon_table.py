@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from break_even import solve_break_even
+from data_cache import read_excel_cached
+from horizon_table import (DOWN_PAYMENT_FRACTIONS, INVESTMENT_RATES, build_horizon_table, load_horizon_table,
+                           lookup_horizon, refresh_horizon_table, save_horizon_table)
+
+class TestHorizonTable(unittest.TestCase):
+
+    def setUp(self):
+        """ Load the dataset and build its table """
+        self.data = read_excel_cached("data/Random Cities in USA (Rent & Buy).xlsx").head(12).reset_index(drop=True)
+        self.table = build_horizon_table(self.data)
+        self.directory = tempfile.TemporaryDirectory()
+        self.table_file = os.path.join(self.directory.name, "horizons.npz")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_horizons_match_break_even_solver(self):
+        """ Test that every stored horizon equals the break-even length of stay of its row """
+        self.assertEqual(self.table["horizons"].shape, (len(self.data), len(DOWN_PAYMENT_FRACTIONS), len(INVESTMENT_RATES)))
+        self.assertEqual(self.table["recomputed"], len(self.data))
+        for row in (0, 5, 11):
+            home_price = float(self.data["Buy Apartment Price Total"][row])
+            for i, fraction in enumerate(DOWN_PAYMENT_FRACTIONS):
+                for j, rate in enumerate(INVESTMENT_RATES):
+                    expected = solve_break_even({
+                        "length_of_stay": 1.0, "monthly_rent": float(self.data["Rent per Month"][row]),
+                        "home_price": home_price, "down_payment": home_price * fraction,
+                        "mortgage_rate": float(self.data["Mortgage Intrest Rate"][row]), "investment_interest_rate": rate
+                    }, "length_of_stay")
+                    np.testing.assert_allclose(self.table["horizons"][row, i, j], expected, rtol=1e-9)
+
+    def test_save_load_and_lookup(self):
+        """ Test that a saved table loads back unchanged and answers lookups by key """
+        save_horizon_table(self.table, self.table_file)
+        loaded = load_horizon_table(self.table_file)
+        np.testing.assert_array_equal(loaded["horizons"], self.table["horizons"])
+        np.testing.assert_array_equal(loaded["row_hashes"], self.table["row_hashes"])
+        self.assertEqual(loaded["settings"], self.table["settings"])
+
+        city, location, bedrooms = self.data.loc[3, ["City", "Location", "Number of Bedrooms"]]
+        np.testing.assert_array_equal(lookup_horizon(loaded, f" {city} ", location, str(bedrooms)), self.table["horizons"][3])
+        self.assertEqual(lookup_horizon(loaded, city, location, bedrooms, 0.20, 4.0),
+                         self.table["horizons"][3, DOWN_PAYMENT_FRACTIONS.index(0.20), INVESTMENT_RATES.index(4.0)])
+        np.testing.assert_array_equal(lookup_horizon(loaded, city, location, bedrooms, investment_interest_rate=2.0),
+                                      self.table["horizons"][3, :, 0])
+        self.assertIsNone(lookup_horizon(loaded, "Nowhere", location, bedrooms))
+        with self.assertRaises(ValueError):
+            lookup_horizon(loaded, city, location, bedrooms, down_payment_fraction=0.15)
+        self.assertIsNone(load_horizon_table(os.path.join(self.directory.name, "missing.npz")))
+
+    def test_failed_save_removes_temporary_file(self):
+        """ Test that a write error propagates without leaving a temporary file or replacing the table """
+        save_horizon_table(self.table, self.table_file)
+        with patch("horizon_table.np.savez", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                save_horizon_table(build_horizon_table(self.data.head(3)), self.table_file)
+        self.assertEqual(os.listdir(self.directory.name), ["horizons.npz"])
+        np.testing.assert_array_equal(load_horizon_table(self.table_file)["horizons"], self.table["horizons"])
+
+    def test_incremental_refresh_recomputes_changed_rows_only(self):
+        """ Test that only rows whose inputs changed are solved again """
+        self.assertEqual(build_horizon_table(self.data, self.table)["recomputed"], 0)
+
+        changed = self.data.copy()
+        changed.loc[4, "Rent per Month"] *= 1.5
+        changed = changed.drop(index=7).reset_index(drop=True)
+        refreshed = build_horizon_table(changed, self.table)
+        self.assertEqual(refreshed["recomputed"], 1)
+        fresh = build_horizon_table(changed)
+        np.testing.assert_array_equal(refreshed["horizons"], fresh["horizons"])
+        self.assertFalse(np.array_equal(refreshed["horizons"][4], self.table["horizons"][4], equal_nan=True))
+
+    def test_changed_assumptions_recompute_all_rows(self):
+        """ Test that a table built on another grid is not reused """
+        other = build_horizon_table(self.data, self.table, down_payment_fractions=(0.10, 0.25))
+        self.assertEqual(other["recomputed"], len(self.data))
+        self.assertEqual(other["horizons"].shape, (len(self.data), 2, len(INVESTMENT_RATES)))
+
+    def test_refresh_persists_table(self):
+        """ Test that refreshing from the workbook writes the table and then reuses it """
+        first = refresh_horizon_table(table_file=self.table_file)
+        self.assertTrue(os.path.exists(self.table_file))
+        self.assertEqual(first["recomputed"], len(first["row_hashes"]))
+        second = refresh_horizon_table(table_file=self.table_file)
+        self.assertEqual(second["recomputed"], 0)
+        np.testing.assert_array_equal(second["horizons"], first["horizons"])
+
+if __name__ == "__main__":
+    unittest.main()
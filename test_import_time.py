@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Maximum time (seconds) allowed for importing the calculation modules in a fresh interpreter
+IMPORT_TIME_BUDGET = 0.5
+
+# Modules that must be importable using only the standard library and NumPy
+CORE_MODULES = ["calculator", "batch_calculator", "amortization", "break_even", "city_index", "data_cache", "memo", "instrumentation", "oecd", "cost_model", "scenario", "records", "strategy", "shared_data", "city_similarity", "horizon_table"]
+
+# Modules that may use pandas or matplotlib when called, but must not load them on import
+LAZY_MODULES = ["Rent_or_Buy_Integrated", "break_even_plots", "compare_cities", "quality_of_life", "service", "bulk_score", "dp04"]
+
+# Heavy dependencies that must only be loaded on first use
+HEAVY_MODULES = ["pandas", "matplotlib", "openpyxl"]
+
+def measure_import(modules):
+    """Import modules in a fresh interpreter and report the elapsed time, loaded heavy modules and output."""
+    script = (
+        "import json, sys, time\n"
+        "import numpy\n"
+        "start = time.perf_counter()\n"
+        f"for name in {modules!r}: __import__(name)\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "sys.stderr.write(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+    )
+    process = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(process.stderr), process.stdout
+
+class TestImportTime(unittest.TestCase):
+
+    def test_core_imports_within_budget(self):
+        """Test that the core calculator modules import within the time budget, measured beyond NumPy itself."""
+        # Take the best of a few runs to smooth out a cold disk cache
+        elapsed = min(measure_import(CORE_MODULES)[0]["elapsed"] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_TIME_BUDGET, f"Importing {CORE_MODULES} took {elapsed:.3f}s")
+
+    def test_imports_have_no_side_effects(self):
+        """Test that importing any module loads no heavy dependency and prints nothing."""
+        for module in CORE_MODULES + LAZY_MODULES:
+            with self.subTest(module=module):
+                report, output = measure_import([module])
+                self.assertEqual(report["loaded"], [])
+                self.assertEqual(output, "")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import timeit
+import unittest
+from contextlib import nullcontext
+import instrumentation
+from batch_calculator import compare_rent_vs_buy_batch
+from break_even import solve_break_even
+from data_cache import read_excel_cached
+from instrumentation import capture, count, span, to_prometheus, write_summary
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up valid inputs for tests """
+        self.inputs = {
+            "length_of_stay": 5,
+            "monthly_rent": 2000,
+            "home_price": 500000,
+            "down_payment": 100000,
+            "mortgage_rate": 5.0,
+            "investment_interest_rate": 4.0
+        }
+
+    def test_spans_and_counters(self):
+        """ Test that spans and counters are aggregated per name """
+        with capture() as run:
+            for _ in range(3):
+                with span("test.block"):
+                    count("test.items", 2)
+        result = run["summary"]
+        self.assertEqual(result["spans"]["test.block"]["count"], 3)
+        self.assertLessEqual(result["spans"]["test.block"]["min"], result["spans"]["test.block"]["max"])
+        self.assertEqual(result["counters"]["test.items"], 6)
+        self.assertFalse(instrumentation.is_enabled())
+
+    def test_hot_paths_are_instrumented(self):
+        """ Test that calculation, break-even and data loading report spans and evaluation counts """
+        with capture() as run:
+            compare_rent_vs_buy_batch(**{**self.inputs, "monthly_rent": [1000, 2000, 3000]})
+            solve_break_even(self.inputs, "length_of_stay")
+            read_excel_cached("data/Random Cities in USA (Rent & Buy).xlsx")
+        result = run["summary"]
+        for name in ("calculation.compare", "calculation.break_even", "data.load"):
+            self.assertIn(name, result["spans"])
+        self.assertGreaterEqual(result["counters"]["evaluations"], 3)
+        self.assertGreater(result["counters"]["break_even.evaluations"], 0)
+
+    def test_disabled_records_nothing(self):
+        """ Test that nothing is recorded while disabled and the no-op path stays cheap """
+        instrumentation.reset()
+        with span("test.disabled"):
+            count("test.disabled")
+        result = instrumentation.summary()
+        self.assertEqual(result["spans"], {})
+        self.assertEqual(result["counters"], {})
+
+        # The disabled path hands out one shared no-op context manager
+        self.assertIs(span("test.disabled"), span("test.other"))
+
+        def disabled():
+            with span("test.disabled"):
+                count("test.disabled")
+
+        def no_op(name):
+            pass
+
+        def baseline():
+            with nullcontext():
+                no_op("test.disabled")
+
+        # Relative to an empty context manager and call, so machine speed and load cancel out
+        elapsed = min(timeit.repeat(disabled, number=10000, repeat=5))
+        self.assertLess(elapsed, 5 * min(timeit.repeat(baseline, number=10000, repeat=5)))
+
+    def test_profile_and_memory_capture(self):
+        """ Test the opt-in cProfile and tracemalloc sections """
+        with capture(profile=True, memory=True) as run:
+            compare_rent_vs_buy_batch(**{**self.inputs, "monthly_rent": list(range(1000, 2000))})
+        result = run["summary"]
+        self.assertTrue(any("compare_rent_vs_buy_batch" in row["function"] for row in result["profile"]))
+        self.assertGreater(result["memory"]["peak_bytes"], 0)
+
+    def test_outputs(self):
+        """ Test the JSON and Prometheus outputs """
+        with capture() as run:
+            with span('odd "name"'):
+                count("test.items", 5)
+        text = to_prometheus(run["summary"])
+        self.assertIn('rent_or_buy_span_calls_total{span="odd \\"name\\""} 1', text)
+        self.assertIn('rent_or_buy_events_total{counter="test.items"} 5', text)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.json")
+            write_summary(path, run["summary"])
+            with open(path, encoding="utf-8") as source:
+                self.assertEqual(json.load(source)["counters"], {"test.items": 5})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from calculator import compare_rent_vs_buy
+from sensitivity_grid import sensitivity_curves
+from memo import DiskStore, ResultCache, memoize, normalize_key
+import memo
+
+class TestNormalizeKey(unittest.TestCase):
+
+    def test_equivalent_numbers_share_a_key(self):
+        """ Test that ints, floats, NumPy scalars and tiny float noise normalize to the same key """
+        self.assertEqual(normalize_key(5), normalize_key(5.0))
+        self.assertEqual(normalize_key(np.float64(0.1 + 0.2)), normalize_key(0.3))
+        self.assertEqual(normalize_key(-0.0), normalize_key(0.0))
+        self.assertNotEqual(normalize_key(5.0), normalize_key(5.01))
+
+    def test_containers(self):
+        """ Test that dictionaries are order independent and arrays become tuples """
+        self.assertEqual(normalize_key({"a": 1, "b": " x "}), normalize_key({"b": "x", "a": 1.0}))
+        self.assertEqual(normalize_key(np.array([1, 2])), (1.0, 2.0))
+        with self.assertRaises(TypeError):
+            normalize_key(object())
+
+class TestResultCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        """ Test that the least recently used entry is evicted first """
+        cache = ResultCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        """ Test that entries expire after the TTL """
+        now = [0.0]
+        cache = ResultCache(ttl=10, clock=lambda: now[0])
+        cache.set("a", 1)
+        now[0] = 9.0
+        self.assertEqual(cache.get("a"), 1)
+        now[0] = 11.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+class TestMemoize(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up valid inputs for tests """
+        self.inputs = {
+            "length_of_stay": 5,
+            "monthly_rent": 2000,
+            "home_price": 500000,
+            "down_payment": 100000,
+            "mortgage_rate": 5.0,
+            "investment_interest_rate": 4.0
+        }
+
+    def test_positional_and_keyword_calls_share_entries(self):
+        """ Test that a repeated scenario is served from the cache in any calling style """
+        cached = memoize(compare_rent_vs_buy)
+        first = cached(**self.inputs)
+        second = cached(5.0, 2000.0, 500000.0, 100000.0, 5, 4, 1.2)
+        self.assertEqual(first, compare_rent_vs_buy(**self.inputs))
+        self.assertEqual(second, first)
+        self.assertEqual(cached.cache_stats()["hits"], 1)
+        self.assertEqual(cached.cache_stats()["misses"], 1)
+
+    def test_results_are_isolated(self):
+        """ Test that modifying a returned result does not change the cached one """
+        cached = memoize(sensitivity_curves)
+        curves = cached(self.inputs)
+        curves.pop("home_price")
+        with self.assertRaises(ValueError):
+            curves["monthly_rent"][1][0] = 0
+        self.assertIn("home_price", cached(self.inputs))
+
+    def test_disk_store_survives_restart(self):
+        """ Test that a new cache backed by the same store starts warm """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "memo.sqlite")
+            calls = []
+
+            def compare(**inputs):
+                calls.append(inputs)
+                return compare_rent_vs_buy(**inputs)
+
+            store = DiskStore(path)
+            memoize(compare, store=store)(**self.inputs)
+            store.close()
+
+            store = DiskStore(path)
+            restarted = memoize(compare, store=store)
+            self.assertEqual(restarted(**self.inputs), compare_rent_vs_buy(**self.inputs))
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(restarted.cache_stats()["disk_hits"], 1)
+            store.close()
+
+    def test_cached_break_even(self):
+        """ Test the ready-made break-even wrapper """
+        value = memo.cached_solve_break_even(self.inputs, "monthly_rent")
+        self.assertEqual(memo.cached_solve_break_even(self.inputs, "monthly_rent"), value)
+        self.assertGreaterEqual(memo.cached_solve_break_even.cache_stats()["hits"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
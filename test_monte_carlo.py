@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from calculator import compare_rent_vs_buy
+from monte_carlo import simulate_rent_vs_buy, load_growth_history
+
+class TestMonteCarlo(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up valid base inputs for tests """
+        self.base_inputs = {
+            "length_of_stay": 5.5,  # Years planning to stay in the home
+            "monthly_rent": 2000,  # Monthly rent cost in dollars
+            "home_price": 500000,  # Purchase price of the home in dollars
+            "down_payment": 100000,  # Initial down payment amount in dollars
+            "mortgage_rate": 5.0,  # Annual mortgage interest rate (percentage)
+            "investment_interest_rate": 4.0  # Annual investment interest rate (percentage)
+        }
+
+    def test_load_growth_history(self):
+        """ Test that the USA series is loaded in year order """
+        history = load_growth_history()
+        self.assertEqual(len(history), 8)
+        self.assertAlmostEqual(history[0], 5.2242)
+        with self.assertRaises(ValueError):
+            load_growth_history(country="XXX")
+
+    def test_deterministic_paths_match_calculator(self):
+        """ Test that constant appreciation and zero volatility reproduce compare_rent_vs_buy """
+        summary = simulate_rent_vs_buy(self.base_inputs, num_paths=100, appreciation_history=[4.0], investment_volatility=0.0,
+                                       seed=1, return_samples=True)
+        expected = compare_rent_vs_buy(**self.base_inputs)
+
+        np.testing.assert_allclose(summary["Rent Cost"], expected["Rent Cost"], atol=0.01)
+        np.testing.assert_allclose(summary["Buy Cost"], expected["Buy Cost"], atol=0.01)
+
+    def test_reproducible_seed(self):
+        """ Test that the same seed and chunk size give identical results """
+        first = simulate_rent_vs_buy(self.base_inputs, num_paths=5000, seed=502, chunk_size=1000)
+        second = simulate_rent_vs_buy(self.base_inputs, num_paths=5000, seed=502, chunk_size=1000)
+        other = simulate_rent_vs_buy(self.base_inputs, num_paths=5000, seed=503, chunk_size=1000)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first["Mean Buy Cost"], other["Mean Buy Cost"])
+
+    def test_summary(self):
+        """ Test that probabilities and percentiles are well formed """
+        summary = simulate_rent_vs_buy(self.base_inputs, num_paths=20000, seed=7, chunk_size=3000)
+        percentiles = list(summary["Buy Cost Percentiles"].values())
+
+        self.assertEqual(summary["Paths"], 20000)
+        self.assertTrue(0 <= summary["Probability Buy Wins"] <= 1)
+        self.assertEqual(percentiles, sorted(percentiles))
+        self.assertEqual(list(summary["Rent Cost Percentiles"]), [5, 25, 50, 75, 95])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from calculator import compare_rent_vs_buy
+from oecd import (appreciation_rate_for, expected_appreciation, growth_history, growth_statistic,
+                  load_five_year_averages, load_growth_store)
+
+class TestGrowthStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """ Load the OECD store once for all tests """
+        cls.store = load_growth_store()
+
+    def test_store_layout(self):
+        """ Test the country x year array and the code and name index """
+        growth = self.store["growth"]
+        self.assertEqual(growth.shape, (len(self.store["countries"]), len(self.store["years"])))
+        self.assertEqual(self.store["positions"]["USA"], self.store["positions"]["United States"])
+        np.testing.assert_array_equal(growth_history(self.store, "United States"), growth_history(self.store, "USA"))
+
+    def test_statistics_match_direct_computation(self):
+        """ Test the precomputed mean, volatility and CAGR against a direct computation on every window """
+        for country in ("USA", "JPN", "TUR"):
+            history = growth_history(self.store, country)
+            for years in range(1, len(history) + 1):
+                window = history[-years:]
+                with self.subTest(country=country, years=years):
+                    self.assertAlmostEqual(growth_statistic(self.store, country, years, "mean"), window.mean())
+                    self.assertAlmostEqual(expected_appreciation(self.store, country, years),
+                                           (np.prod(1 + window / 100) ** (1 / years) - 1) * 100)
+                    if years > 1:
+                        self.assertAlmostEqual(growth_statistic(self.store, country, years, "volatility"), window.std(ddof=1))
+
+    def test_matches_five_year_averages(self):
+        """ Test that the six-year mean ending 2021 reproduces OECD's "Average 2016-2021" file """
+        averages = load_five_year_averages()
+        for name in ("Italy", "Finland", "Japan", "Brazil", "Saudi Arabia"):
+            with self.subTest(country=name):
+                self.assertAlmostEqual(growth_statistic(self.store, name, 6, "mean", end_year=2021), averages[name], places=6)
+
+    def test_window_limits(self):
+        """ Test that windows longer than the history are capped and unknown keys raise a KeyError """
+        history = growth_history(self.store, "USA")
+        self.assertEqual(expected_appreciation(self.store, "USA", 50), expected_appreciation(self.store, "USA", len(history)))
+        self.assertEqual(expected_appreciation(self.store, "USA", 2.5), expected_appreciation(self.store, "USA", 3))
+        with self.assertRaises(KeyError):
+            expected_appreciation(self.store, "XXX", 5)
+        with self.assertRaises(KeyError):
+            expected_appreciation(self.store, "USA", 5, end_year=1990)
+        with self.assertRaises(ValueError):
+            growth_statistic(self.store, "USA", 5, "median")
+
+    def test_calculator_appreciation_rate(self):
+        """ Test that the calculator grows the home price at the country's CAGR """
+        rate = appreciation_rate_for(self.store, "USA", 5)
+        cagr = expected_appreciation(self.store, "USA", 5)
+        inputs = {"length_of_stay": 5, "monthly_rent": 2000, "home_price": 500000, "down_payment": 100000,
+                  "mortgage_rate": 5.0, "investment_interest_rate": 4.0, "selling_cost_rate": 0.0,
+                  "property_tax_rate": 0.0, "maintenance_rate": 0.0}
+
+        # With no running costs, the buy cost difference between two rates is just the resale value difference
+        with_growth = compare_rent_vs_buy(**inputs, appreciation_rate=rate)["Buy Cost"]
+        without_growth = compare_rent_vs_buy(**inputs, appreciation_rate=0.0)["Buy Cost"]
+        self.assertAlmostEqual(without_growth - with_growth, 500000 * ((1 + cagr / 100) ** 5 - 1), delta=0.02)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
+import io
 import unittest
+from contextlib import redirect_stdout
+import numpy as np
 import pandas as pd
-from quality_of_life import load_data, compute_quality_of_life
+from quality_of_life import (load_data, compute_quality_of_life, categorize_value, score_quality_of_life,
+                             rank_quality_of_life, INDEX_COLUMNS, THRESHOLDS, LABELS)
 
 class TestQualityOfLife(unittest.TestCase):
 
@@ -19,5 +23,62 @@ class TestQualityOfLife(unittest.TestCase):
                 except Exception as e:
                     self.fail(f"compute_quality_of_life failed for {city}: {e}")
 
+    def test_score_matches_categorize_value(self):
+        """Test that every batch category matches categorize_value on the same value."""
+        table = score_quality_of_life(self.df)
+        self.assertEqual(len(table), len(self.df))
+        for _, row in table.iterrows():
+            for name, thresholds in THRESHOLDS.items():
+                with self.subTest(city=row["City"], index=name):
+                    if np.isnan(row[name]):
+                        self.assertTrue(pd.isna(row[f"{name} Category"]))
+                    else:
+                        self.assertEqual(row[f"{name} Category"], categorize_value(row[name], thresholds, LABELS))
+
+    def test_score_matches_scalar_formula(self):
+        """Test the batch Quality of Life Index against the scalar formula, including missing values."""
+        table = score_quality_of_life(self.df)
+        for position, city in enumerate(self.df["City"]):
+            with self.subTest(city=city):
+                try:
+                    pp, safety, health, climate, col, prop, traffic, pollution = (float(self.df[name][position]) for name in INDEX_COLUMNS)
+                except (TypeError, ValueError):
+                    self.assertTrue(np.isnan(table["Quality of Life Index"][position]))
+                    continue
+                qol = max(0, 100 + pp / 2.5 - prop * 1.0 - col / 10 + safety / 2.0 + health / 2.5 - traffic / 2.0 - pollution * 2.0 / 3.0 + climate / 3.0)
+                self.assertEqual(table["Quality of Life Index"][position], qol)
+
+    def test_missing_cell_left_unscored(self):
+        """Test that the scalar and batch scorers both leave a city with an empty cell unscored."""
+        data = pd.DataFrame({"City": ["Full", "Gap"], **{name: [50.0, 50.0] for name in INDEX_COLUMNS}})
+        data.loc[1, "Safety Index"] = np.nan
+        output = io.StringIO()
+        with redirect_stdout(output):
+            compute_quality_of_life(data, "Gap")
+        self.assertIn("Missing value in dataset.", output.getvalue())
+        self.assertNotIn("Quality of Life Index", output.getvalue())
+
+        table = score_quality_of_life(data)
+        self.assertFalse(np.isnan(table["Quality of Life Index"][0]))
+        self.assertTrue(np.isnan(table["Quality of Life Index"][1]))
+
+    def test_threshold_edges(self):
+        """Test that values equal to a threshold fall in the lower band and clipping at zero."""
+        data = pd.DataFrame({"City": ["Edge", "Low"], **{name: [THRESHOLDS[name][1], 0] for name in INDEX_COLUMNS}})
+        data["Pollution Index"] = [THRESHOLDS["Pollution Index"][1], 1000]
+        table = score_quality_of_life(data)
+        for name in INDEX_COLUMNS:
+            self.assertEqual(table[f"{name} Category"][0], "Low")
+        self.assertEqual(table["Quality of Life Index"][1], 0)
+        self.assertEqual(table["Quality of Life Index Category"][1], "Very Low")
+
+    def test_rank_quality_of_life(self):
+        """Test that ranking orders by index with unscored cities last."""
+        ranking = rank_quality_of_life(self.df)
+        self.assertEqual(list(ranking["Rank"]), list(range(1, len(self.df) + 1)))
+        scored = ranking["Quality of Life Index"].dropna().to_numpy()
+        self.assertTrue(np.all(np.diff(scored) <= 0))
+        self.assertTrue(ranking["Quality of Life Index"].iloc[len(scored):].isna().all())
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+import pickle
+import sys
+import unittest
+import numpy as np
+from batch_calculator import INPUT_DEFAULTS, RECOMMENDATIONS, compare_rent_vs_buy_batch
+from calculator import compare_rent_vs_buy
+from records import (RESULT_DTYPE, SCENARIO_DTYPE, ComparisonResult, Recommendation, ScenarioInputs, compare_records,
+                     compare_scenario, result_dicts, result_records, scenario_records)
+
+class TestRecords(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up valid base inputs for tests """
+        self.base_inputs = {
+            "length_of_stay": 5,
+            "monthly_rent": 2000,
+            "home_price": 500000,
+            "down_payment": 100000,
+            "mortgage_rate": 5.0,
+            "investment_interest_rate": 4.0
+        }
+
+    def test_scenario_matches_dictionary_api(self):
+        """ Test that typed scenarios give the same results as compare_rent_vs_buy and convert back to dicts """
+        scenario = ScenarioInputs.from_mapping({**self.base_inputs, "city": "Tulsa"})
+        self.assertEqual(scenario.as_dict(), {**self.base_inputs, "property_tax_rate": 1.2, "maintenance_rate": 1.0, "selling_cost_rate": 8.0})
+        self.assertEqual(compare_scenario(scenario).as_dict(), compare_rent_vs_buy(**self.base_inputs))
+
+        for changes in ({"monthly_rent": 1000}, {"monthly_rent": 4000}, {"appreciation_rate": 1.5}, {"mortgage_rate": 0.0}):
+            changed = scenario.replace(**changes)
+            self.assertEqual(changed.compare().as_dict(), compare_rent_vs_buy(**{**self.base_inputs, **changes}))
+        self.assertEqual(scenario.monthly_rent, 2000)
+
+        with self.assertRaises(KeyError):
+            ScenarioInputs.from_mapping({"length_of_stay": 5})
+
+        missing = scenario.replace(monthly_rent=float("nan")).compare()
+        self.assertIs(missing.recommendation, Recommendation.INVALID)
+        self.assertEqual(missing.as_dict()["Recommendation"], compare_rent_vs_buy(**{**self.base_inputs, "monthly_rent": float("nan")})["Recommendation"])
+
+    def test_defaults_and_compact_instances(self):
+        """ Test that the dataclass defaults follow INPUT_DEFAULTS and instances have no __dict__ """
+        scenario = ScenarioInputs(**self.base_inputs)
+        for name, default in INPUT_DEFAULTS.items():
+            if default is not None:
+                self.assertEqual(getattr(scenario, name), default)
+        self.assertFalse(hasattr(scenario, "__dict__"))
+        self.assertFalse(hasattr(scenario.compare(), "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(scenario)), scenario)
+        self.assertLess(sys.getsizeof(scenario.compare()), sys.getsizeof(compare_rent_vs_buy(**self.base_inputs)))
+
+    def test_recommendation_codes(self):
+        """ Test that recommendation members are the batch codes and map to the calculator's strings """
+        self.assertEqual([int(member) for member in Recommendation], [0, 1, 2, 3])
+        self.assertEqual([member.label for member in Recommendation], list(RECOMMENDATIONS))
+        self.assertIs(Recommendation.from_costs(1, 2), Recommendation.RENT)
+        self.assertIs(Recommendation.from_costs(2, 1), Recommendation.BUY)
+        self.assertIs(Recommendation.from_costs(1, 1), Recommendation.EITHER)
+        self.assertIs(Recommendation.from_costs(1, float("nan")), Recommendation.INVALID)
+
+    def test_structured_records_match_batch(self):
+        """ Test scenario and result records against the batch calculator and the dict view """
+        rng = np.random.default_rng(21)
+        size = 1000
+        appreciation = np.where(rng.random(size) < 0.5, np.nan, rng.uniform(-2, 8, size))
+        records = scenario_records({**self.base_inputs, "monthly_rent": rng.uniform(800, 4000, size), "appreciation_rate": appreciation})
+        self.assertEqual(records.dtype, SCENARIO_DTYPE)
+        self.assertEqual(records["property_tax_rate"][0], 1.2)
+
+        results = compare_records(records)
+        self.assertEqual(results.dtype, RESULT_DTYPE)
+        for i in (0, 1, 2, 3, 500, 999):
+            inputs = {**self.base_inputs, "monthly_rent": records["monthly_rent"][i]}
+            if not np.isnan(appreciation[i]):
+                inputs["appreciation_rate"] = appreciation[i]
+            self.assertEqual(ComparisonResult.from_record(results[i]).as_dict(), compare_rent_vs_buy(**inputs))
+
+        # Without any appreciation every scenario follows the investment rate
+        plain = compare_records(scenario_records({**self.base_inputs, "home_price": [400000, 600000]}))
+        self.assertEqual(list(result_dicts(plain)), [compare_rent_vs_buy(**{**self.base_inputs, "home_price": price}) for price in (400000, 600000)])
+
+        batch = compare_rent_vs_buy_batch(**self.base_inputs)
+        np.testing.assert_array_equal(result_records(batch)["buy_cost"], batch["Buy Cost"])
+
+if __name__ == "__main__":
+    unittest.main()
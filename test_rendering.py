@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from rendering import (SensitivityChart, VacancyChart, render_sensitivity, render_vacancy, render_city_reports,
+                       city_report_jobs, new_figure, save_figure)
+from compare_cities import vacancy_table
+from sensitivity_grid import sensitivity_curves
+
+class TestRendering(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up valid base inputs and a scratch output directory """
+        self.valid_inputs = {
+            "length_of_stay": 5,  # Years planning to stay in the home
+            "monthly_rent": 2000,  # Monthly rent cost in dollars
+            "home_price": 500000,  # Purchase price of the home in dollars
+            "down_payment": 100000,  # Initial down payment amount in dollars
+            "mortgage_rate": 5.0,  # Annual mortgage interest rate (percentage)
+            "investment_interest_rate": 4.0  # Annual investment interest rate (percentage)
+        }
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_render_sensitivity_to_memory(self):
+        """ Test that every sweep renders to PNG bytes without opening pyplot figures """
+        open_figures = plt.get_fignums()
+        images = render_sensitivity(self.valid_inputs)
+
+        self.assertEqual(len(images), 6)
+        for image in images.values():
+            self.assertTrue(image.startswith(b"\x89PNG"))
+        self.assertEqual(plt.get_fignums(), open_figures)
+
+    def test_render_vacancy_to_svg_file(self):
+        """ Test that the vacancy figure is written to disk as SVG """
+        path = render_vacancy(vacancy_table("data/USA DP04 vacancy value cost.csv"), os.path.join(self.output_dir, "vacancy.svg"), fmt="svg")
+
+        with open(path) as image:
+            self.assertIn("<svg", image.read())
+
+    def test_save_figure_releases_artists(self):
+        """ Test that saving clears the figure """
+        figure = new_figure()
+        figure.add_subplot().plot([1, 2], [3, 4])
+        save_figure(figure)
+
+        self.assertEqual(figure.axes, [])
+
+    def test_sensitivity_chart_updates_in_place(self):
+        """ Test that the chart template keeps its artists and only replaces their data """
+        curves = sensitivity_curves(self.valid_inputs)
+        chart = SensitivityChart()
+        artists = (chart.rent_line, chart.buy_line, chart.ax.get_legend())
+        num_children = len(chart.ax.get_children())
+
+        for factor, (values, rent_costs, buy_costs) in curves.items():
+            chart.update(factor, values, rent_costs, buy_costs).render()
+            self.assertEqual((chart.rent_line, chart.buy_line, chart.ax.get_legend()), artists)
+            self.assertEqual(len(chart.ax.get_children()), num_children)
+            np.testing.assert_array_equal(chart.buy_line.get_ydata(), buy_costs)
+            self.assertIn(factor.replace("_", " ").title(), chart.ax.get_title())
+
+            # The view follows the new data
+            low, high = chart.ax.get_ylim()
+            self.assertLessEqual(low, min(rent_costs.min(), buy_costs.min()))
+            self.assertGreaterEqual(high, max(rent_costs.max(), buy_costs.max()))
+
+    def test_vacancy_chart_updates_in_place(self):
+        """ Test that bar heights and cost lines are set in place and a different city count rebuilds the layout """
+        table = vacancy_table("data/USA DP04 vacancy value cost.csv")
+        chart = VacancyChart(table)
+        bars = list(chart.bars[0])
+        changed = table.assign(**{"Vacant housing units": table["Vacant housing units"] * 2,
+                                  "Median Rent Cost (dollars)": table["Median Rent Cost (dollars)"] + 100})
+        chart.update(changed)
+
+        self.assertEqual(list(chart.bars[0]), bars)
+        self.assertEqual([bar.get_height() for bar in bars], list(changed["Vacant housing units"]))
+        np.testing.assert_array_equal(chart.lines[1][1].get_ydata(), changed["Median Rent Cost (dollars)"])
+        self.assertIn(b"<svg", chart.render(fmt="svg"))
+
+        chart.update(table.head(2))
+        self.assertEqual(len(chart.bars[1]), 2)
+        self.assertEqual([label.get_text() for label in chart.axes[0].get_xticklabels()], list(table["City"].head(2)))
+        self.assertEqual(len(chart.figure.axes), 4)
+
+    def test_chart_template_is_faster_than_new_figures(self):
+        """ Test that updating one template costs a fraction of building a figure per sweep """
+        curves = list(sensitivity_curves(self.valid_inputs).items()) * 5
+
+        start = time.perf_counter()
+        for factor, (values, rent_costs, buy_costs) in curves:
+            SensitivityChart().update(factor, values, rent_costs, buy_costs)
+        rebuild = time.perf_counter() - start
+
+        chart = SensitivityChart()
+        start = time.perf_counter()
+        for factor, (values, rent_costs, buy_costs) in curves:
+            chart.update(factor, values, rent_costs, buy_costs)
+        update = time.perf_counter() - start
+
+        self.assertLess(update, rebuild / 2)
+
+    def test_render_city_reports_in_parallel(self):
+        """ Test that reports for several cities are rendered by worker processes """
+        data = pd.read_excel("data/Random Cities in USA (Rent & Buy).xlsx").head(3)
+        jobs = city_report_jobs(data, length_of_stay=5, down_payment=20000, investment_interest_rate=4.0)
+        reports = render_city_reports(jobs, self.output_dir, max_workers=2)
+
+        self.assertEqual(set(reports), set(jobs))
+        self.assertIn("Anchorage-AK_City-Centre_1BR", reports)
+        for paths in reports.values():
+            for path in paths.values():
+                self.assertTrue(os.path.getsize(path) > 0)
+        self.assertEqual(len(os.listdir(self.output_dir)), 18)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import time
+import unittest
+import numpy as np
+from calculator import compare_rent_vs_buy
+from scenario import Scenario
+from sensitivity_grid import sensitivity_curves
+
+class TestScenario(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up valid base inputs for tests """
+        self.base_inputs = {
+            "length_of_stay": 5,
+            "monthly_rent": 2000,
+            "home_price": 500000,
+            "down_payment": 100000,
+            "mortgage_rate": 5.0,
+            "investment_interest_rate": 4.0
+        }
+
+    def assert_matches_full_recomputation(self, scenario):
+        """ Check the result and every curve against compare_rent_vs_buy and sensitivity_curves """
+        self.assertEqual(scenario.result(), compare_rent_vs_buy(**scenario.inputs))
+        expected = sensitivity_curves(scenario.inputs)
+        curves = scenario.sensitivity_curves()
+        self.assertEqual(list(curves), list(expected))
+        for factor in expected:
+            for actual, wanted in zip(curves[factor], expected[factor]):
+                np.testing.assert_array_equal(actual, wanted)
+
+    def test_random_updates_match_full_recomputation(self):
+        """ Test that a sequence of single and combined updates always matches recomputing from scratch """
+        scenario = Scenario(self.base_inputs)
+        self.assert_matches_full_recomputation(scenario)
+
+        rng = np.random.default_rng(19)
+        ranges = {
+            "length_of_stay": (1, 15), "monthly_rent": (800, 4000), "home_price": (200000, 900000),
+            "down_payment": (0, 150000), "mortgage_rate": (0, 9), "investment_interest_rate": (0, 8),
+            "property_tax_rate": (0, 3), "maintenance_rate": (0, 2), "selling_cost_rate": (0, 10), "appreciation_rate": (-2, 8)
+        }
+        names = list(ranges)
+        for _ in range(30):
+            changes = {}
+            for name in rng.choice(names, size=rng.integers(1, 3), replace=False):
+                low, high = ranges[name]
+                changes[str(name)] = round(float(rng.uniform(low, high)), 2)
+            scenario.update(**changes)
+            self.assert_matches_full_recomputation(scenario)
+
+        scenario.update(appreciation_rate=None)
+        self.assert_matches_full_recomputation(scenario)
+
+    def test_only_affected_terms_are_recomputed(self):
+        """ Test that a rent change recomputes only the rent terms and rent curves """
+        scenario = Scenario(self.base_inputs)
+        scenario.result()
+        curves = scenario.sensitivity_curves()
+
+        before = scenario.recomputed
+        changed = scenario.update(monthly_rent=1500)
+        scenario.result()
+        # rent_total and the rounded Rent Cost; the investment and all buy terms are reused
+        self.assertEqual(scenario.recomputed - before, 2)
+
+        updated = scenario.sensitivity_curves()
+        self.assertIs(updated["home_price"][2], curves["home_price"][2])
+        self.assertIs(updated["mortgage_rate"][2], curves["mortgage_rate"][2])
+        self.assertIn("monthly_rent", changed)
+
+        # Unchanged inputs invalidate nothing
+        self.assertEqual(scenario.update(monthly_rent=1500), set())
+
+    def test_range_change_reuses_points(self):
+        """ Test that moving a factor's own value extends its sweep instead of recomputing it """
+        scenario = Scenario(self.base_inputs)
+        values, rent, buy = scenario.curve("length_of_stay")
+        scenario.update(length_of_stay=6)
+        new_values, new_rent, new_buy = scenario.curve("length_of_stay")
+
+        np.testing.assert_array_equal(new_values, [1, 2, 3, 4, 5, 6])
+        np.testing.assert_array_equal(new_rent[:5], rent)
+        np.testing.assert_array_equal(new_buy[:5], buy)
+        self.assertEqual(new_buy[5], compare_rent_vs_buy(**{**self.base_inputs, "length_of_stay": 6})["Buy Cost"])
+
+    def test_slider_updates_are_fast(self):
+        """ Test that an input change plus a new result stays well under a millisecond """
+        scenario = Scenario(self.base_inputs)
+        scenario.result()
+        rates = np.linspace(3, 7, 1000).tolist()
+        start = time.perf_counter()
+        for rate in rates:
+            scenario.update(mortgage_rate=rate)
+            scenario.result()
+        self.assertLess((time.perf_counter() - start) / len(rates), 1e-3)
+
+    def test_missing_input_matches_calculator(self):
+        """ Test that a NaN input gives the same result dictionary as compare_rent_vs_buy """
+        scenario = Scenario({**self.base_inputs, "monthly_rent": float("nan")})
+        result, expected = scenario.result(), compare_rent_vs_buy(**scenario.inputs)
+        self.assertEqual(result["Recommendation"], expected["Recommendation"])
+        self.assertTrue(np.isnan(result["Rent Cost"]))
+        self.assertEqual(result["Buy Cost"], expected["Buy Cost"])
+
+    def test_invalid_inputs(self):
+        """ Test missing inputs, unknown inputs and unknown factors """
+        with self.assertRaises(KeyError):
+            Scenario({"length_of_stay": 5})
+        scenario = Scenario(self.base_inputs)
+        with self.assertRaises(ValueError):
+            scenario.update(bedrooms=2)
+        with self.assertRaises(ValueError):
+            scenario.curve("selling_cost_rate")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+import pandas as pd
+from calculator import compare_rent_vs_buy
+from sensitivity_grid import evaluate_sensitivity_grid, city_axis, slice_cube, cube_to_frame
+
+class TestSensitivityGrid(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up valid base inputs and a small four-factor grid """
+        self.base_inputs = {
+            "length_of_stay": 5,  # Years planning to stay in the home
+            "monthly_rent": 2000,  # Monthly rent cost in dollars
+            "home_price": 500000,  # Purchase price of the home in dollars
+            "down_payment": 100000,  # Initial down payment amount in dollars
+            "mortgage_rate": 5.0,  # Annual mortgage interest rate (percentage)
+            "investment_interest_rate": 4.0  # Annual investment interest rate (percentage)
+        }
+        self.axes = {
+            "length_of_stay": np.arange(1, 11),
+            "mortgage_rate": np.arange(0, 8.5, 0.5),
+            "down_payment": np.arange(0, 200001, 50000),
+            "investment_interest_rate": np.array([0.0, 2.0, 4.0, 6.0])
+        }
+
+    def test_grid_matches_scalar_function(self):
+        """ Test that every grid point matches compare_rent_vs_buy """
+        cube = evaluate_sensitivity_grid(self.base_inputs, self.axes, max_workers=1)
+        self.assertEqual(cube["Rent Cost"].shape, (10, 17, 5, 4))
+
+        for position in [(0, 0, 0, 0), (4, 10, 2, 2), (9, 16, 4, 3)]:
+            inputs = dict(self.base_inputs)
+            for (factor, values), index in zip(self.axes.items(), position):
+                inputs[factor] = float(values[index])
+            expected = compare_rent_vs_buy(**inputs)
+            self.assertEqual(cube["Rent Cost"][position], expected["Rent Cost"])
+            self.assertEqual(cube["Buy Cost"][position], expected["Buy Cost"])
+
+    def test_process_pool_matches_serial(self):
+        """ Test that chunks evaluated in worker processes give the same cube """
+        serial = evaluate_sensitivity_grid(self.base_inputs, self.axes, max_workers=1)
+        parallel = evaluate_sensitivity_grid(self.base_inputs, self.axes, chunk_size=500, max_workers=2)
+
+        for name in ("Rent Cost", "Buy Cost", "Recommendation Code"):
+            np.testing.assert_array_equal(serial[name], parallel[name])
+
+    def test_city_axis_and_slicing(self):
+        """ Test a grid over every city of the dataset and slicing it for one city """
+        data = pd.read_excel("data/Random Cities in USA (Rent & Buy).xlsx")
+        key, values = city_axis(data)
+        cube = evaluate_sensitivity_grid(self.base_inputs, {key: values, "length_of_stay": np.arange(1, 31)}, max_workers=1)
+
+        tulsa = slice_cube(cube, {key: 3})
+        self.assertEqual(tulsa["Buy Cost"].shape, (30,))
+        expected = compare_rent_vs_buy(**{**self.base_inputs, "length_of_stay": 30.0, "monthly_rent": values[0][3],
+                                          "home_price": values[1][3], "mortgage_rate": values[2][3]})
+        self.assertEqual(tulsa["Buy Cost"][-1], expected["Buy Cost"])
+
+        frame = cube_to_frame(cube)
+        self.assertEqual(len(frame), len(data) * 30)
+        self.assertIn("home_price", frame.columns)
+
+    def test_invalid_axes(self):
+        """ Test that unknown factors and mismatched zipped axes raise a ValueError """
+        with self.assertRaises(ValueError):
+            evaluate_sensitivity_grid(self.base_inputs, {"city": [1, 2]})
+        with self.assertRaises(ValueError):
+            evaluate_sensitivity_grid(self.base_inputs, {("monthly_rent", "home_price"): ([1, 2], [3])})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import unittest
+import warnings
+from calculator import compare_rent_vs_buy
+from service import MicroBatcher, RentOrBuyService, ServiceClient
+
+class TestService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Start one in-process service on a free port for all tests."""
+        cls.loop = asyncio.new_event_loop()
+        cls.service = RentOrBuyService(batch_delay=0.01)
+        host, port = cls.loop.run_until_complete(cls.service.start("127.0.0.1", 0))
+        cls.client = ServiceClient(host, port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.run_until_complete(cls.service.close())
+        cls.loop.close()
+
+    def setUp(self):
+        """ Set up valid inputs for tests """
+        self.inputs = {
+            "length_of_stay": 5,
+            "monthly_rent": 2000,
+            "home_price": 500000,
+            "down_payment": 100000,
+            "mortgage_rate": 5.0,
+            "investment_interest_rate": 4.0
+        }
+
+    def run_request(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def send_raw(self, data):
+        """ Send raw bytes on a fresh connection and read the status and body of the response """
+        async def send():
+            reader, writer = await asyncio.open_connection(self.client.host, self.client.port)
+            try:
+                writer.write(data)
+                await writer.drain()
+                response = await reader.read()
+            finally:
+                writer.close()
+            head, _, body = response.partition(b"\r\n\r\n")
+            return int(head.split()[1]), body
+        return send()
+
+    def test_compare_matches_calculator(self):
+        """ Test that /compare returns exactly what compare_rent_vs_buy returns """
+        status, result = self.run_request(self.client.post("/compare", self.inputs))
+        self.assertEqual(status, 200)
+        self.assertEqual(result, compare_rent_vs_buy(**self.inputs))
+
+    def test_concurrent_requests_are_batched(self):
+        """ Test that concurrent compare requests share one vectorized evaluation """
+        scenarios = [{**self.inputs, "monthly_rent": 1000 + 100 * step} for step in range(20)]
+        batches = self.service.batcher.batches
+
+        async def send_all():
+            return await asyncio.gather(*(self.client.post("/compare", scenario) for scenario in scenarios))
+
+        responses = self.run_request(send_all())
+        for scenario, (status, result) in zip(scenarios, responses):
+            self.assertEqual(status, 200)
+            self.assertEqual(result, compare_rent_vs_buy(**scenario))
+        self.assertLess(self.service.batcher.batches - batches, len(scenarios))
+
+    def test_compare_by_city(self):
+        """ Test that a scenario can name a city instead of giving its prices """
+        scenario = {"city": "Anchorage, AK", "location": "City Centre", "bedrooms": 1,
+                    "length_of_stay": 5, "down_payment": 50000, "investment_interest_rate": 4.0}
+        status, city_data = self.run_request(self.client.get("/lookup?city=Anchorage,%20AK&location=City%20Centre&bedrooms=1"))
+        self.assertEqual(status, 200)
+
+        status, result = self.run_request(self.client.post("/compare", scenario))
+        self.assertEqual(status, 200)
+        expected = compare_rent_vs_buy(5, city_data["monthly_rent"], city_data["home_price"], 50000, city_data["mortgage_rate"], 4.0)
+        self.assertEqual(result, expected)
+
+    def test_compare_by_city_keeps_given_inputs(self):
+        """ Test that inputs given alongside a city take precedence over the city data """
+        scenario = {"city": "Anchorage, AK", "location": "City Centre", "bedrooms": 1, "home_price": 250000,
+                    "length_of_stay": 5, "down_payment": 50000, "investment_interest_rate": 4.0}
+        status, city_data = self.run_request(self.client.get("/lookup?city=Anchorage,%20AK&location=City%20Centre&bedrooms=1"))
+        self.assertEqual(status, 200)
+        self.assertNotEqual(city_data["home_price"], 250000)
+
+        status, result = self.run_request(self.client.post("/compare", scenario))
+        self.assertEqual(status, 200)
+        expected = compare_rent_vs_buy(5, city_data["monthly_rent"], 250000, 50000, city_data["mortgage_rate"], 4.0)
+        self.assertEqual(result, expected)
+
+    def test_batcher_keeps_running_batches(self):
+        """ Test that the batcher holds its batch tasks until they finish and drains them """
+        batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_delay=0.01)
+
+        async def submit_and_drain():
+            futures = [asyncio.ensure_future(batcher.submit(item)) for item in range(5)]
+            await asyncio.sleep(0)
+            pending = batcher._pending[:]
+            await batcher.drain()
+            return pending, batcher._tasks, await asyncio.gather(*futures)
+
+        pending, tasks, results = self.run_request(submit_and_drain())
+        self.assertEqual(len(pending), 5)
+        self.assertEqual(tasks, set())
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+
+    def test_compare_errors(self):
+        """ Test that missing inputs and unknown cities are reported as client errors """
+        inputs = dict(self.inputs)
+        del inputs["home_price"]
+        status, result = self.run_request(self.client.post("/compare", inputs))
+        self.assertEqual(status, 400)
+        self.assertIn("home_price", result["error"])
+
+        status, _ = self.run_request(self.client.post("/compare", {**inputs, "city": "Atlantis", "location": "City Centre", "bedrooms": 1}))
+        self.assertEqual(status, 404)
+
+    def test_compare_rejects_invalid_scenarios(self):
+        """ Test that scenarios without finite costs are client errors, never bare NaN tokens """
+        for stay in (0, -1):
+            status, result = self.run_request(self.client.post("/compare", {**self.inputs, "length_of_stay": stay}))
+            self.assertEqual(status, 400)
+            self.assertIn("length_of_stay", result["error"])
+
+        status, _ = self.run_request(self.client.post("/compare", [self.inputs, {**self.inputs, "length_of_stay": 0}]))
+        self.assertEqual(status, 400)
+        with warnings.catch_warnings():
+            # The overflowing home price is the point of this request
+            warnings.simplefilter("ignore", RuntimeWarning)
+            status, result = self.run_request(self.client.post("/compare", {**self.inputs, "home_price": 1e308}))
+        self.assertEqual(status, 400)
+        self.assertIn("finite costs", result["error"])
+
+        body = json.dumps({**self.inputs, "monthly_rent": float("nan")}).encode()
+        status, body = self.run_request(self.send_raw(
+            b"POST /compare HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body)))
+        self.assertEqual(status, 400)
+        self.assertIn(b"monthly_rent", body)
+
+    def test_invalid_content_length(self):
+        """ Test that a malformed or negative Content-Length gets a 400 response and closes the connection """
+        for value in (b"abc", b"-5"):
+            status, body = self.run_request(self.send_raw(b"POST /compare HTTP/1.1\r\nContent-Length: " + value + b"\r\n\r\n"))
+            self.assertEqual(status, 400)
+            self.assertIn(b"Content-Length", body)
+
+    def test_break_even(self):
+        """ Test that /break-even returns a value at which both costs are equal """
+        status, result = self.run_request(self.client.post("/break-even", {**self.inputs, "factor": "length_of_stay"}))
+        self.assertEqual(status, 200)
+        costs = compare_rent_vs_buy(**{**self.inputs, "length_of_stay": result["Break Even"]})
+        self.assertAlmostEqual(costs["Rent Cost"], costs["Buy Cost"], delta=0.01)
+
+    def test_quality_of_life(self):
+        """ Test the quality of life ranking and single-city endpoints """
+        status, ranking = self.run_request(self.client.get("/quality-of-life"))
+        self.assertEqual(status, 200)
+        self.assertEqual([row["Rank"] for row in ranking], list(range(1, len(ranking) + 1)))
+
+        status, row = self.run_request(self.client.get("/quality-of-life?city=Tulsa,%20OK"))
+        self.assertEqual(status, 200)
+        self.assertEqual(row["City"], "Tulsa, OK")
+
+    def test_unknown_endpoint(self):
+        """ Test that unknown paths and methods are rejected """
+        self.assertEqual(self.run_request(self.client.get("/nothing"))[0], 404)
+        self.assertEqual(self.run_request(self.client.get("/compare"))[0], 405)
+
+if __name__ == "__main__":
+    unittest.main()
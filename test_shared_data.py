@@ -0,0 +1,95 @@
+import pickle
+import unittest
+import numpy as np
+import pandas as pd
+from data_cache import read_excel_cached
+from quality_of_life import load_data
+from shared_data import MISSING_CODE, SharedTables, load_shared_tables, worker_pool, worker_tables
+
+def column_total(table, column):
+    """ Sum of a shared column, computed in a worker """
+    return float(np.nansum(worker_tables()[table][column]))
+
+def first_value(table, column):
+    """ First value of a shared column, read in a worker """
+    return float(worker_tables()[table][column][0])
+
+def worker_block_name(_):
+    """ Name of the shared memory block the worker running this task is attached to """
+    return worker_tables().memory.name
+
+class TestSharedTables(unittest.TestCase):
+
+    def setUp(self):
+        """ Share a small table with numbers, text and missing values """
+        self.frame = pd.DataFrame({
+            "City": ["Tulsa, OK", "Omaha, NE", "Tulsa, OK", None],
+            "Rent": [1000.0, 1200.5, np.nan, 900.0],
+            "Bedrooms": [1, 2, 3, 1]
+        })
+        self.tables = SharedTables.create({"cities": self.frame, "grid": {"growth": np.arange(12.0).reshape(3, 4)}})
+
+    def tearDown(self):
+        self.tables.close()
+
+    def test_round_trip(self):
+        """ Test that columns, interned text and missing values survive sharing """
+        cities = self.tables["cities"]
+        self.assertEqual(self.tables.text_columns("cities"), ["City"])
+        self.assertEqual(list(cities["City"]), [0, 1, 0, MISSING_CODE])
+        self.assertEqual(self.tables.code("Omaha, NE"), 1)
+        self.assertEqual(self.tables.code("Boston, MA"), MISSING_CODE)
+        self.assertFalse(cities["Rent"].flags.writeable)
+        np.testing.assert_array_equal(self.tables["grid"]["growth"], np.arange(12.0).reshape(3, 4))
+
+        frame = self.tables.frame("cities")
+        self.assertEqual(list(frame["City"][:3]), ["Tulsa, OK", "Omaha, NE", "Tulsa, OK"])
+        self.assertTrue(pd.isna(frame["City"][3]))
+        np.testing.assert_array_equal(frame["Rent"], self.frame["Rent"])
+        self.assertEqual(frame["Bedrooms"].dtype, np.int64)
+        del cities
+
+    def test_attach_is_zero_copy(self):
+        """ Test that an attached view sees the owner's memory rather than a copy """
+        attached = SharedTables.attach(pickle.loads(pickle.dumps(self.tables.handle)))
+        rent = np.ndarray((4,), dtype=float, buffer=self.tables.memory.buf, offset=self.tables.layout["tables"]["cities"]["Rent"][3])
+        rent[0] = 1500.0
+        self.assertEqual(attached["cities"]["Rent"][0], 1500.0)
+        self.assertEqual(attached.strings, self.tables.strings)
+        del rent
+        attached.close()
+
+    def test_workers_attach_once(self):
+        """ Test that pool workers read the owner's block, including changes made after they started """
+        rent = np.ndarray((4,), dtype=float, buffer=self.tables.memory.buf, offset=self.tables.layout["tables"]["cities"]["Rent"][3])
+        with worker_pool(self.tables, max_workers=2) as executor:
+            self.assertEqual(executor.submit(column_total, "cities", "Rent").result(), 3100.5)
+            rent[0] = 2000.0
+            self.assertEqual(executor.submit(first_value, "cities", "Rent").result(), 2000.0)
+            self.assertEqual(set(executor.map(worker_block_name, range(4))), {self.tables.memory.name})
+        del rent
+
+        # The owner's block outlives its workers
+        self.assertEqual(self.tables["cities"]["Rent"][1], 1200.5)
+
+    def test_mixed_columns_are_rejected(self):
+        """ Test that columns mixing text and numbers cannot be shared """
+        with self.assertRaises(TypeError):
+            SharedTables.create({"bad": {"values": np.array(["a", 1], dtype=object)}})
+
+    def test_dataset_tables(self):
+        """ Test the shared copies of the project datasets """
+        with load_shared_tables() as tables:
+            cities = tables.frame("cities")
+            pd.testing.assert_frame_equal(cities, read_excel_cached("data/Random Cities in USA (Rent & Buy).xlsx"), check_dtype=False)
+            quality = tables.frame("quality_of_life")
+            expected = load_data("data/Random Cities in USA (Quality of Life Index).xlsx")
+            self.assertEqual(list(quality["City"]), list(expected["City"]))
+            np.testing.assert_array_equal(quality["Safety Index"], expected["Safety Index"])
+            self.assertEqual(tables["oecd"]["growth"].ndim, 2)
+            self.assertGreater(len(tables["dp04"]["estimate"]), 1000)
+            # Each distinct city name is stored once, however many rows and tables use it
+            self.assertEqual(len(set(tables.strings)), len(tables.strings))
+
+if __name__ == "__main__":
+    unittest.main()
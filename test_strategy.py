@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+import pandas as pd
+from batch_calculator import compare_rent_vs_buy_batch, monthly_mortgage_payment
+from break_even import cost_difference
+from strategy import city_strategies, down_payment_bounds, optimal_strategies
+
+class TestOptimalStrategy(unittest.TestCase):
+
+    def setUp(self):
+        """ Set up random scenarios whose best holding period often lies inside the search range """
+        rng = np.random.default_rng(22)
+        size = 200
+        self.inputs = {
+            "monthly_rent": rng.uniform(800, 4000, size),
+            "home_price": rng.uniform(100000, 900000, size),
+            "mortgage_rate": rng.uniform(2, 12, size),
+            "investment_interest_rate": rng.uniform(0, 8, size),
+            "appreciation_rate": rng.uniform(-3, 6, size),
+            "selling_cost_rate": rng.uniform(4, 12, size)
+        }
+        self.constraints = {"max_down_payment": 80000.0, "max_monthly_payment": rng.uniform(2000, 8000, size)}
+
+    def brute_force(self, objective):
+        """ Evaluate every month of the stay range against a fine grid of down payments """
+        stays = 1 + np.arange(29 * 12 + 1) / 12
+        inputs = {name: values[:, np.newaxis, np.newaxis] for name, values in self.inputs.items()}
+        inputs.update(property_tax_rate=1.2, maintenance_rate=1.0, length_of_stay=stays[np.newaxis, :, np.newaxis])
+        max_payment = self.constraints["max_monthly_payment"][:, np.newaxis, np.newaxis]
+        lower, upper = down_payment_bounds(inputs, inputs["length_of_stay"], 0.0, 80000.0, max_payment)
+        down_payment = lower + (upper - lower) * np.linspace(0, 1, 41)
+        value = -cost_difference({**inputs, "down_payment": down_payment})
+        if objective == "annual":
+            value = value / inputs["length_of_stay"]
+        value = np.where(lower <= upper, value, np.inf)
+        return value.reshape(len(value), -1).min(axis=1)
+
+    def objective_value(self, result, objective):
+        """ Objective at the strategy found by the optimizer """
+        value = -cost_difference({**self.inputs, "property_tax_rate": 1.2, "maintenance_rate": 1.0,
+                                  "length_of_stay": result["length_of_stay"], "down_payment": result["down_payment"]})
+        return value / result["length_of_stay"] if objective == "annual" else value
+
+    def test_matches_brute_force_search(self):
+        """ Test the coarse-to-fine search against an exhaustive monthly grid """
+        for objective in ("total", "annual"):
+            with self.subTest(objective=objective):
+                result = optimal_strategies(self.inputs, objective=objective, **self.constraints)
+                expected = self.brute_force(objective)
+                feasible = np.isfinite(expected)
+                np.testing.assert_array_equal(np.isfinite(result["length_of_stay"]), feasible)
+                np.testing.assert_allclose(self.objective_value(result, objective)[feasible], expected[feasible], rtol=1e-9, atol=1e-6)
+                # Some optima lie strictly inside the range, so the refinement is exercised
+                self.assertTrue(((result["length_of_stay"] > 1) & (result["length_of_stay"] < 30)).any())
+
+    def test_constraints_and_results(self):
+        """ Test that strategies respect the budget and report the calculator's costs """
+        result = optimal_strategies(self.inputs, **self.constraints)
+        feasible = np.isfinite(result["length_of_stay"])
+        self.assertTrue(feasible.any() and not feasible.all())
+
+        stay = result["length_of_stay"][feasible]
+        down = result["down_payment"][feasible]
+        price = self.inputs["home_price"][feasible]
+        outlay = (monthly_mortgage_payment(price - down, self.inputs["mortgage_rate"][feasible], 12 * stay) + price * 2.2 / 1200)
+        self.assertTrue(np.all(down <= 80000 + 1e-6))
+        self.assertTrue(np.all(outlay <= self.constraints["max_monthly_payment"][feasible] * (1 + 1e-9)))
+        np.testing.assert_allclose(np.round(stay * 12, 6) % 1, 0, atol=1e-6)
+
+        costs = compare_rent_vs_buy_batch(**{name: values[feasible] for name, values in self.inputs.items()},
+                                          length_of_stay=stay, down_payment=down)
+        np.testing.assert_array_equal(result["Buy Cost"][feasible], costs["Buy Cost"])
+        self.assertTrue(np.isnan(result["Buy Cost"][~feasible]).all())
+
+    def test_invalid_settings(self):
+        """ Test unknown objectives and empty holding period ranges """
+        with self.assertRaises(ValueError):
+            optimal_strategies(self.inputs, objective="monthly")
+        with self.assertRaises(ValueError):
+            optimal_strategies(self.inputs, stay_range=(10, 5))
+
+    def test_city_table(self):
+        """ Test the strategy table for every row of the Rent & Buy workbook """
+        data = pd.read_excel("data/Random Cities in USA (Rent & Buy).xlsx")
+        table = city_strategies(data, 4.0, max_down_payment=60000, max_monthly_payment=3000, appreciation_rate=2.0)
+        self.assertEqual(len(table), len(data))
+        self.assertEqual(list(table.columns[:3]), ["City", "Location", "Number of Bedrooms"])
+        self.assertTrue((table["down_payment"].dropna() <= 60000).all())
+
+if __name__ == "__main__":
+    unittest.main()